@@ -0,0 +1,95 @@
+"""Compare validated and unvalidated bulk generation of faker records.
+
+Run with ``python benchmarks/bulk_generation.py [--count N]``; the results
+are written to stdout as JSON.
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from phantommail.fakers.declaration import DeclarationGenerator
+from phantommail.fakers.transport import TransportOrderGenerator
+
+GENERATORS = {
+    "order": (TransportOrderGenerator, "generate"),
+    "declaration": (DeclarationGenerator, "generate_declaration"),
+}
+
+
+def measure(generate, count: int) -> dict:
+    """Time a generation run, then measure the memory held by its records.
+
+    Memory is measured in a second run, as tracing allocations slows the
+    generation down considerably.
+    """
+    gc.collect()
+    started = time.perf_counter()
+    generate(count)
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    records = generate(count)
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return {
+        "us_per_record": round(elapsed / count * 1e6, 1),
+        "bytes_per_record": held // count,
+        "peak_bytes": peak,
+    }
+
+
+def run(count: int, seed: int) -> dict:
+    """Benchmark every generator in its single, bulk and unvalidated mode."""
+    results = {}
+    for kind, (generator_type, single) in GENERATORS.items():
+        generator = generator_type(seed=seed)
+        # Warm up the Faker providers and the customer registry
+        generator.generate_many(10)
+
+        def one_by_one(n):
+            return [getattr(generator, single)() for _ in range(n)]
+
+        def unvalidated(n):
+            generator.validate = False
+            try:
+                return generator.generate_many(n)
+            finally:
+                generator.validate = True
+
+        generator.reseed(seed)
+        validated = generator.generate_many(5)
+        generator.reseed(seed)
+        constructed = unvalidated(5)
+        assert [r.model_dump() for r in validated] == [
+            r.model_dump() for r in constructed
+        ], f"{kind}: unvalidated records differ from validated ones"
+
+        results[kind] = {
+            "single": measure(one_by_one, count),
+            "bulk": measure(generator.generate_many, count),
+            "bulk_unvalidated": measure(unvalidated, count),
+        }
+    return results
+
+
+def main(argv=None) -> dict:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = run(args.count, args.seed)
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Measure how much compacting the example templates shrinks the prompts.
+
+For the email types that inline example templates (orders and customs
+declarations) the nodes are run with the same seeds with and without
+``compact_prompts``, and the prompt tokens are compared. Output tokens are
+estimated from the size of the examples, which the model echoes back with
+the data filled in, and turned into a modelled LLM latency with
+``--input-ms-per-token`` and ``--output-ms-per-token``.
+
+Run with ``python benchmarks/prompt_compaction.py [--runs N]``; the results
+are written to stdout as JSON.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import List
+
+from phantommail.backends import EmailBackend, EmailRequest
+from phantommail.backends.governor import CHARS_PER_TOKEN, estimate_tokens
+from phantommail.graphs.nodes import GraphNodes
+from phantommail.models.email import Email
+
+NODES = {"order": "generate_order", "declaration": "generate_declaration"}
+
+
+class CapturingBackend(EmailBackend):
+    """Keep the requests instead of calling a model."""
+
+    def __init__(self):
+        """Initialize the backend."""
+        self.requests: List[EmailRequest] = []
+
+    async def generate(self, request: EmailRequest) -> Email:
+        """Store the request and return an empty email."""
+        self.requests.append(request)
+        return Email(subject="", body_html="")
+
+
+def measure(nodes, backend, node, runs: int, compact: bool, costs) -> dict:
+    """Run a node with seeds ``0..runs`` and summarize its prompts."""
+    backend.requests.clear()
+
+    async def run():
+        for seed in range(runs):
+            config = {
+                "configurable": {
+                    "seed": seed,
+                    "compact_prompts": compact,
+                    "render_attachments": False,
+                }
+            }
+            await getattr(nodes, node)({}, config)
+
+    asyncio.run(run())
+    input_tokens = [estimate_tokens(r.messages) for r in backend.requests]
+    # The answer is about as large as the examples shown in the prompt
+    templates = {t.email_html: t for t in nodes.templates.templates()}
+    output_tokens = [
+        sum(
+            len(html)
+            for html in templates[r.email_template].prompt_html(compact)
+            if html
+        )
+        // CHARS_PER_TOKEN
+        for r in backend.requests
+    ]
+    mean_input = sum(input_tokens) / runs
+    mean_output = sum(output_tokens) / runs
+    return {
+        "input_tokens": round(mean_input),
+        "output_tokens": round(mean_output),
+        "modelled_seconds": round(
+            (mean_input * costs[0] + mean_output * costs[1]) / 1000, 2
+        ),
+    }
+
+
+def run(runs: int, costs) -> dict:
+    """Compare full and compacted prompts per email type."""
+    backend = CapturingBackend()
+    nodes = GraphNodes(backend=backend)
+    results = {}
+    for email_type, node in NODES.items():
+        full = measure(nodes, backend, node, runs, False, costs)
+        compact = measure(nodes, backend, node, runs, True, costs)
+        results[email_type] = {
+            "full": full,
+            "compact": compact,
+            "input_token_reduction": round(
+                1 - compact["input_tokens"] / full["input_tokens"], 3
+            ),
+            "modelled_latency_reduction": round(
+                1 - compact["modelled_seconds"] / full["modelled_seconds"], 3
+            ),
+        }
+    return results
+
+
+def main(argv=None) -> dict:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--input-ms-per-token", type=float, default=0.05)
+    parser.add_argument("--output-ms-per-token", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    results = run(args.runs, (args.input_ms_per_token, args.output_ms_per_token))
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Measure the setup cost of binding a chat model to the ``Email`` schema.
+
+``LLMBackend`` binds the schema once and reuses the runnable; before, every
+email paid for ``with_structured_output`` again. Run with
+``python benchmarks/structured_output.py [--count N]``; the results are
+written to stdout as JSON. The model is never called, so no credentials or
+network are needed.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from langchain_google_vertexai import ChatVertexAI
+
+from phantommail.backends import LLMBackend
+from phantommail.models.email import Email
+
+
+def per_call_us(func, count: int) -> float:
+    """Time ``func`` and return the mean microseconds per call."""
+    func()
+    started = time.perf_counter()
+    for _ in range(count):
+        func()
+    return round((time.perf_counter() - started) / count * 1e6, 2)
+
+
+def run(count: int) -> dict:
+    """Compare binding the schema per call with reusing the bound runnable."""
+    llm = ChatVertexAI(
+        model="gemini-2.5-pro", project="benchmark", location="europe-west1"
+    )
+    backend = LLMBackend(llm)
+    per_call = per_call_us(lambda: llm.with_structured_output(Email), count)
+    reused = per_call_us(lambda: backend.structured(Email), count)
+    return {
+        "bind_per_call_us": per_call,
+        "reused_us": reused,
+        "saved_per_email_us": round(per_call - reused, 2),
+    }
+
+
+def main(argv=None) -> dict:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    results = run(args.count)
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""Benchmark the pipeline stages and compare the results against a baseline.
+
+Measures the per-record cost of every faker, the prompt construction of
+every ``GraphNodes.generate_*`` node, ``create_pdf`` on a cold and a warm
+browser, and end-to-end graph throughput with a stub LLM and a local fake of
+the Resend API. Nothing leaves the machine.
+
+Run with ``python benchmarks/suite.py [--output results.json]``; pass
+``--baseline old.json`` to fail (exit code 1) when a figure regressed by more
+than ``--tolerance``.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from datetime import UTC, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib import resources
+from typing import Dict, List
+
+import resend
+from langchain_core.runnables import RunnableLambda
+
+from phantommail.backends import EmailBackend, EmailRequest
+from phantommail.fakers.parallel import GENERATORS
+from phantommail.graphs.nodes import EMAIL_TYPES, GraphNodes
+from phantommail.helpers.html_to_pdf import PdfRenderer, create_pdf
+from phantommail.models.email import Email
+
+NODES = {
+    "order": "generate_order",
+    "question": "generate_question",
+    "complaint": "generate_complaint",
+    "declaration": "generate_declaration",
+    "price_request": "generate_price_request",
+    "waiting_costs": "generate_waiting_costs",
+    "update_order": "generate_update_order",
+    "random": "generate_random",
+}
+
+# Figures compared against the baseline, by their suffix
+LOWER_IS_BETTER = ("_us", "_ms")
+HIGHER_IS_BETTER = ("_per_minute",)
+
+STUB_EMAIL = Email(
+    subject="Benchmark",
+    body_html="<div><p>Benchmark email</p></div>",
+    attachment_html="<html><body><p>Benchmark attachment</p></body></html>",
+)
+
+
+class StubLLM:
+    """A chat model stand-in that answers after a fixed delay."""
+
+    model_name = "stub"
+    temperature = 0.0
+
+    def __init__(self, latency: float = 0.0):
+        """Initialize the stub with its response latency in seconds."""
+        self.latency = latency
+
+    def with_structured_output(self, schema):
+        """Return a runnable that always responds with ``STUB_EMAIL``."""
+
+        async def respond(messages):
+            await asyncio.sleep(self.latency)
+            return STUB_EMAIL
+
+        return RunnableLambda(lambda messages: STUB_EMAIL, afunc=respond)
+
+
+class PromptSizeBackend(EmailBackend):
+    """A backend that only measures the prompts it receives."""
+
+    def __init__(self):
+        """Initialize the backend."""
+        self.prompt_bytes: List[int] = []
+
+    async def generate(self, request: EmailRequest) -> Email:
+        """Record the prompt size and return the stub email."""
+        self.prompt_bytes.append(
+            sum(len(str(m.content).encode("utf-8")) for m in request.messages)
+        )
+        return STUB_EMAIL
+
+
+class FakeResendHandler(BaseHTTPRequestHandler):
+    """Answer Resend's send and batch endpoints with made-up ids."""
+
+    def do_POST(self):
+        """Accept an email (or a batch of emails)."""
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path.rstrip("/").endswith("/batch"):
+            response = {"data": [{"id": str(uuid.uuid4())} for _ in body]}
+        else:
+            response = {"id": str(uuid.uuid4())}
+        payload = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        """Keep the benchmark output clean."""
+
+
+class FakeResend:
+    """Run the fake Resend API in a thread and point ``resend`` at it."""
+
+    def __enter__(self):
+        """Start the server."""
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeResendHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self._previous = resend.api_url, os.environ.get("RESEND_API_KEY")
+        resend.api_url = f"http://127.0.0.1:{self.server.server_port}"
+        os.environ["RESEND_API_KEY"] = "re_benchmark"
+        return self
+
+    def __exit__(self, *exc):
+        """Stop the server and restore the real API."""
+        self.server.shutdown()
+        self.server.server_close()
+        resend.api_url, api_key = self._previous
+        if api_key is None:
+            os.environ.pop("RESEND_API_KEY", None)
+        else:
+            os.environ["RESEND_API_KEY"] = api_key
+
+
+def bench_fakers(count: int, seed: int) -> Dict[str, dict]:
+    """Measure the per-record cost of every generator, one record at a time."""
+    results = {}
+    for kind, (generator_type, method) in GENERATORS.items():
+        generate = getattr(generator_type(seed=seed), method)
+        # Warm up the Faker providers and the customer registry
+        for _ in range(10):
+            generate()
+        gc.collect()
+        started = time.perf_counter()
+        for _ in range(count):
+            generate()
+        elapsed = time.perf_counter() - started
+        results[kind] = {"per_record_us": round(elapsed / count * 1e6, 1)}
+    return results
+
+
+def bench_prompts(count: int, seed: int) -> Dict[str, dict]:
+    """Measure every node up to the backend call: faker data plus prompt."""
+    backend = PromptSizeBackend()
+    nodes = GraphNodes(backend=backend)
+    config = {"configurable": {"render_attachments": False, "seed": seed}}
+
+    async def run(node):
+        for _ in range(count):
+            await node({}, config)
+
+    results = {}
+    for email_type, name in NODES.items():
+        node = getattr(nodes, name)
+        asyncio.run(run(node))
+        backend.prompt_bytes.clear()
+        gc.collect()
+        started = time.perf_counter()
+        asyncio.run(run(node))
+        elapsed = time.perf_counter() - started
+        results[email_type] = {
+            "per_prompt_us": round(elapsed / count * 1e6, 1),
+            "prompt_bytes": sum(backend.prompt_bytes) // len(backend.prompt_bytes),
+        }
+    return results
+
+
+def bench_pdf(count: int) -> dict:
+    """Measure ``create_pdf`` on a cold browser and then on the warm one."""
+    html = resources.files("phantommail.examples").joinpath("order_2_pdf.html")
+    html = html.read_text(encoding="utf-8")
+
+    async def run():
+        renderer = PdfRenderer(pool_size=1)
+        try:
+            started = time.perf_counter()
+            await create_pdf(html, renderer=renderer)
+            cold = time.perf_counter() - started
+            started = time.perf_counter()
+            for _ in range(count):
+                pdf = await create_pdf(html, renderer=renderer)
+            warm = (time.perf_counter() - started) / count
+        finally:
+            await renderer.close()
+        return {
+            "cold_ms": round(cold * 1e3, 1),
+            "warm_ms": round(warm * 1e3, 1),
+            "pdf_bytes": len(pdf),
+        }
+
+    try:
+        return asyncio.run(run())
+    except Exception as e:
+        # Chromium is an optional, separately installed download
+        return {"skipped": f"{type(e).__name__}: {e}".splitlines()[0]}
+
+
+def bench_end_to_end(
+    count: int, concurrency: int, llm_latency: float, seed: int
+) -> dict:
+    """Run full graph runs against a stub LLM and the fake Resend API."""
+    from phantommail.graphs.graph import graph
+
+    llm = StubLLM(llm_latency)
+
+    async def run():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(index):
+            config = {
+                "configurable": {
+                    "sender": "bench@example.com",
+                    "backend": "llm",
+                    "llm": llm,
+                    "render_attachments": False,
+                    "seed": seed + index,
+                },
+                "metadata": {"run_id": f"benchmark-{index}"},
+            }
+            state = {
+                "recipients": ["inbox@example.com"],
+                "email_type": EMAIL_TYPES[index % len(EMAIL_TYPES)],
+                "messages": [],
+            }
+            async with semaphore:
+                result = await graph.ainvoke(state, config=config)
+            if result["delivery"]["status"] != "sent":
+                raise RuntimeError(f"Delivery failed: {result['delivery']}")
+
+        await run_one(-1)
+        started = time.perf_counter()
+        await asyncio.gather(*(run_one(index) for index in range(count)))
+        return time.perf_counter() - started
+
+    with FakeResend():
+        elapsed = asyncio.run(run())
+    return {
+        "emails_per_minute": round(count / elapsed * 60, 1),
+        "per_email_ms": round(elapsed / count * 1e3, 2),
+        "llm_latency_ms": llm_latency * 1e3,
+        "concurrency": concurrency,
+    }
+
+
+def _environment() -> dict:
+    """Describe the machine and revision the results were measured on."""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "revision": revision,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "measured_at": datetime.now(UTC).isoformat(timespec="seconds"),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """List the figures that got worse than the baseline by more than ``tolerance``."""
+    regressions = []
+
+    def walk(current, previous, path):
+        for key, value in current.items():
+            if key not in previous:
+                continue
+            if isinstance(value, dict) and isinstance(previous[key], dict):
+                walk(value, previous[key], f"{path}{key}.")
+            elif isinstance(value, (int, float)) and value and previous[key]:
+                if key.endswith(LOWER_IS_BETTER):
+                    change = value / previous[key] - 1
+                elif key.endswith(HIGHER_IS_BETTER):
+                    change = previous[key] / value - 1
+                else:
+                    continue
+                if change > tolerance:
+                    regressions.append(
+                        f"{path}{key}: {previous[key]} -> {value} ({change:+.0%})"
+                    )
+
+    walk(results["benchmarks"], baseline.get("benchmarks", {}), "")
+    return regressions
+
+
+def run(args) -> dict:
+    """Run the selected benchmarks."""
+    benchmarks = {}
+    if "fakers" in args.only:
+        benchmarks["fakers"] = bench_fakers(args.count, args.seed)
+    if "prompts" in args.only:
+        benchmarks["prompts"] = bench_prompts(max(args.count // 10, 1), args.seed)
+    if "pdf" in args.only:
+        benchmarks["pdf"] = bench_pdf(args.pdf_count)
+    if "end_to_end" in args.only:
+        benchmarks["end_to_end"] = bench_end_to_end(
+            args.emails, args.concurrency, args.llm_latency, args.seed
+        )
+    return {"environment": _environment(), "benchmarks": benchmarks}
+
+
+def main(argv=None) -> int:
+    """Run the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=["fakers", "prompts", "pdf", "end_to_end"],
+        default=["fakers", "prompts", "pdf", "end_to_end"],
+    )
+    parser.add_argument("--count", type=int, default=1000, help="Faker records")
+    parser.add_argument("--pdf-count", type=int, default=10, help="Warm renders")
+    parser.add_argument("--emails", type=int, default=200, help="End-to-end runs")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--llm-latency", type=float, default=0.0, help="Stub LLM delay in seconds"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results here instead of stdout")
+    parser.add_argument("--baseline", help="Results of an earlier run to compare to")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Allowed relative slowdown"
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            sys.stderr.write(f"Regression: {regression}\n")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+"""Backends that turn faker data and prompts into emails."""
+
+from phantommail.backends.base import EmailBackend, EmailRequest
+from phantommail.backends.cache import ResponseCache
+from phantommail.backends.governor import LLMGovernor, get_governor, set_governor
+from phantommail.backends.llm import LLMBackend
+from phantommail.backends.slots import SlotBackend
+from phantommail.backends.template import TemplateBackend
+
+__all__ = [
+    "EmailBackend",
+    "EmailRequest",
+    "LLMGovernor",
+    "LLMBackend",
+    "ResponseCache",
+    "SlotBackend",
+    "TemplateBackend",
+    "get_governor",
+    "set_governor",
+]
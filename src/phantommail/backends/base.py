@@ -0,0 +1,63 @@
+from abc import ABC, abstractmethod
+from typing import Callable, List
+
+from langchain_core.messages import BaseMessage
+from pydantic import BaseModel, Field
+
+from phantommail.models.email import Email
+
+
+class EmailRequest(BaseModel):
+    """Everything a backend may need to write one email."""
+
+    email_type: str = Field(..., description="The type of email, e.g. 'order'")
+    messages: List[BaseMessage] = Field(
+        default_factory=list, description="The prompt for LLM based backends"
+    )
+    data: dict = Field(
+        default_factory=dict, description="The faker payload the email is based on"
+    )
+    email_template: str | None = Field(
+        None, description="The example HTML the email body should look like"
+    )
+    attachment_template: str | None = Field(
+        None, description="The example HTML of the attachment, if there is one"
+    )
+    slot_template: str | None = Field(
+        None, description="The layout with $slots the body is rendered into"
+    )
+
+
+class EmailBackend(ABC):
+    """Base class for email generation backends."""
+
+    # Whether prompts should show the example HTML the model is to imitate
+    shows_templates: bool = True
+
+    @abstractmethod
+    async def generate(self, request: EmailRequest) -> Email:
+        """Generate an email for a request."""
+
+    async def generate_streaming(
+        self, request: EmailRequest, on_attachment: Callable[[str], None]
+    ) -> Email:
+        """Generate an email, handing over the attachment HTML once it is complete.
+
+        Backends that can tell the attachment is done before the whole email
+        is (e.g. by streaming the response) call ``on_attachment`` early, so
+        the attachment can be rendered while the rest is still generated.
+        This default calls it when the email is done.
+
+        Args:
+            request (EmailRequest): The request.
+            on_attachment (Callable[[str], None]): Called once with the
+                attachment HTML, if the email has an attachment.
+
+        Returns:
+            Email: The email.
+
+        """
+        email = await self.generate(request)
+        if email.attachment_html is not None:
+            on_attachment(email.attachment_html)
+        return email
@@ -0,0 +1,187 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from pydantic import BaseModel
+
+CACHE_PATH_ENV = "PHANTOMMAIL_LLM_CACHE"
+
+
+def model_identity(llm: BaseChatModel) -> tuple[str, float | None]:
+    """Get the model name and temperature that make up part of a cache key."""
+    name = (
+        getattr(llm, "model_name", None)
+        or getattr(llm, "model", None)
+        or type(llm).__name__
+    )
+    return str(name), getattr(llm, "temperature", None)
+
+
+class ResponseCache:
+    """An on-disk SQLite cache of structured LLM responses.
+
+    Entries are keyed by a hash of the model name, temperature, output schema
+    and the full message list. The cache is bounded by ``max_entries`` (least
+    recently used entries are evicted first) and optionally by ``ttl``
+    seconds. ``hits`` and ``misses`` count lookups since creation. Only
+    ``set`` writes to the database, and the async ``aget`` and ``aset`` run
+    the queries in a worker thread.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_entries: int = 10_000,
+        ttl: float | None = None,
+    ):
+        """Open (or create) the cache database.
+
+        Args:
+            path (str | Path): The SQLite file, ``":memory:"`` for a private cache.
+            max_entries (int): The maximum number of cached responses.
+            ttl (float | None): Seconds after which an entry expires.
+
+        """
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Access times of cache hits, written on the next set
+        self._accessed: dict[str, float] = {}
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)"
+        )
+        self._connection.commit()
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache | None":
+        """Open the cache configured with ``PHANTOMMAIL_LLM_CACHE``, if any."""
+        path = os.environ.get(CACHE_PATH_ENV)
+        return cls(path) if path else None
+
+    @staticmethod
+    def make_key(
+        llm: BaseChatModel, schema: type[BaseModel], messages: Sequence[BaseMessage]
+    ) -> str:
+        """Hash the model, temperature, schema and messages into a cache key."""
+        name, temperature = model_identity(llm)
+        payload = {
+            "model": name,
+            "temperature": temperature,
+            "schema": schema.__name__,
+            "messages": [
+                {"type": message.type, "content": message.content}
+                for message in messages
+            ],
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str, schema: type[BaseModel]) -> BaseModel | None:
+        """Look up a cached response.
+
+        Lookups only read: the access time used for eviction is kept in
+        memory and written with the next ``set``.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                # Expired entries are deleted by the next set
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._accessed[key] = now
+            self.hits += 1
+        return schema.model_validate_json(row[0])
+
+    def set(self, key: str, value: BaseModel) -> None:
+        """Store a response, evicting expired and least recently used entries."""
+        now = time.time()
+        with self._lock:
+            accessed, self._accessed = self._accessed, {}
+            self._connection.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                [(at, hit) for hit, at in accessed.items()],
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, value.model_dump_json(), now, now),
+            )
+            if self.ttl is not None:
+                self._connection.execute(
+                    "DELETE FROM responses WHERE created_at < ?", (now - self.ttl,)
+                )
+            self._connection.execute(
+                """
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            self._connection.commit()
+
+    async def aget(self, key: str, schema: type[BaseModel]) -> BaseModel | None:
+        """Look up a cached response without blocking the event loop."""
+        return await asyncio.to_thread(self.get, key, schema)
+
+    async def aset(self, key: str, value: BaseModel) -> None:
+        """Store a response without blocking the event loop."""
+        await asyncio.to_thread(self.set, key, value)
+
+    def clear(self) -> None:
+        """Remove all cached responses and reset the counters."""
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self._connection.commit()
+            self._accessed = {}
+            self.hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        """Get the number of cached responses."""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()[0]
+
+    @property
+    def stats(self) -> dict:
+        """Get the hit/miss counters and the current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self),
+        }
@@ -0,0 +1,235 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Sequence
+
+from langchain_core.messages import BaseMessage
+
+from phantommail.telemetry import get_telemetry
+
+MAX_IN_FLIGHT_ENV = "PHANTOMMAIL_LLM_MAX_IN_FLIGHT"
+REQUESTS_PER_MINUTE_ENV = "PHANTOMMAIL_LLM_RPM"
+TOKENS_PER_MINUTE_ENV = "PHANTOMMAIL_LLM_TPM"
+
+LLM_IN_FLIGHT = "phantommail_llm_in_flight"
+LLM_QUEUE_DEPTH = "phantommail_llm_queue_depth"
+LLM_QUEUE_SECONDS = "phantommail_llm_queue_seconds"
+
+# Rough size of a token in characters, for estimating prompts before sending
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(messages: Sequence[BaseMessage]) -> int:
+    """Estimate the number of prompt tokens of a message list."""
+    return sum(len(str(message.content)) for message in messages) // CHARS_PER_TOKEN
+
+
+class TokenBucket:
+    """A token bucket refilled at ``rate_per_minute``.
+
+    The bucket holds at most one minute of budget. A request larger than the
+    bucket waits for a full bucket and then drives it negative, and
+    ``adjust`` settles the difference between estimated and actual usage, so
+    the long-run rate holds either way.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        """Initialize a full bucket.
+
+        Args:
+            rate_per_minute (float): The budget added per minute.
+
+        """
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive.")
+        self.capacity = float(rate_per_minute)
+        self.rate = rate_per_minute / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        """Add the budget accrued since the last update."""
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Take ``amount`` if available, else return the seconds to wait for it."""
+        self._refill()
+        needed = min(amount, self.capacity)
+        if self.tokens >= needed:
+            self.tokens -= amount
+            return 0.0
+        return (needed - self.tokens) / self.rate
+
+    def adjust(self, amount: float) -> None:
+        """Take (or give back, if negative) budget after the fact."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class LLMGovernor:
+    """Limit the LLM calls of the whole process, shared by all graph runs.
+
+    Calls wait, in arrival order, for the request and token budgets
+    (``requests_per_minute`` and ``tokens_per_minute``) and then for one of
+    ``max_in_flight`` slots. Token budgets are taken up front from an
+    estimate and settled with the actual usage afterwards. The queue depth,
+    calls in flight and queueing time are published as metrics.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 16,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        expected_output_tokens: int = 1000,
+    ):
+        """Initialize the governor.
+
+        Args:
+            max_in_flight (int): The maximum number of concurrent LLM calls.
+            requests_per_minute (float | None): The request budget, unlimited
+                if not given.
+            tokens_per_minute (float | None): The input plus output token
+                budget, unlimited if not given.
+            expected_output_tokens (int): Output tokens reserved per call
+                before the actual usage is known.
+
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1.")
+        self.max_in_flight = max_in_flight
+        self.expected_output_tokens = expected_output_tokens
+        self.requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.throttled_seconds = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._turn: asyncio.Lock | None = None
+
+    @classmethod
+    def from_env(cls) -> "LLMGovernor":
+        """Create a governor with the limits set in the environment."""
+
+        def number(name):
+            value = os.environ.get(name)
+            return float(value) if value else None
+
+        return cls(
+            max_in_flight=int(os.environ.get(MAX_IN_FLIGHT_ENV) or 16),
+            requests_per_minute=number(REQUESTS_PER_MINUTE_ENV),
+            tokens_per_minute=number(TOKENS_PER_MINUTE_ENV),
+        )
+
+    @property
+    def stats(self) -> dict:
+        """Get the current queue depth, calls in flight and totals."""
+        return {
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "max_in_flight": self.max_in_flight,
+            "admitted": self.admitted,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+        }
+
+    def _bind(self) -> None:
+        """Create the async primitives for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+            self._turn = asyncio.Lock()
+
+    def _publish(self) -> None:
+        """Update the queue gauges."""
+        metrics = get_telemetry().metrics
+        metrics.set(LLM_IN_FLIGHT, self.in_flight)
+        metrics.set(LLM_QUEUE_DEPTH, self.waiting)
+
+    async def _wait_for_budget(self, estimated_tokens: int) -> None:
+        """Wait until the request and token budgets allow another call."""
+        for bucket, amount in ((self.requests, 1), (self.tokens, estimated_tokens)):
+            if bucket is None:
+                continue
+            while (delay := bucket.delay(amount)) > 0:
+                self.throttled_seconds += delay
+                await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def limit(self, messages: Sequence[BaseMessage] = ()) -> AsyncIterator[int]:
+        """Wait for a turn to call the LLM with ``messages``.
+
+        Args:
+            messages (Sequence[BaseMessage]): The prompt, to estimate its tokens.
+
+        Yields:
+            int: The tokens reserved for the call, to pass to ``settle``.
+
+        """
+        self._bind()
+        reserved = estimate_tokens(messages) + self.expected_output_tokens
+        started = time.perf_counter()
+        self.waiting += 1
+        self._publish()
+        try:
+            # One caller at a time takes budget, so calls are admitted in order
+            async with self._turn:
+                await self._wait_for_budget(reserved)
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+            self._publish()
+        get_telemetry().metrics.observe(
+            LLM_QUEUE_SECONDS, time.perf_counter() - started
+        )
+
+        self.in_flight += 1
+        self.admitted += 1
+        self._publish()
+        try:
+            yield reserved
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+            self._publish()
+
+    def settle(self, reserved: int, used: int) -> None:
+        """Correct the token budget with the actual usage of a call.
+
+        A call that failed or reported no usage (``used == 0``) is assumed to
+        have spent its prompt but no output, so the reserved output tokens
+        are given back.
+        """
+        if self.tokens is None:
+            return
+        if used <= 0:
+            used = max(reserved - self.expected_output_tokens, 0)
+        self.tokens.adjust(used - reserved)
+
+
+_governor: LLMGovernor | None = None
+
+
+def get_governor() -> LLMGovernor:
+    """Get the process-wide governor, configured from the environment."""
+    global _governor
+    if _governor is None:
+        _governor = LLMGovernor.from_env()
+    return _governor
+
+
+def set_governor(governor: LLMGovernor) -> LLMGovernor | None:
+    """Replace the process-wide governor, returning the previous one."""
+    global _governor
+    previous, _governor = _governor, governor
+    return previous
@@ -0,0 +1,166 @@
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from langchain_core.callbacks import UsageMetadataCallbackHandler
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel
+
+from phantommail.backends.base import EmailBackend, EmailRequest
+from phantommail.backends.cache import ResponseCache
+from phantommail.backends.governor import LLMGovernor, get_governor
+from phantommail.models.email import Email, StreamedEmail
+from phantommail.telemetry import get_telemetry
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Bound as a JSON schema, so streamed partial responses are plain dicts that
+# keep the order in which the model wrote the fields
+STREAMED_EMAIL_SCHEMA = StreamedEmail.model_json_schema()
+
+
+class LLMBackend(EmailBackend):
+    """Generate emails with any LangChain chat model that supports structured output."""
+
+    def __init__(
+        self,
+        llm: BaseChatModel,
+        cache: ResponseCache | None = None,
+        governor: LLMGovernor | None = None,
+    ):
+        """Initialize the backend.
+
+        Args:
+            llm (BaseChatModel): The chat model that writes the emails.
+            cache (ResponseCache | None): Cache for the structured responses.
+            governor (LLMGovernor | None): Limits the calls to the model,
+                defaults to the process-wide governor.
+
+        """
+        self.llm = llm
+        self.cache = cache
+        self._governor = governor
+        self._structured: Dict[type[BaseModel] | str, Runnable] = {}
+
+    @property
+    def governor(self) -> LLMGovernor:
+        """Get the governor that limits the calls to the model."""
+        return self._governor or get_governor()
+
+    def structured(self, schema: type[BaseModel] | dict = Email) -> Runnable:
+        """Get the model bound to a structured output schema.
+
+        Binding converts the schema, binds it as a tool and builds the output
+        parser, which takes milliseconds, so it is done once per schema. JSON
+        schemas (dicts) are told apart by their title.
+        """
+        key = schema if isinstance(schema, type) else schema["title"]
+        runnable = self._structured.get(key)
+        if runnable is None:
+            runnable = self._structured[key] = self.llm.with_structured_output(schema)
+        return runnable
+
+    async def generate(self, request: EmailRequest) -> Email:
+        """Ask the chat model to write the email described by the prompt."""
+        return await self.invoke(request, Email)
+
+    async def invoke(self, request: EmailRequest, schema: type[ModelT]) -> ModelT:
+        """Ask the chat model for a structured response to the prompt.
+
+        Args:
+            request (EmailRequest): The request, with the prompt in ``messages``.
+            schema (type[ModelT]): The structure of the response.
+
+        Returns:
+            ModelT: The response, possibly from the cache.
+
+        """
+
+        async def call(config: dict) -> ModelT:
+            return await self.structured(schema).ainvoke(
+                request.messages, config=config
+            )
+
+        return await self._call(request, schema, call)
+
+    async def generate_streaming(
+        self, request: EmailRequest, on_attachment: Callable[[str], None]
+    ) -> Email:
+        """Stream the email, handing over the attachment as soon as it is written.
+
+        The model is asked for the attachment before the subject and body.
+        Once the streamed response moves on to the next field, the attachment
+        HTML is complete and handed to ``on_attachment``, while the model is
+        still writing the body.
+        """
+        reported = False
+
+        def report(attachment_html: str | None) -> None:
+            nonlocal reported
+            if not reported and attachment_html is not None:
+                reported = True
+                on_attachment(attachment_html)
+
+        async def call(config: dict) -> Email:
+            fields: dict[str, Any] = {}
+            async for fields in self.structured(STREAMED_EMAIL_SCHEMA).astream(
+                request.messages, config=config
+            ):
+                # Partial JSON only grows, a field is done once another follows
+                names = list(fields or {})
+                if "attachment_html" in names[:-1]:
+                    report(fields["attachment_html"])
+            return Email.model_validate(fields or {})
+
+        email = await self._call(request, Email, call)
+        report(email.attachment_html)
+        return email
+
+    async def _call(
+        self,
+        request: EmailRequest,
+        schema: type[ModelT],
+        call: Callable[[dict], Awaitable[ModelT]],
+    ) -> ModelT:
+        """Run a model call through the cache, the governor and telemetry.
+
+        Args:
+            request (EmailRequest): The request, with the prompt in ``messages``.
+            schema (type[ModelT]): The structure of the response, for the cache.
+            call (Callable[[dict], Awaitable[ModelT]]): Calls the model with
+                the given runnable config.
+
+        Returns:
+            ModelT: The response, possibly from the cache.
+
+        """
+        if self.cache is not None:
+            key = ResponseCache.make_key(self.llm, schema, request.messages)
+            cached = await self.cache.aget(key, schema)
+            if cached is not None:
+                return cached
+
+        telemetry = get_telemetry()
+        governor = self.governor
+        async with governor.limit(request.messages) as reserved:
+            used = 0
+            try:
+                with telemetry.span("llm", email_type=request.email_type) as span:
+                    usage = UsageMetadataCallbackHandler()
+                    response = await call({"callbacks": [usage]})
+                    input_tokens = sum(
+                        u["input_tokens"] for u in usage.usage_metadata.values()
+                    )
+                    output_tokens = sum(
+                        u["output_tokens"] for u in usage.usage_metadata.values()
+                    )
+                    telemetry.record_tokens(
+                        span, input_tokens, output_tokens, email_type=request.email_type
+                    )
+                    used = input_tokens + output_tokens
+            finally:
+                # Failed calls give their reservation back too
+                governor.settle(reserved, used)
+
+        if self.cache is not None:
+            await self.cache.aset(key, response)
+        return response
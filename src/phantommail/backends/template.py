@@ -0,0 +1,252 @@
+import html
+from typing import Callable, Dict, List, Tuple
+
+from phantommail.backends.base import EmailBackend, EmailRequest
+from phantommail.helpers.slot_layout import style_block, text_to_html, wrap_like
+from phantommail.models.email import Email
+
+
+def _table(title: str, rows: List[Tuple[str, object]]) -> str:
+    """Render a titled two-column table."""
+    cells = "\n".join(
+        f"<tr><th>{html.escape(label)}</th><td>{html.escape(str(value))}</td></tr>"
+        for label, value in rows
+        if value not in (None, "")
+    )
+    return f"<h3>{html.escape(title)}</h3>\n<table>\n{cells}\n</table>"
+
+
+class TemplateBackend(EmailBackend):
+    """Render emails directly from faker data, without calling an LLM.
+
+    The output is deterministic for a given payload: the example templates
+    contribute their styling (the ``<style>`` block or the outer wrapper of
+    the email body) and the content is filled in from the faker data. This is
+    meant for high-volume load generation and offline runs, where realism of
+    the prose matters less than throughput.
+    """
+
+    def __init__(self):
+        """Initialize the template backend."""
+        self.renderers: Dict[str, Callable[[dict], Tuple[str, str]]] = {
+            "order": self._order,
+            "declaration": self._declaration,
+            "question": self._question,
+            "complaint": self._complaint,
+            "price_request": self._price_request,
+            "waiting_costs": self._waiting_costs,
+            "update_order": self._update_order,
+            "random": self._random,
+        }
+
+    async def generate(self, request: EmailRequest) -> Email:
+        """Render the email for a request."""
+        return self.render(request)
+
+    def render(self, request: EmailRequest) -> Email:
+        """Render the email for a request synchronously."""
+        renderer = self.renderers.get(request.email_type)
+        if renderer is None:
+            raise ValueError(f"No template renderer for '{request.email_type}'.")
+
+        subject, body = renderer(request.data)
+        attachment_html = None
+        if request.attachment_template is not None:
+            attachment_html = self.render_attachment(request)
+
+        return Email(
+            subject=subject,
+            body_html=wrap_like(request.email_template, body),
+            attachment_html=attachment_html,
+        )
+
+    def render_attachment(self, request: EmailRequest) -> str:
+        """Render the attachment document of an order or declaration."""
+        data = request.data
+        if request.email_type == "declaration":
+            title = f"Customs declaration {data['mrn']}"
+            sections = [
+                _table(
+                    "Declaration",
+                    [
+                        ("MRN", data["mrn"]),
+                        ("Type", data["declaration_type"]),
+                        ("Reference", data["reference_number"]),
+                        ("Total packages", data["total_packages"]),
+                        ("Status", data["declaration_status"]),
+                        ("Accepted", data["acceptance_date_time"]),
+                    ],
+                ),
+                *(
+                    _table(
+                        role.capitalize(),
+                        [
+                            ("Name", data[role]["name"]),
+                            ("Address", data[role]["address"]),
+                            ("EORI", data[role]["eori_number"]),
+                        ],
+                    )
+                    for role in ("exporter", "importer", "declarant")
+                    if data.get(role)
+                ),
+                _table(
+                    "Transport",
+                    [
+                        ("Mode", data["transport_info"]["transport_mode"]),
+                        (
+                            "Place of loading",
+                            data["transport_info"]["place_of_loading"],
+                        ),
+                        (
+                            "Arrival transport",
+                            data["transport_info"]["arrival_transport"],
+                        ),
+                        (
+                            "Border transport",
+                            data["transport_info"]["border_transport"],
+                        ),
+                    ],
+                ),
+                *(
+                    _table(
+                        f"Item {item['item_number']}",
+                        [
+                            ("Description", item["description_of_goods"]),
+                            ("Commodity code", item["commodity_code"]),
+                            ("Packages", item["packages"]),
+                            ("Gross mass (kg)", item["gross_mass_kg"]),
+                            ("Net mass (kg)", item["net_mass_kg"]),
+                        ],
+                    )
+                    for item in data["items"]
+                ),
+                _table(
+                    "Valuation",
+                    [
+                        (
+                            "Invoice value",
+                            f"{data['invoice_value']} {data['invoice_currency']}",
+                        )
+                    ]
+                    + [
+                        (
+                            line["tax_type"],
+                            f"{line['total_tax_assessed']} ({line['tax_rate']}%)",
+                        )
+                        for line in data["tax_lines"]
+                    ],
+                ),
+            ]
+        else:
+            title = f"Transport order {data['client']['company']}"
+            sections = [
+                _table(
+                    "Client",
+                    [
+                        ("Company", data["client"]["company"]),
+                        ("Contact", data["client"]["sender_name"]),
+                        ("VAT", data["client"]["vat_number"]),
+                        (
+                            "Address",
+                            f"{data['client']['address']}, {data['client']['postal_code']} {data['client']['city']}",
+                        ),
+                        ("Country", data["client"]["country"]),
+                    ],
+                ),
+                _table(
+                    "Pickup",
+                    [(k.capitalize(), v) for k, v in data["pickup_address"].items()],
+                ),
+                _table(
+                    "Delivery",
+                    [(k.capitalize(), v) for k, v in data["delivery_address"].items()],
+                ),
+                _table(
+                    "Goods",
+                    [
+                        ("Description", data["goods"]["description"]),
+                        ("Quantity", data["goods"]["quantity"]),
+                        ("Weight (kg)", data["goods"]["weight"]),
+                        ("Loading metres", data["loading_metres"]),
+                        ("Pallets", data["pallet_count"]),
+                    ],
+                ),
+                _table(
+                    "Dates",
+                    [
+                        ("Loading", data["loading_date"]),
+                        ("Unloading", data["unloading_date"]),
+                    ],
+                ),
+            ]
+
+        return "\n".join(
+            [
+                style_block(request.attachment_template),
+                f"<h1>{html.escape(title)}</h1>",
+                *sections,
+            ]
+        )
+
+    def _order(self, data: dict) -> Tuple[str, str]:
+        client = data["client"]
+        pickup = data["pickup_address"]
+        delivery = data["delivery_address"]
+        subject = f"Transport order {pickup['country']} - {delivery['country']} {data['loading_date']}"
+        text = (
+            f"Hello,\n\n"
+            f"Please plan the following transport for us.\n\n"
+            f"Loading: {data['loading_date']} at {pickup['company']}, {pickup['address']}\n"
+            f"Unloading: {data['unloading_date']} at {delivery['company']}, {delivery['address']}\n"
+            f"Goods: {data['goods']['description']}, {data['pallet_count']} pallets, "
+            f"{data['loading_metres']} loading metres\n\n"
+            f"Kind regards,\n{client['sender_name']}\n{client['company']}\n"
+            f"{client['phone']}\n{client['email']}"
+        )
+        return subject, text_to_html(text)
+
+    def _declaration(self, data: dict) -> Tuple[str, str]:
+        exporter = data["exporter"]["name"] if data.get("exporter") else ""
+        subject = f"Documents ref {data['reference_number']}"
+        text = (
+            f"Hello,\n\n"
+            f"Please find attached the documents for MRN {data['mrn']}. "
+            f"The goods are cleared and ready for pickup.\n\n"
+            f"Let me know if you need anything else.\n\n"
+            f"Best regards,\n{exporter}"
+        )
+        return subject, text_to_html(text)
+
+    def _question(self, data: dict) -> Tuple[str, str]:
+        return "Question about a transport", text_to_html(data["formatted_message"])
+
+    def _complaint(self, data: dict) -> Tuple[str, str]:
+        return "Complaint about a delivery", text_to_html(data["formatted_message"])
+
+    def _price_request(self, data: dict) -> Tuple[str, str]:
+        subject = f"Transport inquiry {data['origin']}-{data['destination']}"
+        text = (
+            f"Transport date: {data['transport_date']}\n\n{data['formatted_message']}"
+        )
+        return subject, text_to_html(text)
+
+    def _waiting_costs(self, data: dict) -> Tuple[str, str]:
+        scenario = data["scenario"]
+        subject = f"RE: Waiting costs - Delivery {scenario['delivery_date']} {scenario['delivery_city']}"
+        text = (
+            f"Order: {scenario['order_ref']} / Delivery: {scenario['delivery_ref']} / "
+            f"Tracking: {scenario['tracking_ref']}\n\n{data['formatted_message']}"
+        )
+        return subject, text_to_html(text)
+
+    def _update_order(self, data: dict) -> Tuple[str, str]:
+        subject = f"Order {data['order_ref']} - Update request"
+        return subject, text_to_html(data["formatted_message"])
+
+    def _random(self, data: dict) -> Tuple[str, str]:
+        text = (
+            f"{data['promo_content']}\n\n{data['promo_benefit']}\n\n"
+            f"{data['promo_cta']}\n\n{data['validity']}\n\n{data['signature']}"
+        )
+        body = f"<h2>{html.escape(data['promo_title'])}</h2>\n{text_to_html(text)}"
+        return data["promo_title"], body
@@ -0,0 +1,292 @@
+"""Bulk campaign runner that generates and sends many emails concurrently."""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+from collections import Counter
+from typing import Dict, List
+
+from dotenv import load_dotenv
+from pydantic import BaseModel, Field
+
+from phantommail.backends import LLMGovernor, set_governor
+from phantommail.fakers.faker_pool import derive_seed
+from phantommail.graphs.graph import graph, graph_nodes
+from phantommail.graphs.nodes import EMAIL_TYPES
+from phantommail.helpers.html_to_pdf import get_renderer
+from phantommail.logger import setup_logger
+from phantommail.mix import parse_mix, plan_email_types
+from phantommail.send_email import DeliveryQueue, Mailer
+from phantommail.telemetry import get_telemetry
+from phantommail.transports import Transport, transport_from_url
+
+load_dotenv()
+logger = setup_logger(__name__, level="INFO")
+
+
+class CampaignSummary(BaseModel):
+    """Throughput and latency figures for a finished campaign."""
+
+    requested: int = Field(..., description="Number of emails requested")
+    succeeded: int = Field(..., description="Number of graph runs that completed")
+    failed: int = Field(..., description="Number of graph runs that raised")
+    elapsed_seconds: float = Field(..., description="Wall time of the campaign")
+    emails_per_minute: float = Field(..., description="Completed runs per minute")
+    latency_p50: float | None = Field(None, description="Median run latency (s)")
+    latency_p95: float | None = Field(None, description="95th percentile latency (s)")
+    latency_max: float | None = Field(None, description="Slowest run latency (s)")
+    per_type: Dict[str, int] = Field(
+        default_factory=dict, description="Completed runs per email type"
+    )
+    errors: List[str] = Field(
+        default_factory=list, description="Error messages of the failed runs"
+    )
+
+
+def _percentile(values: List[float], percentile: int) -> float:
+    """Get a percentile of a list of latencies."""
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percentile - 1]
+
+
+async def run_campaign(
+    recipients: List[str],
+    count: int,
+    mix: Dict[str, float] | None = None,
+    concurrency: int = 8,
+    sender: str | None = None,
+    progress_every: int = 10,
+    batch_delivery: bool = False,
+    seed: int | None = None,
+    transport: Transport | None = None,
+    stream_attachments: bool = False,
+    backend: str | None = None,
+) -> CampaignSummary:
+    """Generate and send ``count`` emails with at most ``concurrency`` in flight.
+
+    Recipients are assigned round-robin, and every run goes through the
+    regular LangGraph pipeline with ``graph.ainvoke``.
+
+    Args:
+        recipients (list[str]): The addresses to spread the emails over.
+        count (int): The number of emails to generate.
+        mix (dict[str, float] | None): Relative weight per email type.
+        concurrency (int): The maximum number of graph runs in flight.
+        sender (str | None): The sender address, defaults to ``SENDER_EMAIL``.
+        progress_every (int): Log progress after this many finished runs.
+        batch_delivery (bool): Deliver in batches (Resend's batch endpoint).
+        seed (int | None): Makes the email types and every run's faker data
+            reproducible; each run gets its own seed derived from it.
+        transport (Transport | None): Delivers the emails instead of the
+            configured transport, e.g. an SMTP server or a maildir.
+        stream_attachments (bool): Stream the LLM responses and render each
+            attachment as soon as it is written. Runs are pipelined as well:
+            ``concurrency`` bounds the emails being generated, while up to as
+            many finished ones render and wait for delivery.
+        backend (str | None): The email backend, e.g. ``"template"`` for an
+            offline run, defaults to the graph's backend.
+
+    Returns:
+        CampaignSummary: Throughput and latency figures for the campaign.
+
+    """
+    if not recipients:
+        raise ValueError("At least one recipient is required.")
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
+    if progress_every < 1:
+        raise ValueError("progress_every must be at least 1.")
+    config = {
+        "configurable": {
+            "sender": sender or os.environ["SENDER_EMAIL"],
+            "batch_delivery": batch_delivery,
+            "stream_attachments": stream_attachments,
+        }
+    }
+    if backend is not None:
+        config["configurable"]["backend"] = backend
+    if transport is not None:
+        # A mailer of its own, so the shared graph keeps its transport
+        mailer = Mailer(
+            transport=transport,
+            # Keep every pooled SMTP session busy
+            concurrency=max(
+                graph_nodes.mailer.concurrency,
+                getattr(transport, "max_connections", 0),
+            ),
+        )
+        config["configurable"]["mailer"] = mailer
+        config["configurable"]["delivery_queue"] = DeliveryQueue(mailer)
+    runs_in_flight = concurrency
+    if stream_attachments:
+        # The next email is generated while the last one renders and is sent
+        config["configurable"]["generation_slots"] = asyncio.Semaphore(concurrency)
+        runs_in_flight = 2 * concurrency
+    email_types = plan_email_types(
+        count, mix, rng=random.Random(seed) if seed is not None else None
+    )
+    semaphore = asyncio.Semaphore(runs_in_flight)
+
+    latencies: List[float] = []
+    per_type: Counter = Counter()
+    errors: List[str] = []
+
+    async def run_one(index: int, email_type: str) -> None:
+        state = {
+            "recipients": [recipients[index % len(recipients)]],
+            "email_type": email_type,
+            "messages": [],
+        }
+        run_config = {**config, "metadata": {"run_id": f"campaign-{index}"}}
+        if seed is not None:
+            run_config["configurable"] = {
+                **config["configurable"],
+                "seed": derive_seed(seed, index),
+            }
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                result = await graph.ainvoke(state, config=run_config)
+                delivery = result.get("delivery") or {}
+                if delivery.get("status") == "failed":
+                    raise RuntimeError(f"delivery failed: {delivery.get('error')}")
+            except Exception as e:
+                logger.error(f"Run {index} ({email_type}) failed: {e}")
+                errors.append(f"{email_type}: {e}")
+            else:
+                latencies.append(time.perf_counter() - started)
+                per_type[email_type] += 1
+
+        finished = len(latencies) + len(errors)
+        if finished % progress_every == 0 or finished == count:
+            logger.info(f"Progress: {finished}/{count} ({len(errors)} failed)")
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(run_one(index, email_type) for index, email_type in enumerate(email_types))
+    )
+    elapsed = time.perf_counter() - started
+
+    summary = CampaignSummary(
+        requested=count,
+        succeeded=len(latencies),
+        failed=len(errors),
+        elapsed_seconds=round(elapsed, 3),
+        emails_per_minute=round(len(latencies) / elapsed * 60, 2) if elapsed else 0.0,
+        latency_p50=round(_percentile(latencies, 50), 3) if latencies else None,
+        latency_p95=round(_percentile(latencies, 95), 3) if latencies else None,
+        latency_max=round(max(latencies), 3) if latencies else None,
+        per_type=dict(per_type),
+        errors=errors,
+    )
+    logger.info(
+        f"Campaign finished: {summary.succeeded}/{count} sent in "
+        f"{summary.elapsed_seconds}s ({summary.emails_per_minute} emails/min, "
+        f"p50 {summary.latency_p50}s, p95 {summary.latency_p95}s)"
+    )
+    return summary
+
+
+def main(argv: List[str] | None = None) -> None:
+    """Run a bulk campaign from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="phantommail-campaign",
+        description="Generate and send many fake emails concurrently.",
+    )
+    parser.add_argument(
+        "--to", action="append", default=[], help="A recipient (repeatable)"
+    )
+    parser.add_argument(
+        "--recipients-file", help="A file with one recipient address per line"
+    )
+    parser.add_argument("--count", type=int, required=True, help="Emails to send")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        help=f"Weights per email type, e.g. order=3,question=1 ({', '.join(EMAIL_TYPES)})",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Graph runs in flight"
+    )
+    parser.add_argument("--sender", help="The sender address")
+    parser.add_argument(
+        "--batch-delivery",
+        action="store_true",
+        help="Send through Resend's batch endpoint where attachments allow",
+    )
+    parser.add_argument(
+        "--seed", type=int, help="Seed for a reproducible campaign workload"
+    )
+    parser.add_argument(
+        "--transport",
+        type=transport_from_url,
+        help="Deliver through resend, memory, maildir:///path or smtp://host:port",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["llm", "slots", "template"],
+        help="How emails are written, 'template' needs no LLM",
+    )
+    parser.add_argument(
+        "--stream-attachments",
+        action="store_true",
+        help="Render attachments while the LLM is still writing, and pipeline runs",
+    )
+    parser.add_argument(
+        "--llm-max-in-flight", type=int, help="Concurrent LLM calls (default 16)"
+    )
+    parser.add_argument("--llm-rpm", type=float, help="LLM requests per minute")
+    parser.add_argument("--llm-tpm", type=float, help="LLM tokens per minute")
+    parser.add_argument(
+        "--metrics-file",
+        help="Write per-step latency and token metrics (Prometheus format) here",
+    )
+    args = parser.parse_args(argv)
+
+    recipients = list(args.to)
+    if args.recipients_file:
+        with open(args.recipients_file, encoding="utf-8") as f:
+            recipients.extend(line.strip() for line in f if line.strip())
+    if not recipients:
+        parser.error("provide at least one recipient with --to or --recipients-file")
+
+    if args.llm_max_in_flight or args.llm_rpm or args.llm_tpm:
+        set_governor(
+            LLMGovernor(
+                max_in_flight=args.llm_max_in_flight or 16,
+                requests_per_minute=args.llm_rpm,
+                tokens_per_minute=args.llm_tpm,
+            )
+        )
+
+    async def run() -> None:
+        try:
+            await run_campaign(
+                recipients,
+                args.count,
+                mix=args.mix,
+                concurrency=args.concurrency,
+                sender=args.sender,
+                batch_delivery=args.batch_delivery,
+                seed=args.seed,
+                transport=args.transport,
+                stream_attachments=args.stream_attachments,
+                backend=args.backend,
+            )
+        finally:
+            await get_renderer().close()
+
+    asyncio.run(run())
+    if args.transport is not None:
+        args.transport.close()
+    if args.metrics_file:
+        with open(args.metrics_file, "w", encoding="utf-8") as f:
+            f.write(get_telemetry().metrics.render())
+
+
+if __name__ == "__main__":
+    main()
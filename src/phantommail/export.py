@@ -0,0 +1,431 @@
+"""Export generated emails to JSONL or Parquet datasets instead of sending them."""
+
+import argparse
+import asyncio
+import base64
+import json
+import random
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List
+
+from pydantic import BaseModel, Field
+
+from phantommail.fakers.faker_pool import derive_seed
+from phantommail.graphs.nodes import EMAIL_TYPES, GraphNodes
+from phantommail.helpers.html_to_pdf import get_renderer
+from phantommail.logger import setup_logger
+from phantommail.mix import parse_mix, plan_email_types
+
+logger = setup_logger(__name__, level="INFO")
+
+FORMATS = ("jsonl", "parquet")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _json_default(value):
+    """Serialize the values ``json`` can't handle on its own."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    return str(value)
+
+
+def build_record(index: int, email_type: str, seed: int | None, result: dict) -> dict:
+    """Turn the output of a generation node into a dataset record.
+
+    Args:
+        index (int): The position of the record in the export.
+        email_type (str): The type of email that was generated.
+        seed (int | None): The seed of the run, if it was seeded.
+        result (dict): The state update returned by the generation node.
+
+    Returns:
+        dict: The record, with the faker payload as ground truth and the
+            attachments as raw bytes.
+
+    """
+    return {
+        "index": index,
+        "email_type": email_type,
+        "seed": seed,
+        "subject": result["subject"],
+        "body_html": result["email"],
+        "attachment_html": result.get("attachment_html"),
+        "payload": result.get("payload", {}),
+        "attachments": [
+            {
+                "filename": attachment.filename,
+                "content_type": attachment.content_type,
+                "content": attachment.content,
+            }
+            for attachment in result.get("attachments") or []
+        ],
+    }
+
+
+class ShardWriter(ABC):
+    """Write records to numbered shard files, starting a new one by size.
+
+    Records are written as they arrive, so memory use does not grow with the
+    size of the dataset. Once a shard reaches ``max_bytes`` the next record
+    goes to a new ``{prefix}-{n:05d}.{extension}`` file.
+    """
+
+    extension = ""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        prefix: str = "emails",
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        """Initialize the writer.
+
+        Args:
+            directory (str | Path): Where to write the shards, created if missing.
+            prefix (str): The file name prefix of the shards.
+            max_bytes (int): The size after which a new shard is started.
+
+        """
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1.")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.paths: List[Path] = []
+        self.records = 0
+        self.bytes_written = 0
+
+    @abstractmethod
+    def write(self, record: dict) -> None:
+        """Append a record to the current shard."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Flush and close the current shard."""
+
+    def _next_path(self) -> Path:
+        """Get the path of the next shard."""
+        path = self.directory / f"{self.prefix}-{len(self.paths):05d}.{self.extension}"
+        self.paths.append(path)
+        return path
+
+    def __enter__(self) -> "ShardWriter":
+        """Use the writer as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the writer when leaving the context."""
+        self.close()
+
+
+class JsonlShardWriter(ShardWriter):
+    """Write records as JSON lines, with attachments base64-encoded."""
+
+    extension = "jsonl"
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the writer, see ``ShardWriter``."""
+        super().__init__(*args, **kwargs)
+        self._file = None
+        self._size = 0
+
+    def write(self, record: dict) -> None:
+        """Append a record to the current shard."""
+        line = json.dumps(record, default=_json_default, ensure_ascii=False) + "\n"
+        data = line.encode("utf-8")
+        if self._file is not None and self._size >= self.max_bytes:
+            self.close()
+        if self._file is None:
+            self._file = open(self._next_path(), "wb")
+            self._size = 0
+        self._file.write(data)
+        self._size += len(data)
+        self.bytes_written += len(data)
+        self.records += 1
+
+    def close(self) -> None:
+        """Flush and close the current shard."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _import_pyarrow():
+    """Import pyarrow, which is only needed for Parquet export."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Parquet export needs pyarrow, install it with `pip install pyarrow`."
+        ) from e
+    return pa, pq
+
+
+class ParquetShardWriter(ShardWriter):
+    """Write records to Parquet, one row group per ``row_group_size`` records.
+
+    The faker payload is stored as a JSON string and attachments as a list of
+    ``(filename, content_type, content)`` structs with binary content.
+    """
+
+    extension = "parquet"
+
+    def __init__(self, *args, row_group_size: int = 1000, **kwargs):
+        """Initialize the writer, see ``ShardWriter``.
+
+        Args:
+            row_group_size (int): Records buffered before a row group is written.
+
+        """
+        self._pa, self._pq = _import_pyarrow()
+        super().__init__(*args, **kwargs)
+        self.row_group_size = row_group_size
+        self.schema = self._pa.schema(
+            [
+                ("index", self._pa.int64()),
+                ("email_type", self._pa.string()),
+                ("seed", self._pa.uint64()),
+                ("subject", self._pa.string()),
+                ("body_html", self._pa.string()),
+                ("attachment_html", self._pa.string()),
+                ("payload", self._pa.string()),
+                (
+                    "attachments",
+                    self._pa.list_(
+                        self._pa.struct(
+                            [
+                                ("filename", self._pa.string()),
+                                ("content_type", self._pa.string()),
+                                ("content", self._pa.binary()),
+                            ]
+                        )
+                    ),
+                ),
+            ]
+        )
+        self._buffer: List[dict] = []
+        self._sink = None
+        self._writer = None
+
+    def write(self, record: dict) -> None:
+        """Buffer a record, writing a row group when the buffer is full."""
+        self._buffer.append(
+            {**record, "payload": json.dumps(record["payload"], default=_json_default)}
+        )
+        self.records += 1
+        if len(self._buffer) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Write the buffered records as a row group."""
+        if not self._buffer:
+            return
+        if self._writer is None:
+            self._sink = self._pa.OSFile(str(self._next_path()), "wb")
+            self._writer = self._pq.ParquetWriter(self._sink, self.schema)
+        table = self._pa.Table.from_pylist(self._buffer, schema=self.schema)
+        self._buffer = []
+        before = self._sink.tell()
+        self._writer.write_table(table)
+        self.bytes_written += self._sink.tell() - before
+        if self._sink.tell() >= self.max_bytes:
+            self._close_shard()
+
+    def _close_shard(self) -> None:
+        """Finish the current shard file."""
+        if self._writer is not None:
+            self._writer.close()
+            self._sink.close()
+            self._writer = None
+            self._sink = None
+
+    def close(self) -> None:
+        """Write the remaining records and close the current shard."""
+        self._flush()
+        self._close_shard()
+
+
+def open_writer(format: str, directory: str | Path, **kwargs) -> ShardWriter:
+    """Open a shard writer for ``"jsonl"`` or ``"parquet"``."""
+    if format == "jsonl":
+        return JsonlShardWriter(directory, **kwargs)
+    if format == "parquet":
+        return ParquetShardWriter(directory, **kwargs)
+    raise ValueError(f"Unknown format '{format}', choose from {FORMATS}.")
+
+
+class ExportSummary(BaseModel):
+    """Throughput figures for a finished export."""
+
+    requested: int = Field(..., description="Number of records requested")
+    written: int = Field(..., description="Number of records written")
+    failed: int = Field(..., description="Number of generations that raised")
+    elapsed_seconds: float = Field(..., description="Wall time of the export")
+    records_per_minute: float = Field(..., description="Written records per minute")
+    bytes_written: int = Field(..., description="Bytes written to the shards")
+    files: List[str] = Field(default_factory=list, description="The shard files")
+    per_type: Dict[str, int] = Field(
+        default_factory=dict, description="Written records per email type"
+    )
+    errors: List[str] = Field(
+        default_factory=list, description="Error messages of the failed generations"
+    )
+
+
+async def export_dataset(
+    directory: str | Path,
+    count: int,
+    format: str = "jsonl",
+    mix: Dict[str, float] | None = None,
+    backend: str = "template",
+    concurrency: int = 32,
+    seed: int | None = None,
+    render_attachments: bool = False,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    nodes: GraphNodes | None = None,
+) -> ExportSummary:
+    """Generate ``count`` emails and write them to dataset shards.
+
+    The generation nodes of the graph are run directly, so nothing is sent.
+    At most ``concurrency`` emails are generated at a time and every record
+    is written as soon as it is ready, which keeps memory use flat.
+
+    Args:
+        directory (str | Path): Where to write the shards.
+        count (int): The number of records to generate.
+        format (str): ``"jsonl"`` or ``"parquet"``.
+        mix (dict[str, float] | None): Relative weight per email type.
+        backend (str): The email backend, ``"template"`` for fast offline runs.
+        concurrency (int): The maximum number of generations in flight.
+        seed (int | None): Makes the export reproducible; each record gets its
+            own seed derived from it.
+        render_attachments (bool): Render attachments to PDF, which is much
+            slower than storing only their HTML.
+        max_bytes (int): The size after which a new shard is started.
+        nodes (GraphNodes | None): The graph nodes to generate with.
+
+    Returns:
+        ExportSummary: Throughput figures and the written files.
+
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
+    nodes = nodes or GraphNodes(backend=backend)
+    email_types = plan_email_types(
+        count, mix, rng=random.Random(seed) if seed is not None else None
+    )
+    per_type: Counter = Counter()
+    errors: List[str] = []
+    next_index = 0
+
+    writer = open_writer(format, directory, max_bytes=max_bytes)
+
+    async def worker() -> None:
+        nonlocal next_index
+        while next_index < count:
+            index = next_index
+            next_index += 1
+            email_type = email_types[index]
+            run_seed = derive_seed(seed, index) if seed is not None else None
+            config = {
+                "configurable": {
+                    "backend": backend,
+                    "seed": run_seed,
+                    "render_attachments": render_attachments,
+                }
+            }
+            state = {"recipients": [], "email_type": email_type, "messages": []}
+            try:
+                generate = getattr(nodes, f"generate_{email_type}")
+                result = await generate(state, config)
+                writer.write(build_record(index, email_type, run_seed, result))
+            except Exception as e:
+                logger.error(f"Record {index} ({email_type}) failed: {e}")
+                errors.append(f"{email_type}: {e}")
+            else:
+                per_type[email_type] += 1
+
+    started = time.perf_counter()
+    with writer:
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, count))))
+    elapsed = time.perf_counter() - started
+
+    summary = ExportSummary(
+        requested=count,
+        written=writer.records,
+        failed=len(errors),
+        elapsed_seconds=round(elapsed, 3),
+        records_per_minute=round(writer.records / elapsed * 60, 2) if elapsed else 0.0,
+        bytes_written=writer.bytes_written,
+        files=[str(path) for path in writer.paths],
+        per_type=dict(per_type),
+        errors=errors,
+    )
+    logger.info(
+        f"Export finished: {summary.written}/{count} records in "
+        f"{summary.elapsed_seconds}s ({summary.records_per_minute} records/min) "
+        f"to {len(summary.files)} {format} shards"
+    )
+    return summary
+
+
+def main(argv: List[str] | None = None) -> None:
+    """Export a synthetic dataset from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="phantommail-export",
+        description="Generate fake emails and write them to JSONL or Parquet shards.",
+    )
+    parser.add_argument("--output", required=True, help="The output directory")
+    parser.add_argument("--count", type=int, required=True, help="Records to write")
+    parser.add_argument("--format", choices=FORMATS, default="jsonl")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        help=f"Weights per email type, e.g. order=3,question=1 ({', '.join(EMAIL_TYPES)})",
+    )
+    parser.add_argument(
+        "--backend", choices=["template", "slots", "llm"], default="template"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=32, help="Generations in flight"
+    )
+    parser.add_argument("--seed", type=int, help="Seed for a reproducible dataset")
+    parser.add_argument(
+        "--render-attachments",
+        action="store_true",
+        help="Render attachments to PDF instead of storing only their HTML",
+    )
+    parser.add_argument(
+        "--max-shard-mb", type=float, default=256, help="Shard size in megabytes"
+    )
+    args = parser.parse_args(argv)
+
+    async def run() -> None:
+        try:
+            await export_dataset(
+                args.output,
+                args.count,
+                format=args.format,
+                mix=args.mix,
+                backend=args.backend,
+                concurrency=args.concurrency,
+                seed=args.seed,
+                render_attachments=args.render_attachments,
+                max_bytes=int(args.max_shard_mb * 1024 * 1024),
+            )
+        finally:
+            await get_renderer().close()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import random
+from typing import List, Sequence, TypeVar
+
+import numpy as np
+from pydantic import BaseModel
+
+from phantommail.fakers.customers import CustomerRegistry, get_customer_registry
+from phantommail.fakers.faker_pool import FakerSource
+from phantommail.models.records import record_type
+
+T = TypeVar("T")
+M = TypeVar("M", bound=BaseModel)
+
+
+class BaseGenerator:
+    """Random state shared by all faker generators.
+
+    Every generator draws from its own ``random.Random`` and ``FakerSource``,
+    so a seeded generator produces the same records for the same seed. Bulk
+    paths (``generate_many``) draw their numbers from ``np_random``, a NumPy
+    generator seeded the same way. Setting ``validate`` to ``False`` builds
+    lightweight unvalidated records instead of pydantic models.
+    """
+
+    def __init__(self, seed: int | None = None):
+        """Initialize the random state.
+
+        Args:
+            seed (int | None): Seed for reproducible output, random if not given.
+
+        """
+        self.random = random.Random(seed)
+        self.np_random = np.random.default_rng(seed)
+        self.fakers = FakerSource(seed)
+        self.validate = True
+
+    def reseed(self, seed: int) -> None:
+        """Reset the random state as if the generator was created with ``seed``.
+
+        This is much cheaper than creating a new seeded generator, which has
+        to build its own Faker instances.
+        """
+        self.random.seed(seed)
+        self.np_random = np.random.default_rng(seed)
+        self.fakers.reseed(seed)
+
+    @property
+    def customer_registry(self) -> CustomerRegistry:
+        """Get the process-wide customer registry.
+
+        It is looked up on every access, so ``set_customers_path`` also
+        applies to generators that already exist.
+        """
+        return get_customer_registry()
+
+    def _pick_many(self, population: Sequence[T], n: int) -> List[T]:
+        """Pick ``n`` items from a population with replacement."""
+        indices = self.np_random.integers(0, len(population), n).tolist()
+        return [population[i] for i in indices]
+
+    def _make(self, model: type[M], **fields) -> M:
+        """Build a model, or its lightweight record when ``validate`` is off.
+
+        Generator output is trusted, so bulk paths may skip pydantic and
+        build the slotted dataclasses of ``phantommail.models.records``. The
+        fields must then already have the declared types (e.g. floats for
+        float fields), so both dump to the same dict.
+        """
+        if self.validate:
+            return model(**fields)
+        return record_type(model)(**fields)
@@ -1,14 +1,20 @@
-import random
+from datetime import date
 
-from faker import Faker
+from phantommail.fakers.base import BaseGenerator
 
 
-class FakeComplaint:
+class FakeComplaint(BaseGenerator):
     """Generate a fake transport complaint."""
 
-    def __init__(self):
-        """Initialize the fake complaint generator."""
-        self.faker = Faker("en_GB")
+    def __init__(self, seed: int | None = None):
+        """Initialize the fake complaint generator.
+
+        Args:
+            seed (int | None): Seed for reproducible output, random if not given.
+
+        """
+        super().__init__(seed)
+        self.faker = self.fakers.get("en_GB")
         self.complaint_templates = [
             "I am writing to express my deep dissatisfaction with the delivery service to {delivery_address}. The truck was supposed to arrive on {expected_date} but it's still not here.",
             "I want to file a formal complaint about the handling of my shipment from {pickup_address}. The delivery person was extremely rude and damaged my package.",
@@ -24,10 +30,11 @@ class FakeComplaint:
             dict: Contains the complaint text and sender information
 
         """
-        template = random.choice(self.complaint_templates)
+        template = self.random.choice(self.complaint_templates)
         pickup_address = self.faker.address()
         delivery_address = self.faker.address()
-        expected_date = self.faker.date_this_month()
+        today = date.today()
+        expected_date = today.replace(day=self.random.randint(1, today.day))
         sender_name = self.faker.name()
 
         complaint = template.format(
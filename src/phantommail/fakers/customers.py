@@ -0,0 +1,107 @@
+import csv
+import os
+import random
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, Tuple
+
+DEFAULT_CUSTOMERS_PATH = Path(__file__).parent.parent / "assets" / "customers.csv"
+CUSTOMERS_PATH_ENV = "PHANTOMMAIL_CUSTOMERS_CSV"
+
+Customer = Mapping[str, str]
+
+
+class CustomerRegistry:
+    """A shared, read-only view on a customers CSV file.
+
+    The file is parsed lazily on first access and then kept in memory, so all
+    fakers in the process draw from the same parsed rows. With ``check_mtime``
+    the file's modification time is checked on every access and the rows are
+    reloaded when the file changes.
+    """
+
+    def __init__(self, path: str | Path | None = None, check_mtime: bool = False):
+        """Initialize the customer registry.
+
+        Args:
+            path (str | Path | None): The customers CSV, defaults to the
+                ``PHANTOMMAIL_CUSTOMERS_CSV`` environment variable or the
+                bundled ``assets/customers.csv``.
+            check_mtime (bool): Reload the file when its mtime changes.
+
+        """
+        self.path = Path(
+            path or os.environ.get(CUSTOMERS_PATH_ENV) or DEFAULT_CUSTOMERS_PATH
+        )
+        self.check_mtime = check_mtime
+        self._customers: Tuple[Customer, ...] | None = None
+        self._mtime: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def customers(self) -> Tuple[Customer, ...]:
+        """Get all customers, loading them from disk if needed."""
+        customers = self._customers
+        if customers is not None and not (
+            self.check_mtime and self.path.stat().st_mtime != self._mtime
+        ):
+            return customers
+
+        with self._lock:
+            mtime = self.path.stat().st_mtime
+            if self._customers is None or (self.check_mtime and mtime != self._mtime):
+                self._customers = self._load()
+                self._mtime = mtime
+            return self._customers
+
+    def choice(self, rng: random.Random | None = None) -> Customer:
+        """Select a random customer."""
+        return (rng or random).choice(self.customers)
+
+    def reload(self) -> None:
+        """Drop the parsed rows so the next access reads the file again."""
+        with self._lock:
+            self._customers = None
+            self._mtime = None
+
+    def __len__(self) -> int:
+        """Get the number of customers."""
+        return len(self.customers)
+
+    def _load(self) -> Tuple[Customer, ...]:
+        """Parse the customers CSV into immutable rows."""
+        with open(self.path, encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            customers = tuple(MappingProxyType(row) for row in reader)
+        if not customers:
+            raise ValueError(f"No customers found in {self.path}.")
+        return customers
+
+
+_registry: CustomerRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_customer_registry() -> CustomerRegistry:
+    """Get the process-wide customer registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = CustomerRegistry()
+    return _registry
+
+
+def set_customers_path(
+    path: str | Path | None, check_mtime: bool = False
+) -> CustomerRegistry:
+    """Point the process-wide customer registry at another customers CSV.
+
+    All generators, including ones that already exist, draw from the new file
+    on their next pick. Pass ``None`` to go back to the default location.
+    """
+    global _registry
+    with _registry_lock:
+        _registry = CustomerRegistry(path, check_mtime=check_mtime)
+    return _registry
@@ -1,10 +1,9 @@
-import csv
-import random
-from datetime import datetime
-from pathlib import Path
+from datetime import date, datetime, time, timedelta
+from typing import List
 
-from faker import Faker
+import numpy as np
 
+from phantommail.fakers.base import BaseGenerator
 from phantommail.models.customs_document import (
     CustomsDeclaration,
     ItemDetail,
@@ -14,61 +13,75 @@ from phantommail.models.customs_document import (
 )
 from phantommail.models.goods import Goods
 
+TAX_RATES = [0, 5, 10, 15, 20]
+TAX_TYPES = ["A00", "B00"]  # A00 = Customs duties, B00 = VAT
+DECLARATION_TYPES = ["IM", "EX", "CO"]
+CURRENCIES = ["GBP", "EUR", "USD"]
 
-class DeclarationGenerator:
+
+class DeclarationGenerator(BaseGenerator):
     """Generate a fake customs declaration."""
 
-    def __init__(self):
-        """Initialize the declaration generator."""
-        self.faker = Faker()
+    def __init__(self, seed: int | None = None):
+        """Initialize the declaration generator.
 
-    def _generate_client(self) -> Party:
-        """Generate a fake party."""
-        # Select a random customer from the CSV
+        Args:
+            seed (int | None): Seed for reproducible output, random if not given.
 
-        # Load customers from CSV
-        self.customers = []
-        csv_path = Path(__file__).parent.parent / "assets" / "customers.csv"
-        with open(csv_path, encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            self.customers = list(reader)
-        customer = random.choice(self.customers)
+        """
+        super().__init__(seed)
+        self.faker = self.fakers.get()
 
-        return Party(
+    def _generate_client(self, customer=None) -> Party:
+        """Generate a fake party, from a random customer if none is given."""
+        # Select a random customer from the CSV
+        customer = customer or self.customer_registry.choice(self.random)
+
+        return self._make(
+            Party,
             name=customer["company_name"],
             address=f"{customer['address']}, {customer['postal_code']} {customer['city']}, {customer['country']}",
             eori_number=customer["vat_number"],  # Using VAT number as EORI for now
         )
 
-    def _generate_transport_info(self) -> TransportInfo:
+    def _generate_transport_info(
+        self, transport_mode: int | None = None
+    ) -> TransportInfo:
         """Generate fake transport information."""
-        return TransportInfo(
+        return self._make(
+            TransportInfo,
             arrival_transport=self.faker.license_plate(),
             border_transport=self.faker.license_plate(),
-            transport_mode=random.randint(1, 9),
+            transport_mode=transport_mode or self.random.randint(1, 9),
             place_of_loading=self.faker.city(),
         )
 
-    def _generate_item_detail(self, goods: Goods, item_number: int) -> ItemDetail:
+    def _generate_item_detail(
+        self, goods: Goods, item_number: int, net_mass_kg: float | None = None
+    ) -> ItemDetail:
         """Generate a fake item detail based on a goods object."""
-        return ItemDetail(
+        if net_mass_kg is None:
+            net_mass_kg = goods.weight * 0.95  # Assuming packaging is 5% of weight
+        return self._make(
+            ItemDetail,
             item_number=item_number,
             packages=goods.quantity,
             shipping_marks=self.faker.bothify(text="??-####"),
             commodity_code=self.faker.numerify(text="########"),
             description_of_goods=goods.description,
             gross_mass_kg=goods.weight,
-            net_mass_kg=goods.weight * 0.95,  # Assuming packaging is 5% of weight
+            net_mass_kg=net_mass_kg,
         )
 
     def _generate_tax_line(self) -> TaxLine:
         """Generate a fake tax line."""
-        tax_base = round(random.uniform(100, 10000), 2)
-        tax_rate = random.choice([0, 5, 10, 15, 20])
+        tax_base = round(self.random.uniform(100, 10000), 2)
+        tax_rate = self.random.choice(TAX_RATES)
         total_tax = round(tax_base * (tax_rate / 100), 2)
 
-        return TaxLine(
-            tax_type=random.choice(["A00", "B00"]),  # A00 = Customs duties, B00 = VAT
+        return self._make(
+            TaxLine,
+            tax_type=self.random.choice(TAX_TYPES),
             tax_base=tax_base,
             tax_rate=tax_rate,
             total_tax_assessed=total_tax,
@@ -78,34 +91,142 @@ class DeclarationGenerator:
     def generate_declaration(self) -> CustomsDeclaration:
         """Generate a fake customs declaration."""
         # Generate a random goods item
-        goods = Goods.random()
+        goods = Goods.random(self.random)
 
         # Generate tax lines
-        tax_lines = [self._generate_tax_line() for _ in range(random.randint(1, 3))]
+        tax_lines = [
+            self._generate_tax_line() for _ in range(self.random.randint(1, 3))
+        ]
+
+        # Derive the dates from the run's random generator rather than the
+        # clock, so seeded declarations only differ from day to day
+        today = date.today()
+        accepted_at = datetime.combine(
+            today, time(self.random.randint(6, 18), self.random.randint(0, 59))
+        )
+        signed_on = today - timedelta(days=self.random.randint(0, 30))
+
+        return self._build_declaration(
+            goods=goods,
+            tax_lines=tax_lines,
+            declaration_type=self.random.choice(DECLARATION_TYPES),
+            parties=[self._generate_client() for _ in range(5)],
+            transport_info=self._generate_transport_info(),
+            item=self._generate_item_detail(goods, 1),
+            invoice_currency=self.random.choice(CURRENCIES),
+            invoice_value=round(self.random.uniform(1000, 100000), 2),
+            accepted_at=accepted_at,
+            signed_on=signed_on,
+        )
 
-        return CustomsDeclaration(
+    def _build_declaration(
+        self,
+        goods: Goods,
+        tax_lines: List[TaxLine],
+        declaration_type: str,
+        parties: List[Party],
+        transport_info: TransportInfo,
+        item: ItemDetail,
+        invoice_currency: str,
+        invoice_value: float,
+        accepted_at: datetime,
+        signed_on: date,
+    ) -> CustomsDeclaration:
+        """Assemble a declaration from its drawn parts."""
+        exporter, importer, declarant, representative, buyer = parties
+        return self._make(
+            CustomsDeclaration,
             mrn=f"GB{self.faker.numerify('#' * 16)}",
-            declaration_type=random.choice(["IM", "EX", "CO"]),
+            declaration_type=declaration_type,
             reference_number=self.faker.bothify(text="??####"),
             forms_count=1,
             items_count=1,
             total_packages=goods.quantity,
             # Parties
-            exporter=self._generate_client(),
-            importer=self._generate_client(),
-            declarant=self._generate_client(),
-            representative=self._generate_client(),
-            buyer=self._generate_client(),
+            exporter=exporter,
+            importer=importer,
+            declarant=declarant,
+            representative=representative,
+            buyer=buyer,
             # Transport details
-            transport_info=self._generate_transport_info(),
+            transport_info=transport_info,
             # Items
-            items=[self._generate_item_detail(goods, 1)],
+            items=[item],
             # Valuation & taxes
-            invoice_currency=random.choice(["GBP", "EUR", "USD"]),
-            invoice_value=round(random.uniform(1000, 100000), 2),
+            invoice_currency=invoice_currency,
+            invoice_value=invoice_value,
             tax_lines=tax_lines,
             # Acceptance & signature
-            acceptance_date_time=datetime.now().isoformat(),
+            acceptance_date_time=accepted_at.isoformat(),
             declaration_status="ACCEPTED",
-            place_and_date=f"{self.faker.city()}, {self.faker.date()}",
+            place_and_date=f"{self.faker.city()}, {signed_on.isoformat()}",
         )
+
+    def generate_many(self, n: int) -> List[CustomsDeclaration]:
+        """Generate ``n`` declarations, drawing all numeric fields as arrays.
+
+        Tax lines, goods, transport modes, invoice values and dates are drawn
+        in batched NumPy calls and derived values (net mass, assessed tax) are
+        computed vectorized; only the text fields are drawn per record.
+
+        Args:
+            n (int): The number of declarations.
+
+        Returns:
+            list[CustomsDeclaration]: The generated declarations.
+
+        """
+        rng = self.np_random
+        goods = Goods.random_many(n, rng, validate=self.validate)
+        net_mass = (np.array([g.weight for g in goods]) * 0.95).tolist()
+
+        # All tax lines of all declarations, split per declaration afterwards
+        tax_counts = rng.integers(1, 4, n)
+        total_lines = int(tax_counts.sum())
+        tax_bases = np.round(rng.uniform(100, 10000, total_lines), 2)
+        tax_rates = rng.choice(TAX_RATES, total_lines).astype(float)
+        total_tax = np.round(tax_bases * (tax_rates / 100), 2)
+        tax_types = rng.choice(TAX_TYPES, total_lines).tolist()
+        tax_lines = [
+            self._make(
+                TaxLine,
+                tax_type=tax_type,
+                tax_base=tax_base,
+                tax_rate=tax_rate,
+                total_tax_assessed=tax,
+                amount_payable=tax,
+            )
+            for tax_type, tax_base, tax_rate, tax in zip(
+                tax_types, tax_bases.tolist(), tax_rates.tolist(), total_tax.tolist()
+            )
+        ]
+        offsets = np.concatenate(([0], np.cumsum(tax_counts))).tolist()
+
+        declaration_types = rng.choice(DECLARATION_TYPES, n).tolist()
+        transport_modes = rng.integers(1, 10, n).tolist()
+        currencies = rng.choice(CURRENCIES, n).tolist()
+        invoice_values = np.round(rng.uniform(1000, 100000, n), 2).tolist()
+        hours = rng.integers(6, 19, n).tolist()
+        minutes = rng.integers(0, 60, n).tolist()
+        signed_days = rng.integers(0, 31, n).tolist()
+        customers = self._pick_many(self.customer_registry.customers, 5 * n)
+
+        today = date.today()
+        return [
+            self._build_declaration(
+                goods=goods[i],
+                tax_lines=tax_lines[offsets[i] : offsets[i + 1]],
+                declaration_type=declaration_types[i],
+                parties=[
+                    self._generate_client(customer)
+                    for customer in customers[5 * i : 5 * i + 5]
+                ],
+                transport_info=self._generate_transport_info(transport_modes[i]),
+                item=self._generate_item_detail(goods[i], 1, net_mass[i]),
+                invoice_currency=currencies[i],
+                invoice_value=invoice_values[i],
+                accepted_at=datetime.combine(today, time(hours[i], minutes[i])),
+                signed_on=today - timedelta(days=signed_days[i]),
+            )
+            for i in range(n)
+        ]
@@ -0,0 +1,105 @@
+import hashlib
+import threading
+
+from faker import Faker
+
+DEFAULT_LOCALE = "en_US"
+
+
+class FakerPool:
+    """A process-wide cache of ``Faker`` instances, one per locale.
+
+    Building a ``Faker`` loads and instantiates all providers for its locale,
+    so generators share the cached instances instead of creating their own.
+    Seeded instances carry private random state and are therefore never
+    shared: asking for a seed always returns a new instance.
+    """
+
+    def __init__(self):
+        """Initialize an empty pool."""
+        self._fakers: dict[str, Faker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, locale: str | None = None, seed: int | None = None) -> Faker:
+        """Get a Faker for a locale.
+
+        Args:
+            locale (str | None): The Faker locale, e.g. ``"nl_BE"``.
+            seed (int | None): Seed for a private, reproducible instance.
+
+        Returns:
+            Faker: The shared instance for the locale, or a new seeded one.
+
+        """
+        locale = locale or DEFAULT_LOCALE
+        if seed is not None:
+            faker = Faker(locale)
+            faker.seed_instance(seed)
+            return faker
+
+        faker = self._fakers.get(locale)
+        if faker is None:
+            with self._lock:
+                faker = self._fakers.get(locale)
+                if faker is None:
+                    faker = self._fakers[locale] = Faker(locale)
+        return faker
+
+    def clear(self) -> None:
+        """Drop all cached instances."""
+        with self._lock:
+            self._fakers.clear()
+
+    def __len__(self) -> int:
+        """Get the number of cached locales."""
+        return len(self._fakers)
+
+
+_pool = FakerPool()
+
+
+def get_faker(locale: str | None = None, seed: int | None = None) -> Faker:
+    """Get a Faker for a locale from the process-wide pool."""
+    return _pool.get(locale, seed)
+
+
+def derive_seed(seed: int, *parts: object) -> int:
+    """Derive a stable sub-seed from a seed, e.g. per generator or locale.
+
+    Unlike ``hash()``, the result does not change between processes.
+    """
+    key = ":".join(str(part) for part in (seed, *parts)).encode("utf-8")
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], "big")
+
+
+class FakerSource:
+    """The Fakers of a single generator.
+
+    Unseeded, it hands out the shared instances of the process-wide pool.
+    Seeded, it keeps one private instance per locale, seeded from the
+    generator's seed and the locale, so the output only depends on the seed
+    and the order of the calls.
+    """
+
+    def __init__(self, seed: int | None = None):
+        """Initialize the source, optionally with a seed."""
+        self.seed = seed
+        self._seeded: dict[str, Faker] = {}
+
+    def reseed(self, seed: int) -> None:
+        """Reseed the private instances as if the source was created with ``seed``."""
+        self.seed = seed
+        for locale, faker in self._seeded.items():
+            faker.seed_instance(derive_seed(seed, locale))
+
+    def get(self, locale: str | None = None) -> Faker:
+        """Get the Faker for a locale."""
+        if self.seed is None:
+            return get_faker(locale)
+        locale = locale or DEFAULT_LOCALE
+        faker = self._seeded.get(locale)
+        if faker is None:
+            faker = self._seeded[locale] = get_faker(
+                locale, seed=derive_seed(self.seed, locale)
+            )
+        return faker
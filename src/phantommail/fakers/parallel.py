@@ -0,0 +1,158 @@
+"""Generate large amounts of faker data across a pool of processes."""
+
+import multiprocessing
+import os
+import random
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Tuple
+
+from phantommail.fakers.base import BaseGenerator
+from phantommail.fakers.complaint import FakeComplaint
+from phantommail.fakers.declaration import DeclarationGenerator
+from phantommail.fakers.faker_pool import derive_seed
+from phantommail.fakers.price_request import PriceRequestGenerator
+from phantommail.fakers.question import TransportQuestionGenerator
+from phantommail.fakers.random_promotional import RandomPromotionalGenerator
+from phantommail.fakers.transport import TransportOrderGenerator
+from phantommail.fakers.update_order import UpdateOrderGenerator
+from phantommail.fakers.waiting_costs import WaitingCostsGenerator
+
+# The generator class and generate method for every kind of record
+GENERATORS: Dict[str, Tuple[type[BaseGenerator], str]] = {
+    "order": (TransportOrderGenerator, "generate"),
+    "declaration": (DeclarationGenerator, "generate_declaration"),
+    "question": (TransportQuestionGenerator, "generate_question"),
+    "complaint": (FakeComplaint, "generate_complaint"),
+    "price_request": (PriceRequestGenerator, "generate_price_request"),
+    "waiting_costs": (WaitingCostsGenerator, "generate_waiting_costs_scenario"),
+    "update_order": (UpdateOrderGenerator, "generate_update_order_question"),
+    "random": (RandomPromotionalGenerator, "generate_promotional_email"),
+}
+
+# Generators of the current (worker) process, built on first use
+_generators: Dict[str, BaseGenerator] = {}
+
+
+def generate_chunk(kind: str, seed: int, size: int, validate: bool = True) -> List[Any]:
+    """Generate a chunk of records in the current process.
+
+    The generator of each kind is built once per process and reseeded for
+    every chunk, so a chunk only depends on its seed and not on the worker
+    that happens to run it.
+
+    Args:
+        kind (str): The kind of record, one of ``GENERATORS``.
+        seed (int): The seed of the chunk.
+        size (int): The number of records to generate.
+        validate (bool): Validate the records, or skip pydantic validation.
+
+    Returns:
+        list: The generated records.
+
+    """
+    generator = _generators.get(kind)
+    if generator is None:
+        generator_type, _ = GENERATORS[kind]
+        generator = _generators[kind] = generator_type(seed=seed)
+    else:
+        generator.reseed(seed)
+    generator.validate = validate
+    # Generators with a bulk path draw the numbers of a whole chunk at once
+    if hasattr(generator, "generate_many"):
+        return generator.generate_many(size)
+    generate = getattr(generator, GENERATORS[kind][1])
+    return [generate() for _ in range(size)]
+
+
+def generate_parallel(
+    kind: str,
+    count: int,
+    chunk_size: int = 1000,
+    workers: int | None = None,
+    seed: int | None = None,
+    executor: Executor | None = None,
+    validate: bool = True,
+) -> Iterator[List[Any]]:
+    """Generate ``count`` records across processes, yielding them in chunks.
+
+    Chunks are yielded in order as soon as they are ready, and at most two
+    chunks per worker are in flight, so memory stays bounded however many
+    records are requested. Every chunk gets its own seed derived from
+    ``seed``; with a seed the output is the same for any number of workers.
+
+    Args:
+        kind (str): The kind of record, one of ``GENERATORS``.
+        count (int): The total number of records.
+        chunk_size (int): The number of records per chunk.
+        workers (int | None): The number of processes, defaults to the CPU
+            count. With one worker the records are generated in-process.
+        seed (int | None): Seed for a reproducible stream, random if not given.
+        executor (Executor | None): An existing pool to run the chunks on.
+        validate (bool): Validate the records, or yield the lightweight
+            records of ``phantommail.models.records`` (much cheaper to build
+            and to send between processes).
+
+    Yields:
+        list: Chunks of at most ``chunk_size`` records.
+
+    """
+    if kind not in GENERATORS:
+        raise ValueError(f"Unknown kind '{kind}', choose from {list(GENERATORS)}.")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    workers = workers or os.cpu_count() or 1
+    # Chunks always get an explicit seed, even when the caller didn't ask for
+    # one, so no two workers can end up with the same random state
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**63)
+
+    chunks = [
+        (kind, derive_seed(seed, index), min(chunk_size, count - start), validate)
+        for index, start in enumerate(range(0, count, chunk_size))
+    ]
+    if executor is None and workers == 1:
+        for chunk in chunks:
+            yield generate_chunk(*chunk)
+        return
+
+    owned = executor is None
+    executor = executor or ProcessPoolExecutor(
+        max_workers=workers, mp_context=_process_context()
+    )
+    pending = deque()
+    try:
+        for chunk in chunks:
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+            pending.append(executor.submit(generate_chunk, *chunk))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # Stopped early: don't keep a shared pool busy with unread chunks
+        for future in pending:
+            future.cancel()
+        if owned:
+            executor.shutdown(cancel_futures=True)
+
+
+def _process_context() -> multiprocessing.context.BaseContext:
+    """Get a start method that is safe from a process that runs threads.
+
+    Forking a multi-threaded process (the graph and the PDF renderer start
+    threads) can deadlock the children, so workers are started from a clean
+    fork server, or spawned where that isn't available.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context(
+        "forkserver" if "forkserver" in methods else "spawn"
+    )
+
+
+def iter_records(kind: str, count: int, **kwargs) -> Iterator[Any]:
+    """Generate ``count`` records in parallel, yielding them one by one.
+
+    Takes the same arguments as ``generate_parallel``.
+    """
+    for chunk in generate_parallel(kind, count, **kwargs):
+        yield from chunk
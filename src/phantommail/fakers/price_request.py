@@ -1,16 +1,19 @@
-import csv
-import random
 from datetime import date, timedelta
-from pathlib import Path
 
-from faker import Faker
+from phantommail.fakers.base import BaseGenerator
 
 
-class PriceRequestGenerator:
+class PriceRequestGenerator(BaseGenerator):
     """Generate a fake transport price request."""
 
-    def __init__(self):
-        """Initialize the price request generator."""
+    def __init__(self, seed: int | None = None):
+        """Initialize the price request generator.
+
+        Args:
+            seed (int | None): Seed for reproducible output, random if not given.
+
+        """
+        super().__init__(seed)
         self.languages = {
             "Netherlands": ("nl_NL", "Dutch"),
             "United Kingdom": ("en_GB", "English"),
@@ -26,13 +29,6 @@ class PriceRequestGenerator:
             "Portugal": ("pt_PT", "English"),
         }
 
-        # Load customers from CSV
-        self.customers = []
-        csv_path = Path(__file__).parent.parent / "assets" / "customers.csv"
-        with open(csv_path, encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            self.customers = list(reader)
-
         # Transport titles by language
         self.titles = {
             "Dutch": [
@@ -108,30 +104,30 @@ class PriceRequestGenerator:
 
         """
         # Select a random customer
-        customer = random.choice(self.customers)
+        customer = self.customer_registry.choice(self.random)
 
         # Get language info based on customer country
         locale, language = self.languages.get(customer["country"], ("en_GB", "English"))
-        faker = Faker(locale)
+        faker = self.fakers.get(locale)
 
         # Generate sender details
         sender_name = faker.name()
-        title = random.choice(self.titles[language])
+        title = self.random.choice(self.titles[language])
 
         # Generate route details
         origin_city = faker.city()
         destination_city = faker.city()
 
         # Generate price details
-        base_price = random.randint(1500, 4000)
-        proposed_price = base_price + random.randint(100, 500)
-        budget_price = base_price - random.randint(100, 400)
+        base_price = self.random.randint(1500, 4000)
+        proposed_price = base_price + self.random.randint(100, 500)
+        budget_price = base_price - self.random.randint(100, 400)
 
         # Generate transport date
-        transport_date = date.today() + timedelta(days=random.randint(7, 30))
+        transport_date = date.today() + timedelta(days=self.random.randint(7, 30))
 
         # Select and format price message
-        template = random.choice(self.price_templates[language])
+        template = self.random.choice(self.price_templates[language])
         price_message = template.format(
             proposed_price=proposed_price,
             budget_price=budget_price,
@@ -140,7 +136,7 @@ class PriceRequestGenerator:
         )
 
         # Select closing
-        closing = random.choice(self.closings[language])
+        closing = self.random.choice(self.closings[language])
 
         # Build signature block
         if language == "German":
@@ -1,15 +1,19 @@
-import random
+from phantommail.fakers.base import BaseGenerator
 
-from faker import Faker
 
-
-class TransportQuestionGenerator:
+class TransportQuestionGenerator(BaseGenerator):
     """Generate a fake transport-related question."""
 
-    def __init__(self):
-        """Initialize the transport question generator."""
+    def __init__(self, seed: int | None = None):
+        """Initialize the transport question generator.
+
+        Args:
+            seed (int | None): Seed for reproducible output, random if not given.
+
+        """
+        super().__init__(seed)
         # Using a single locale for simplicity, you can add more locales if needed.
-        self.faker = Faker("en_GB")
+        self.faker = self.fakers.get("en_GB")
         self.question_templates = [
             "What is the scheduled pickup time at {pickup_address}?",
             "When will the goods be delivered to {delivery_address}?",
@@ -25,7 +29,7 @@ class TransportQuestionGenerator:
             dict: Contains the question text and sender information
 
         """
-        template = random.choice(self.question_templates)
+        template = self.random.choice(self.question_templates)
         # Generate fake details to populate the question
         pickup_address = self.faker.address()
         delivery_address = self.faker.address()
@@ -1,16 +1,19 @@
-import csv
-import random
 from datetime import date, timedelta
-from pathlib import Path
 
-from faker import Faker
+from phantommail.fakers.base import BaseGenerator
 
 
-class RandomPromotionalGenerator:
+class RandomPromotionalGenerator(BaseGenerator):
     """Generate random promotional emails for transport services."""
 
-    def __init__(self):
-        """Initialize the random promotional generator."""
+    def __init__(self, seed: int | None = None):
+        """Initialize the random promotional generator.
+
+        Args:
+            seed (int | None): Seed for reproducible output, random if not given.
+
+        """
+        super().__init__(seed)
         self.languages = {
             "Netherlands": ("nl_NL", "Dutch"),
             "United Kingdom": ("en_GB", "English"),
@@ -26,13 +29,6 @@ class RandomPromotionalGenerator:
             "Portugal": ("pt_PT", "English"),
         }
 
-        # Load customers from CSV
-        self.customers = []
-        csv_path = Path(__file__).parent.parent / "assets" / "customers.csv"
-        with open(csv_path, encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            self.customers = list(reader)
-
         # Promotional themes by language
         self.promo_themes = {
             "English": [
@@ -183,31 +179,33 @@ class RandomPromotionalGenerator:
 
         """
         # Select a random customer
-        customer = random.choice(self.customers)
+        customer = self.customer_registry.choice(self.random)
 
         # Get language info based on customer country
         locale, language = self.languages.get(customer["country"], ("en_GB", "English"))
-        faker = Faker(locale)
+        faker = self.fakers.get(locale)
 
         # Select promotional theme
         promo_themes = self.promo_themes.get(language, self.promo_themes["English"])
-        promo = random.choice(promo_themes)
+        promo = self.random.choice(promo_themes)
 
         # Generate discount if needed
-        discount = random.randint(10, 30)
+        discount = self.random.randint(10, 30)
         promo_content = promo["content"].format(discount=discount)
         promo_benefit = promo["benefit"].format(discount=discount)
 
         # Generate validity period
         start_date = date.today()
-        end_date = start_date + timedelta(days=random.randint(14, 30))
+        end_date = start_date + timedelta(days=self.random.randint(14, 30))
 
         # Generate sender details
         sender_name = faker.name()
-        title = random.choice(self.titles.get(language, self.titles["English"]))
+        title = self.random.choice(self.titles.get(language, self.titles["English"]))
 
         # Select closing
-        closing = random.choice(self.closings.get(language, self.closings["English"]))
+        closing = self.random.choice(
+            self.closings.get(language, self.closings["English"])
+        )
 
         # Build signature
         signature = f"""{closing}
@@ -1,20 +1,24 @@
-import csv
-import random
 from datetime import date, timedelta
-from pathlib import Path
 from typing import List
 
 from faker import Faker
 
+from phantommail.fakers.base import BaseGenerator
 from phantommail.models.goods import Goods
 from phantommail.models.transport import Address, Client, TransportOrder
 
 
-class TransportOrderGenerator:
+class TransportOrderGenerator(BaseGenerator):
     """Generate a fake transport order."""
 
-    def __init__(self):
-        """Initialize the transport order generator."""
+    def __init__(self, seed: int | None = None):
+        """Initialize the transport order generator.
+
+        Args:
+            seed (int | None): Seed for reproducible output, random if not given.
+
+        """
+        super().__init__(seed)
         self.european_countries = {
             "Germany": "de_DE",
             "France": "fr_FR",
@@ -26,25 +30,27 @@ class TransportOrderGenerator:
             "United Kingdom": "en_GB",
             "Portugal": "pt_PT",
         }
-        # Initialize Faker instances
-        self.fake_pickup = Faker(random.choice(list(self.european_countries.values())))
-        self.fake_delivery = Faker("en_GB")
-
-        # Load customers from CSV
-        self.customers = []
-        csv_path = Path(__file__).parent.parent / "assets" / "customers.csv"
-        with open(csv_path, encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            self.customers = list(reader)
-
-    def generate_client(self) -> Client:
-        """Generate a fake client."""
+        # Delivery is always in the UK, the pickup country is drawn per order
+        self.fake_delivery = self.fakers.get("en_GB")
+
+    def pickup_faker(self) -> Faker:
+        """Get the Faker of a random European pickup country."""
+        return self.fakers.get(
+            self.random.choice(list(self.european_countries.values()))
+        )
+
+    def generate_client(
+        self, faker_instance: Faker | None = None, customer=None
+    ) -> Client:
+        """Generate a fake client, from a random customer if none is given."""
+        faker_instance = faker_instance or self.pickup_faker()
         # Select a random customer from the CSV
-        customer = random.choice(self.customers)
+        customer = customer or self.customer_registry.choice(self.random)
 
-        return Client(
+        return self._make(
+            Client,
             name=customer["company_name"],
-            sender_name=self.fake_pickup.name(),  # Generate a random contact person
+            sender_name=faker_instance.name(),  # Generate a random contact person
             company=customer["company_name"],
             vat_number=customer["vat_number"],
             address=customer["address"],
@@ -57,7 +63,8 @@ class TransportOrderGenerator:
 
     def generate_address(self, faker_instance: Faker) -> Address:
         """Generate a fake address."""
-        return Address(
+        return self._make(
+            Address,
             company=faker_instance.company(),
             address=faker_instance.address(),
             country=faker_instance.current_country(),
@@ -69,33 +76,102 @@ class TransportOrderGenerator:
 
     def generate(self) -> TransportOrder:
         """Generate a fake transport order."""
-        client = self.generate_client()
-        pickup_address = self.generate_address(self.fake_pickup)
-        delivery_address = self.generate_address(self.fake_delivery)
-
-        loading_stops = self.generate_stops(random.randint(0, 1), self.fake_pickup)
-        unloading_stops = self.generate_stops(random.randint(0, 1), self.fake_delivery)
+        fake_pickup = self.pickup_faker()
+        customer = self.customer_registry.choice(self.random)
+        loading_stop_count = self.random.randint(0, 1)
+        unloading_stop_count = self.random.randint(0, 1)
 
         # Generate loading date between tomorrow and 10 days from now
         tomorrow = date.today() + timedelta(days=1)
-        loading_date = tomorrow + timedelta(days=random.randint(0, 9))
+        loading_date = tomorrow + timedelta(days=self.random.randint(0, 9))
 
         # Generate unloading date at least 1 day after loading, up to 5 days later
-        unloading_date = loading_date + timedelta(days=random.randint(1, 5))
+        unloading_date = loading_date + timedelta(days=self.random.randint(1, 5))
 
         # Generate loading metres and pallet count
-        loading_metres = random.randint(3, 12)  # Random metres between 3 and 12
-        pallet_count = random.randint(1, 5)  # Random pallet count between 1 and 5
-
-        return TransportOrder(
-            client=client,
-            goods=Goods.random(),
-            pickup_address=pickup_address,
-            delivery_address=delivery_address,
-            intermediate_loading_stops=loading_stops,
-            intermediate_unloading_stops=unloading_stops,
+        loading_metres = self.random.randint(3, 12)  # Random metres between 3 and 12
+        pallet_count = self.random.randint(1, 5)  # Random pallet count between 1 and 5
+
+        return self._build_order(
+            fake_pickup=fake_pickup,
+            customer=customer,
+            goods=Goods.random(self.random),
+            loading_stop_count=loading_stop_count,
+            unloading_stop_count=unloading_stop_count,
             loading_date=loading_date,
             unloading_date=unloading_date,
             loading_metres=loading_metres,
             pallet_count=pallet_count,
         )
+
+    def _build_order(
+        self,
+        fake_pickup: Faker,
+        customer,
+        goods: Goods,
+        loading_stop_count: int,
+        unloading_stop_count: int,
+        loading_date: date,
+        unloading_date: date,
+        loading_metres: int,
+        pallet_count: int,
+    ) -> TransportOrder:
+        """Assemble a transport order from its drawn parts."""
+        return self._make(
+            TransportOrder,
+            client=self.generate_client(fake_pickup, customer),
+            goods=goods,
+            pickup_address=self.generate_address(fake_pickup),
+            delivery_address=self.generate_address(self.fake_delivery),
+            intermediate_loading_stops=self.generate_stops(
+                loading_stop_count, fake_pickup
+            ),
+            intermediate_unloading_stops=self.generate_stops(
+                unloading_stop_count, self.fake_delivery
+            ),
+            loading_date=loading_date,
+            unloading_date=unloading_date,
+            loading_metres=loading_metres,
+            pallet_count=pallet_count,
+        )
+
+    def generate_many(self, n: int) -> List[TransportOrder]:
+        """Generate ``n`` transport orders, drawing all numeric fields as arrays.
+
+        Pickup countries, customers, stop counts, dates, loading metres,
+        pallet counts and goods are drawn in batched NumPy calls; only the
+        names and addresses are drawn per record.
+
+        Args:
+            n (int): The number of transport orders.
+
+        Returns:
+            list[TransportOrder]: The generated transport orders.
+
+        """
+        rng = self.np_random
+        locales = self._pick_many(list(self.european_countries.values()), n)
+        customers = self._pick_many(self.customer_registry.customers, n)
+        loading_stop_counts = rng.integers(0, 2, n).tolist()
+        unloading_stop_counts = rng.integers(0, 2, n).tolist()
+        loading_offsets = rng.integers(1, 11, n)
+        unloading_offsets = loading_offsets + rng.integers(1, 6, n)
+        loading_metres = rng.integers(3, 13, n).tolist()
+        pallet_counts = rng.integers(1, 6, n).tolist()
+        goods = Goods.random_many(n, rng, validate=self.validate)
+
+        today = date.today()
+        return [
+            self._build_order(
+                fake_pickup=self.fakers.get(locales[i]),
+                customer=customers[i],
+                goods=goods[i],
+                loading_stop_count=loading_stop_counts[i],
+                unloading_stop_count=unloading_stop_counts[i],
+                loading_date=today + timedelta(days=int(loading_offsets[i])),
+                unloading_date=today + timedelta(days=int(unloading_offsets[i])),
+                loading_metres=loading_metres[i],
+                pallet_count=pallet_counts[i],
+            )
+            for i in range(n)
+        ]
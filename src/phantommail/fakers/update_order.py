@@ -1,15 +1,17 @@
-import csv
-import random
-from pathlib import Path
+from phantommail.fakers.base import BaseGenerator
 
-from faker import Faker
 
-
-class UpdateOrderGenerator:
+class UpdateOrderGenerator(BaseGenerator):
     """Generate fake update order questions."""
 
-    def __init__(self):
-        """Initialize the update order generator."""
+    def __init__(self, seed: int | None = None):
+        """Initialize the update order generator.
+
+        Args:
+            seed (int | None): Seed for reproducible output, random if not given.
+
+        """
+        super().__init__(seed)
         self.languages = {
             "Netherlands": ("nl_NL", "Dutch"),
             "United Kingdom": ("en_GB", "English"),
@@ -25,13 +27,6 @@ class UpdateOrderGenerator:
             "Portugal": ("pt_PT", "English"),
         }
 
-        # Load customers from CSV
-        self.customers = []
-        csv_path = Path(__file__).parent.parent / "assets" / "customers.csv"
-        with open(csv_path, encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            self.customers = list(reader)
-
         # Update questions by language
         self.question_templates = {
             "English": [
@@ -131,23 +126,23 @@ class UpdateOrderGenerator:
 
         """
         # Select a random customer
-        customer = random.choice(self.customers)
+        customer = self.customer_registry.choice(self.random)
 
         # Get language info based on customer country
         locale, language = self.languages.get(customer["country"], ("en_GB", "English"))
-        faker = Faker(locale)
+        faker = self.fakers.get(locale)
 
         # Generate sender details
         sender_name = faker.name()
-        title = random.choice(self.titles[language])
+        title = self.random.choice(self.titles[language])
 
         # Generate reference numbers
-        order_ref = f"{random.randint(20250000, 20259999)}/{random.randint(1, 99):02d}"
-        tracking_ref = f"VTR{random.randint(100000, 999999)}"
+        order_ref = f"{self.random.randint(20250000, 20259999)}/{self.random.randint(1, 99):02d}"
+        tracking_ref = f"VTR{self.random.randint(100000, 999999)}"
 
         # Select greeting and question
-        greeting = random.choice(self.greetings[language])
-        question = random.choice(self.question_templates[language])
+        greeting = self.random.choice(self.greetings[language])
+        question = self.random.choice(self.question_templates[language])
 
         # Get closing signature
         closing = self.closing_signatures[language]
@@ -1,16 +1,20 @@
-import csv
-import random
 from datetime import date, timedelta
-from pathlib import Path
+from typing import List
 
-from faker import Faker
+from phantommail.fakers.base import BaseGenerator
 
 
-class WaitingCostsGenerator:
+class WaitingCostsGenerator(BaseGenerator):
     """Generate fake waiting cost dispute scenarios."""
 
-    def __init__(self):
-        """Initialize the waiting costs generator."""
+    def __init__(self, seed: int | None = None):
+        """Initialize the waiting costs generator.
+
+        Args:
+            seed (int | None): Seed for reproducible output, random if not given.
+
+        """
+        super().__init__(seed)
         self.languages = {
             "Netherlands": ("nl_NL", "Dutch"),
             "United Kingdom": ("en_GB", "English"),
@@ -26,13 +30,6 @@ class WaitingCostsGenerator:
             "Portugal": ("pt_PT", "English"),
         }
 
-        # Load customers from CSV
-        self.customers = []
-        csv_path = Path(__file__).parent.parent / "assets" / "customers.csv"
-        with open(csv_path, encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            self.customers = list(reader)
-
         # Waiting reasons
         self.waiting_reasons = {
             "English": [
@@ -143,30 +140,53 @@ class WaitingCostsGenerator:
 
         """
         # Select a random customer
-        customer = random.choice(self.customers)
+        customer = self.customer_registry.choice(self.random)
+
+        delivery_days_ago = self.random.randint(1, 7)
+
+        # Generate reference numbers
+        order_ref = f"{self.random.randint(20250000, 20259999)}/{self.random.randint(1, 99):02d}"
+        delivery_ref = str(self.random.randint(50000000, 59999999))
+        internal_ref = str(self.random.randint(700000, 799999))
+        tracking_ref = f"VTR{self.random.randint(100000, 999999)}"
+
+        # Generate waiting details
+        waiting_hours = self.random.randint(3, 8)
+        cost_per_hour = self.random.randint(50, 75)
 
+        return self._build_scenario(
+            customer=customer,
+            delivery_date=date.today() - timedelta(days=delivery_days_ago),
+            order_ref=order_ref,
+            delivery_ref=delivery_ref,
+            internal_ref=internal_ref,
+            tracking_ref=tracking_ref,
+            waiting_hours=waiting_hours,
+            total_cost=waiting_hours * cost_per_hour,
+        )
+
+    def _build_scenario(
+        self,
+        customer,
+        delivery_date: date,
+        order_ref: str,
+        delivery_ref: str,
+        internal_ref: str,
+        tracking_ref: str,
+        waiting_hours: int,
+        total_cost: int,
+    ) -> dict:
+        """Assemble a scenario and its dispute message from the drawn numbers."""
         # Get language info based on customer country
         locale, language = self.languages.get(customer["country"], ("en_GB", "English"))
-        faker = Faker(locale)
+        faker = self.fakers.get(locale)
 
         # Generate scenario details
         delivery_city = faker.city()
         destination_company = faker.company()
-        delivery_date = date.today() - timedelta(days=random.randint(1, 7))
-
-        # Generate reference numbers
-        order_ref = f"{random.randint(20250000, 20259999)}/{random.randint(1, 99):02d}"
-        delivery_ref = str(random.randint(50000000, 59999999))
-        internal_ref = str(random.randint(700000, 799999))
-        tracking_ref = f"VTR{random.randint(100000, 999999)}"
-
-        # Generate waiting details
-        waiting_hours = random.randint(3, 8)
-        cost_per_hour = random.randint(50, 75)
-        total_cost = waiting_hours * cost_per_hour
 
         # Select waiting reason
-        waiting_reason = random.choice(
+        waiting_reason = self.random.choice(
             self.waiting_reasons.get(language, self.waiting_reasons["English"])
         )
 
@@ -191,16 +211,16 @@ class WaitingCostsGenerator:
                 "Responsable Supply Chain",
             ],
         }
-        sender_title = random.choice(titles.get(language, titles["English"]))
+        sender_title = self.random.choice(titles.get(language, titles["English"]))
 
         # Select dispute message
-        dispute_template = random.choice(self.dispute_templates[language])
+        dispute_template = self.random.choice(self.dispute_templates[language])
         dispute_message = dispute_template.format(
             destination_company=destination_company
         )
 
         # Select closing
-        closing_message = random.choice(self.closings[language])
+        closing_message = self.random.choice(self.closings[language])
 
         # Build signature
         if language == "English":
@@ -258,3 +278,44 @@ Email: {customer["email"]}"""
             "signature": signature,
             "formatted_message": formatted_message,
         }
+
+    def generate_many(self, n: int) -> List[dict]:
+        """Generate ``n`` scenarios, drawing all numeric fields as arrays.
+
+        Customers, delivery dates, reference numbers, waiting hours and costs
+        are drawn in batched NumPy calls and the total costs are computed
+        vectorized; the texts are still selected per record.
+
+        Args:
+            n (int): The number of scenarios.
+
+        Returns:
+            list[dict]: The generated scenarios, as ``generate_waiting_costs_scenario``.
+
+        """
+        rng = self.np_random
+        customers = self._pick_many(self.customer_registry.customers, n)
+        delivery_days_ago = rng.integers(1, 8, n).tolist()
+        order_numbers = rng.integers(20250000, 20260000, n).tolist()
+        order_suffixes = rng.integers(1, 100, n).tolist()
+        delivery_refs = rng.integers(50000000, 60000000, n).tolist()
+        internal_refs = rng.integers(700000, 800000, n).tolist()
+        tracking_refs = rng.integers(100000, 1000000, n).tolist()
+        waiting_hours = rng.integers(3, 9, n)
+        total_costs = (waiting_hours * rng.integers(50, 76, n)).tolist()
+        waiting_hours = waiting_hours.tolist()
+
+        today = date.today()
+        return [
+            self._build_scenario(
+                customer=customers[i],
+                delivery_date=today - timedelta(days=delivery_days_ago[i]),
+                order_ref=f"{order_numbers[i]}/{order_suffixes[i]:02d}",
+                delivery_ref=str(delivery_refs[i]),
+                internal_ref=str(internal_refs[i]),
+                tracking_ref=f"VTR{tracking_refs[i]}",
+                waiting_hours=waiting_hours[i],
+                total_cost=total_costs[i],
+            )
+            for i in range(n)
+        ]
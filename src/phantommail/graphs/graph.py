@@ -8,6 +8,12 @@ from phantommail.graphs.state import FakeEmailState
 
 class ConfigSchema(TypedDict):
     sender: str
+    backend: str
+    batch_delivery: bool
+    seed: int
+    render_attachments: bool
+    compact_prompts: bool
+    stream_attachments: bool
 
 
 graph_nodes = GraphNodes()
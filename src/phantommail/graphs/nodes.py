@@ -1,11 +1,24 @@
+import asyncio
+import contextlib
 import random
-from importlib import resources
+from typing import Callable
 
+from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_google_vertexai import ChatVertexAI
 
+from phantommail.backends import (
+    EmailBackend,
+    EmailRequest,
+    LLMBackend,
+    ResponseCache,
+    SlotBackend,
+    TemplateBackend,
+)
+from phantommail.backends.cache import model_identity
 from phantommail.fakers.complaint import FakeComplaint
 from phantommail.fakers.declaration import DeclarationGenerator
+from phantommail.fakers.faker_pool import derive_seed
 from phantommail.fakers.price_request import PriceRequestGenerator
 from phantommail.fakers.question import TransportQuestionGenerator
 from phantommail.fakers.random_promotional import RandomPromotionalGenerator
@@ -13,62 +26,285 @@ from phantommail.fakers.transport import TransportOrderGenerator
 from phantommail.fakers.update_order import UpdateOrderGenerator
 from phantommail.fakers.waiting_costs import WaitingCostsGenerator
 from phantommail.graphs.state import FakeEmailState
-from phantommail.helpers.html_to_pdf import create_pdf
+from phantommail.helpers.html_to_pdf import create_pdf, get_renderer
 from phantommail.logger import setup_logger
-from phantommail.models.email import Email, FullEmail
-from phantommail.send_email import send
+from phantommail.models.email import Attachment, FullEmail
+from phantommail.send_email import DeliveryQueue, Mailer
+from phantommail.telemetry import PROMPT_BYTES, get_telemetry, instrumented
+from phantommail.templates import get_template_registry
 
 logger = setup_logger(__name__)
 
+EMAIL_TYPES = [
+    "order",
+    "question",
+    "complaint",
+    "declaration",
+    "price_request",
+    "waiting_costs",
+    "update_order",
+    "random",
+]
+
 
 class GraphNodes:
     """The nodes for the fake email graph."""
 
-    def __init__(self):
-        """Initialize the graph nodes."""
-        self.llm = ChatVertexAI(
-            model="gemini-2.5-pro", temperature=0.5, project="vectrix-demo"
+    # Backends kept for models passed per run in the config
+    MAX_LLM_BACKENDS = 16
+
+    def __init__(
+        self,
+        llm: BaseChatModel | None = None,
+        backend: str | EmailBackend = "llm",
+        response_cache: ResponseCache | None = None,
+        mailer: Mailer | None = None,
+        delivery_queue: DeliveryQueue | None = None,
+    ):
+        """Initialize the graph nodes.
+
+        Args:
+            llm (BaseChatModel | None): The chat model of the ``llm`` backend,
+                defaults to Gemini on Vertex AI (created on first use).
+            backend (str | EmailBackend): The default backend, either ``"llm"``,
+                ``"slots"``, ``"template"`` or a custom backend. Runs can override it with
+                the ``backend`` key in the graph config.
+            response_cache (ResponseCache | None): Cache for LLM responses,
+                defaults to the one configured with ``PHANTOMMAIL_LLM_CACHE``.
+            mailer (Mailer | None): Delivers the emails without blocking the
+                event loop, defaults to a ``Mailer`` with default limits.
+            delivery_queue (DeliveryQueue | None): Batches deliveries for runs
+                with ``batch_delivery`` set in the graph config.
+
+        """
+        self._llm = llm
+        self._llm_backend: LLMBackend | None = None
+        self._llm_backends: dict[tuple[str, float | None], LLMBackend] = {}
+        self.response_cache = response_cache or ResponseCache.from_env()
+        self.template_backend = TemplateBackend()
+        self.default_backend = backend
+        self.mailer = mailer or Mailer()
+        self.delivery_queue = delivery_queue or DeliveryQueue(self.mailer)
+        # All example templates are read once, up front
+        self.templates = get_template_registry()
+
+        # Shared warm browser, so attachments don't pay a Chromium cold start
+        self.pdf_renderer = get_renderer()
+
+        # Generators are built once and shared by all unseeded graph runs. They
+        # keep no per-call state and never await, so concurrent runs can't
+        # interleave. Runs with a seed get their own seeded generators.
+        self.declaration_generator = DeclarationGenerator()
+        self.transport_order_generator = TransportOrderGenerator()
+        self.question_generator = TransportQuestionGenerator()
+        self.complaint_generator = FakeComplaint()
+        self.price_request_generator = PriceRequestGenerator()
+        self.waiting_costs_generator = WaitingCostsGenerator()
+        self.update_order_generator = UpdateOrderGenerator()
+        self.promo_generator = RandomPromotionalGenerator()
+        self._seeded_generators: dict = {}
+
+    @property
+    def llm(self) -> BaseChatModel:
+        """Get the default chat model, creating it on first use."""
+        if self._llm is None:
+            self._llm = ChatVertexAI(
+                model="gemini-2.5-pro", temperature=0.5, project="vectrix-demo"
+            )
+        return self._llm
+
+    def get_backend(self, config) -> EmailBackend:
+        """Get the email backend selected in the graph config."""
+        configurable = (config or {}).get("configurable", {})
+        backend = configurable.get("backend") or self.default_backend
+
+        if isinstance(backend, EmailBackend):
+            return backend
+        if backend == "template":
+            return self.template_backend
+        if backend == "llm":
+            return self._get_llm_backend(configurable)
+        if backend == "slots":
+            return SlotBackend(
+                self._get_llm_backend(configurable), renderer=self.template_backend
+            )
+        raise ValueError(
+            f"Unknown backend '{backend}', choose 'llm', 'slots', 'template' or pass an EmailBackend."
         )
 
+    def _get_llm_backend(self, configurable: dict) -> LLMBackend:
+        """Get the LLM backend for the model in the config, or the default model."""
+        llm = configurable.get("llm")
+        if llm is not None:
+            # One backend per model, so its structured runnable is reused. Kept
+            # in a small LRU keyed by model and temperature, so per-run models
+            # don't pile up; a different instance gets a fresh backend.
+            key = model_identity(llm)
+            backend = self._llm_backends.pop(key, None)
+            if backend is None or backend.llm is not llm:
+                backend = LLMBackend(llm, cache=self.response_cache)
+            self._llm_backends[key] = backend
+            while len(self._llm_backends) > self.MAX_LLM_BACKENDS:
+                self._llm_backends.pop(next(iter(self._llm_backends)))
+            return backend
+        if self._llm_backend is None:
+            self._llm_backend = LLMBackend(self.llm, cache=self.response_cache)
+        return self._llm_backend
+
+    def _rng(self, config, name: str) -> random.Random | None:
+        """Get a random generator for a step of a seeded run, if seeded."""
+        seed = (config or {}).get("configurable", {}).get("seed")
+        if seed is None:
+            return None
+        return random.Random(derive_seed(seed, name))
+
+    def _generator(self, name: str, config):
+        """Get a faker generator, seeded for this run when the config has a seed.
+
+        Seeded runs share one private generator per type that is reseeded on
+        every call. Generating never awaits, so the reseed and the generation
+        that follows can't interleave with another run.
+
+        Args:
+            name (str): The generator attribute, e.g. ``"question_generator"``.
+            config: The graph config, may set ``seed``.
+
+        Returns:
+            The shared generator, or the private one reseeded for this run.
+
+        """
+        seed = (config or {}).get("configurable", {}).get("seed")
+        if seed is None:
+            return getattr(self, name)
+
+        generator = self._seeded_generators.get(name)
+        if generator is None:
+            generator = type(getattr(self, name))(seed=derive_seed(seed, name))
+            self._seeded_generators[name] = generator
+        else:
+            generator.reseed(derive_seed(seed, name))
+        return generator
+
+    def _render_attachments(self, config) -> bool:
+        """Check whether attachments should be rendered to PDF for this run."""
+        return (config or {}).get("configurable", {}).get("render_attachments", True)
+
+    def _compact_prompts(self, config) -> bool:
+        """Check whether prompts show the compacted example templates."""
+        return (config or {}).get("configurable", {}).get("compact_prompts", True)
+
+    def _prompt_templates(self, template, config) -> tuple[str, str | None]:
+        """Get the example HTML to show in a prompt.
+
+        Backends that render the HTML themselves only need the text, so the
+        examples are left out of their prompts.
+        """
+        if not self.get_backend(config).shows_templates:
+            note = "(laid out from a fixed template, write no HTML)"
+            return note, note if template.has_attachment else None
+        return template.prompt_html(self._compact_prompts(config))
+
+    async def _generate_email(
+        self,
+        request: EmailRequest,
+        config,
+        on_attachment: Callable[[str], None] | None = None,
+    ) -> dict:
+        """Generate an email with the configured backend.
+
+        Runs of a pipelined campaign pass ``generation_slots`` in the config,
+        a semaphore held for the generation only, so the next email is
+        generated while this one renders and waits for delivery.
+        """
+        backend = self.get_backend(config)
+        slots = (config or {}).get("configurable", {}).get("generation_slots")
+        telemetry = get_telemetry()
+        async with slots or contextlib.nullcontext():
+            with telemetry.span(
+                "generate_email",
+                email_type=request.email_type,
+                backend=type(backend).__name__,
+            ) as span:
+                prompt_bytes = sum(
+                    len(str(message.content).encode("utf-8"))
+                    for message in request.messages
+                )
+                telemetry.record_size(
+                    span, PROMPT_BYTES, prompt_bytes, email_type=request.email_type
+                )
+                if on_attachment is None:
+                    response = await backend.generate(request)
+                else:
+                    response = await backend.generate_streaming(request, on_attachment)
+        return response.model_dump()
+
+    async def _generate_email_with_pdf(
+        self, request: EmailRequest, config
+    ) -> tuple[dict, bytes | None]:
+        """Generate an email and render its attachment to PDF.
+
+        With ``stream_attachments`` set in the graph config, rendering starts
+        as soon as the backend has the attachment HTML complete, while the
+        rest of the email is still being generated.
+
+        Args:
+            request (EmailRequest): The request, with an attachment template.
+            config: The graph config.
+
+        Returns:
+            tuple[dict, bytes | None]: The email and the PDF, ``None`` when
+            attachments aren't rendered in this run.
+
+        """
+        if not self._render_attachments(config):
+            return await self._generate_email(request, config), None
+        if not (config or {}).get("configurable", {}).get("stream_attachments"):
+            response = await self._generate_email(request, config)
+            return response, await create_pdf(
+                response["attachment_html"], renderer=self.pdf_renderer
+            )
+
+        renders: list[asyncio.Task] = []
+
+        def render(attachment_html: str) -> None:
+            renders.append(
+                asyncio.create_task(
+                    create_pdf(attachment_html, renderer=self.pdf_renderer)
+                )
+            )
+
+        try:
+            response = await self._generate_email(request, config, on_attachment=render)
+        except BaseException:
+            for task in renders:
+                task.cancel()
+            raise
+        if not renders:
+            render(response["attachment_html"])
+        return response, await renders[0]
+
+    @instrumented
     def email_types(self, state: FakeEmailState, config):
         """Get the email types."""
-        types = [
-            "order",
-            "question",
-            "complaint",
-            "declaration",
-            "price_request",
-            "waiting_costs",
-            "update_order",
-            "random",
-        ]
-
-        if "email_type" in state and state["email_type"] in types:
+        if "email_type" in state and state["email_type"] in EMAIL_TYPES:
             return state["email_type"]
 
-        return random.choice(types)
+        return (self._rng(config, "email_type") or random).choice(EMAIL_TYPES)
 
+    @instrumented
     async def generate_declaration(self, state: FakeEmailState, config):
         """Generate a fake customs declaration email."""
-        declaration_generator = DeclarationGenerator()
-        declaration = declaration_generator.generate_declaration().model_dump()
+        declaration = (
+            self._generator("declaration_generator", config)
+            .generate_declaration()
+            .model_dump()
+        )
 
         logger.info(f"Generated customs declaration: {declaration}")
 
-        example_number = random.randint(1, 2)
-
-        # Read example templates
-        email_html = (
-            resources.files("phantommail.examples")
-            .joinpath(f"customs_{example_number}_email.html")
-            .read_text()
-        )
-
-        pdf_html = (
-            resources.files("phantommail.examples")
-            .joinpath(f"customs_{example_number}_pdf.html")
-            .read_text()
-        )
+        # Select an example template from the preloaded registry
+        template = self.templates.choose("customs", rng=self._rng(config, "template"))
+        email_html, pdf_html = self._prompt_templates(template, config)
 
         # Format declaration details for use in prompts
         declaration_details = f"""
@@ -134,31 +370,42 @@ class GraphNodes:
         </attachment_html>
         """
 
-        llm_with_tools = self.llm.with_structured_output(Email)
-
-        response = await llm_with_tools.ainvoke(
-            [
-                HumanMessage(content=prompt),
-            ]
+        response, pdf = await self._generate_email_with_pdf(
+            EmailRequest(
+                email_type="declaration",
+                messages=[HumanMessage(content=prompt)],
+                data=declaration,
+                email_template=template.email_html,
+                attachment_template=template.attachment_html,
+                slot_template=template.slot_html,
+            ),
+            config,
         )
 
-        response = response.model_dump()
-
         # Create PDF attachment
-        pdf = await create_pdf(response["attachment_html"])
+        attachments = []
+        if pdf is not None:
+            attachments = [
+                Attachment(
+                    filename=f"customs_declaration_{declaration['mrn']}.pdf",
+                    content=pdf,
+                )
+            ]
 
         logger.info(f"Response from model: {response}")
 
         return {
-            "attachments": [pdf],
+            "attachments": attachments,
+            "attachment_html": response["attachment_html"],
             "email": response["body_html"],
             "subject": response["subject"],
+            "payload": declaration,
         }
 
+    @instrumented
     async def generate_question(self, state: FakeEmailState, config):
         """Generate a fake question email."""
-        question_generator = TransportQuestionGenerator()
-        question = question_generator.generate_question()
+        question = self._generator("question_generator", config).generate_question()
 
         instruction = SystemMessage(
             content="You are an assistant that generates fake emails. The emails are meant for Vectrix Logistcs NV"
@@ -170,17 +417,23 @@ class GraphNodes:
         """
         )
 
-        messages = [instruction, prompt]
-        llm_with_tools = self.llm.with_structured_output(Email)
-        response = await llm_with_tools.ainvoke(messages)
-        response = response.model_dump()
+        response = await self._generate_email(
+            EmailRequest(
+                email_type="question", messages=[instruction, prompt], data=question
+            ),
+            config,
+        )
 
-        return {"email": response["body_html"], "subject": response["subject"]}
+        return {
+            "email": response["body_html"],
+            "subject": response["subject"],
+            "payload": question,
+        }
 
+    @instrumented
     async def generate_complaint(self, state: FakeEmailState, config):
         """Generate a fake complaint email."""
-        complaint_generator = FakeComplaint()
-        complaint = complaint_generator.generate_complaint()
+        complaint = self._generator("complaint_generator", config).generate_complaint()
 
         instruction = SystemMessage(
             content="You are an assistant that generates fake emails. The emails are meant for Vectrix Logistcs NV"
@@ -191,17 +444,25 @@ class GraphNodes:
         {complaint}
         """
         )
-        messages = [instruction, prompt]
-        llm_with_tools = self.llm.with_structured_output(Email)
-        response = llm_with_tools.invoke(messages)
-        response = response.model_dump()
+        response = await self._generate_email(
+            EmailRequest(
+                email_type="complaint", messages=[instruction, prompt], data=complaint
+            ),
+            config,
+        )
 
-        return {"email": response["body_html"], "subject": response["subject"]}
+        return {
+            "email": response["body_html"],
+            "subject": response["subject"],
+            "payload": complaint,
+        }
 
+    @instrumented
     async def generate_price_request(self, state: FakeEmailState, config):
         """Generate a fake price request email."""
-        price_request_generator = PriceRequestGenerator()
-        price_request = price_request_generator.generate_price_request()
+        price_request = self._generator(
+            "price_request_generator", config
+        ).generate_price_request()
 
         instruction = SystemMessage(
             content="You are an assistant that generates fake price negotiation emails for transport services. The emails are meant for Vectrix Logistics NV"
@@ -224,17 +485,27 @@ class GraphNodes:
         """
         )
 
-        messages = [instruction, prompt]
-        llm_with_tools = self.llm.with_structured_output(Email)
-        response = await llm_with_tools.ainvoke(messages)
-        response = response.model_dump()
+        response = await self._generate_email(
+            EmailRequest(
+                email_type="price_request",
+                messages=[instruction, prompt],
+                data=price_request,
+            ),
+            config,
+        )
 
-        return {"email": response["body_html"], "subject": response["subject"]}
+        return {
+            "email": response["body_html"],
+            "subject": response["subject"],
+            "payload": price_request,
+        }
 
+    @instrumented
     async def generate_waiting_costs(self, state: FakeEmailState, config):
         """Generate a fake waiting costs dispute email."""
-        waiting_costs_generator = WaitingCostsGenerator()
-        waiting_costs_data = waiting_costs_generator.generate_waiting_costs_scenario()
+        waiting_costs_data = self._generator(
+            "waiting_costs_generator", config
+        ).generate_waiting_costs_scenario()
 
         instruction = SystemMessage(
             content="You are an assistant that generates fake dispute emails responding to waiting cost charges from Vectrans logistics company. The emails should professionally dispute the charges while maintaining a business relationship."
@@ -267,17 +538,27 @@ class GraphNodes:
         """
         )
 
-        messages = [instruction, prompt]
-        llm_with_tools = self.llm.with_structured_output(Email)
-        response = await llm_with_tools.ainvoke(messages)
-        response = response.model_dump()
+        response = await self._generate_email(
+            EmailRequest(
+                email_type="waiting_costs",
+                messages=[instruction, prompt],
+                data=waiting_costs_data,
+            ),
+            config,
+        )
 
-        return {"email": response["body_html"], "subject": response["subject"]}
+        return {
+            "email": response["body_html"],
+            "subject": response["subject"],
+            "payload": waiting_costs_data,
+        }
 
+    @instrumented
     async def generate_update_order(self, state: FakeEmailState, config):
         """Generate a fake update order question email."""
-        update_order_generator = UpdateOrderGenerator()
-        update_data = update_order_generator.generate_update_order_question()
+        update_data = self._generator(
+            "update_order_generator", config
+        ).generate_update_order_question()
 
         instruction = SystemMessage(
             content="You are an assistant that generates fake update request emails about existing transport orders. The emails are meant for Vectrans NV"
@@ -303,17 +584,27 @@ class GraphNodes:
         """
         )
 
-        messages = [instruction, prompt]
-        llm_with_tools = self.llm.with_structured_output(Email)
-        response = await llm_with_tools.ainvoke(messages)
-        response = response.model_dump()
+        response = await self._generate_email(
+            EmailRequest(
+                email_type="update_order",
+                messages=[instruction, prompt],
+                data=update_data,
+            ),
+            config,
+        )
 
-        return {"email": response["body_html"], "subject": response["subject"]}
+        return {
+            "email": response["body_html"],
+            "subject": response["subject"],
+            "payload": update_data,
+        }
 
+    @instrumented
     async def generate_random(self, state: FakeEmailState, config):
         """Generate a random promotional email."""
-        promo_generator = RandomPromotionalGenerator()
-        promo_data = promo_generator.generate_promotional_email()
+        promo_data = self._generator(
+            "promo_generator", config
+        ).generate_promotional_email()
 
         instruction = SystemMessage(
             content="You are an assistant that generates fake promotional emails for logistics and transport services. The emails are meant for Vectrans NV to promote their services."
@@ -343,44 +634,38 @@ class GraphNodes:
         """
         )
 
-        messages = [instruction, prompt]
-        llm_with_tools = self.llm.with_structured_output(Email)
-        response = await llm_with_tools.ainvoke(messages)
-        response = response.model_dump()
+        response = await self._generate_email(
+            EmailRequest(
+                email_type="random", messages=[instruction, prompt], data=promo_data
+            ),
+            config,
+        )
 
-        return {"email": response["body_html"], "subject": response["subject"]}
+        return {
+            "email": response["body_html"],
+            "subject": response["subject"],
+            "payload": promo_data,
+        }
 
+    @instrumented
     async def generate_order(self, state: FakeEmailState, config):
         """Generate a fake transport order email."""
-        transport_order_generator = TransportOrderGenerator()
-        transport_order = transport_order_generator.generate().model_dump()
+        transport_order = (
+            self._generator("transport_order_generator", config).generate().model_dump()
+        )
 
         logger.info(f"Generated transport order: {transport_order}")
 
-        # Randomly select an order template (1-6)
-        order_number = random.randint(1, 6)
-        logger.info(f"Selected order template: order_{order_number}")
-
-        # Read HTML templates
-        email_html = (
-            resources.files("phantommail.examples")
-            .joinpath(f"order_{order_number}_email.html")
-            .read_text()
-        )
+        # Select an order template from the preloaded registry
+        template = self.templates.choose("order", rng=self._rng(config, "template"))
+        logger.info(f"Selected order template: {template.name}")
 
-        # Check if PDF template exists for this order
-        if order_number in [1, 6]:  # Order 1 and 6 don't have a PDF template
-            # Order 1 doesn't have a PDF template
-            pdf_html = "no attachment"
-        else:
-            pdf_html = (
-                resources.files("phantommail.examples")
-                .joinpath(f"order_{order_number}_pdf.html")
-                .read_text()
-            )
+        email_html, pdf_html = self._prompt_templates(template, config)
+        pdf_html = pdf_html or "no attachment"
 
-        # Format transport details for use in prompts
-        if order_number != 6:
+        # Format transport details for use in prompts; order_6 is a short
+        # casual request that only needs the client details for its signature
+        if template.name != "order_6":
             transport_details = f"""
             ## Sender details:
             - Company name: {transport_order["client"]["company"]}
@@ -478,31 +763,40 @@ class GraphNodes:
         </attachment_html>
         """
 
-        llm_with_tools = self.llm.with_structured_output(Email)
-
-        response = await llm_with_tools.ainvoke(
-            [
-                HumanMessage(content=prompt),
-            ]
+        request = EmailRequest(
+            email_type="order",
+            messages=[HumanMessage(content=prompt)],
+            data=transport_order,
+            email_template=template.email_html,
+            attachment_template=template.attachment_html,
+            slot_template=template.slot_html,
         )
-
-        response = response.model_dump()
-
-        # Check if we need to create a PDF attachment based on order number
-        if order_number not in [1, 6]:  # Only orders 2-5 have PDF templates
-            pdf = await create_pdf(response["attachment_html"])
-            attachments = [pdf]
+        # Only create a PDF when the template comes with an attachment
+        if template.has_attachment:
+            response, pdf = await self._generate_email_with_pdf(request, config)
         else:
-            attachments = []
+            response, pdf = await self._generate_email(request, config), None
+
+        attachments = []
+        if pdf is not None:
+            attachments = [
+                Attachment(
+                    filename=f"transport_order_{transport_order['loading_date']}.pdf",
+                    content=pdf,
+                )
+            ]
 
         logger.info(f"Response from model: {response}")
 
         return {
             "attachments": attachments,
+            "attachment_html": response["attachment_html"],
             "email": response["body_html"],
             "subject": response["subject"],
+            "payload": transport_order,
         }
 
+    @instrumented
     async def send_email(self, state: FakeEmailState, config):
         """Send an email."""
         email = FullEmail(
@@ -513,6 +807,14 @@ class GraphNodes:
             subject=state["subject"],
         )
 
-        send(email)
+        # Runs may bring their own mailer, e.g. a campaign with its own transport
+        configurable = config["configurable"]
+        run_id = config.get("metadata", {}).get("run_id")
+        if configurable.get("batch_delivery"):
+            queue = configurable.get("delivery_queue") or self.delivery_queue
+            delivery = await queue.submit(email, run_id=run_id)
+        else:
+            mailer = configurable.get("mailer") or self.mailer
+            delivery = await mailer.send(email, run_id=run_id)
 
-        return {"messages": state["messages"]}
+        return {"messages": state["messages"], "delivery": delivery.model_dump()}
@@ -2,6 +2,8 @@ from typing import Annotated, TypedDict
 
 from langgraph.graph.message import add_messages
 
+from phantommail.models.email import Attachment
+
 
 class FakeEmailState(TypedDict):
     """The attributes for passing to LangGraph."""
@@ -10,6 +12,9 @@ class FakeEmailState(TypedDict):
     email_attributes: Annotated[dict, "The attributes of the email"]
     email: Annotated[dict, "The subject and body of the email"]
     messages: Annotated[list, add_messages]
-    attachments: Annotated[list[str], "The attachments of the email"]
+    attachments: Annotated[list[Attachment], "The attachments of the email"]
+    attachment_html: Annotated[str | None, "The HTML the attachment is rendered from"]
     email_type: Annotated[str, "The type of email to generate"]
     subject: Annotated[str, "The subject of the email"]
+    payload: Annotated[dict, "The faker data the email was generated from"]
+    delivery: Annotated[dict, "The result of delivering the email"]
@@ -0,0 +1,142 @@
+import re
+from collections import Counter
+
+_COMMENT_RE = re.compile(r"<!--(?!\[if).*?-->", re.DOTALL)
+_STYLE_BLOCK_RE = re.compile(
+    r"(<style[^>]*>)(.*?)(</style>)", re.DOTALL | re.IGNORECASE
+)
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_CSS_SPACE_RE = re.compile(r"\s*([{}:;,>])\s*")
+_TAG_STYLE_RE = re.compile(
+    r"<([a-zA-Z][\w-]*)(\s[^<>]*?)?\sstyle=\"([^\"]*)\"([^<>]*)>"
+)
+_CLASS_RE = re.compile(r"\sclass=\"([^\"]*)\"")
+_ROW_RE = re.compile(r"<tr\b[^>]*>.*?</tr>", re.DOTALL | re.IGNORECASE)
+_ROW_GAP_RE = re.compile(r"\s*")
+_TEXT_RE = re.compile(r">[^<]*<")
+_BLOCK_TAG = (
+    r"</?(?:html|head|body|style|meta|title|link|div|p|table|thead|tbody|tfoot|"
+    r"tr|td|th|ul|ol|li|h[1-6]|br|hr|header|footer|section|center|blockquote)\b"
+)
+# Whitespace next to block-level tags doesn't render, unlike between inline ones
+_AFTER_BLOCK_RE = re.compile(rf"({_BLOCK_TAG}[^>]*>)\s+", re.IGNORECASE)
+_BEFORE_BLOCK_RE = re.compile(rf"\s+({_BLOCK_TAG})", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+_PRE_RE = re.compile(r"<(pre|textarea)\b", re.IGNORECASE)
+
+
+def _minify_css(css: str) -> str:
+    """Drop comments and insignificant whitespace from a stylesheet."""
+    css = _CSS_COMMENT_RE.sub("", css)
+    css = _CSS_SPACE_RE.sub(r"\1", _SPACE_RE.sub(" ", css))
+    return css.replace(";}", "}").strip()
+
+
+def _minify_declarations(style: str) -> str:
+    """Normalize an inline ``style`` attribute, e.g. ``a: 1; b: 2;`` to ``a:1;b:2``."""
+    return _CSS_SPACE_RE.sub(r"\1", _SPACE_RE.sub(" ", style)).strip().rstrip(";")
+
+
+def _important(style: str) -> str:
+    """Mark every declaration of a style as ``!important``."""
+    return ";".join(
+        declaration if "!important" in declaration else f"{declaration}!important"
+        for declaration in style.split(";")
+        if declaration
+    )
+
+
+def _share_inline_styles(html: str, min_uses: int) -> str:
+    """Minify inline styles, turning those used ``min_uses`` times or more into classes."""
+    uses = Counter(
+        _minify_declarations(m.group(3)) for m in _TAG_STYLE_RE.finditer(html)
+    )
+    shared = {
+        style: f"c{index}"
+        for index, (style, count) in enumerate(uses.most_common())
+        if count >= min_uses and style
+    }
+
+    def replace(match: re.Match) -> str:
+        tag, before, style, after = match.groups()
+        style = _minify_declarations(style)
+        name = shared.get(style)
+        attributes = f"{before or ''}{after}"
+        if name is None:
+            return f'<{tag}{before or ""} style="{style}"{after}>'
+        if _CLASS_RE.search(attributes):
+            attributes = _CLASS_RE.sub(
+                lambda m: f' class="{m.group(1)} {name}"', attributes, count=1
+            )
+        else:
+            attributes = f' class="{name}"{attributes}'
+        return f"<{tag}{attributes}>"
+
+    html = _TAG_STYLE_RE.sub(replace, html)
+    if not shared:
+        return html
+    # Marked important, as inline styles beat any selector
+    rules = "".join(f".{name}{{{_important(style)}}}" for style, name in shared.items())
+    if _STYLE_BLOCK_RE.search(html):
+        return _STYLE_BLOCK_RE.sub(
+            lambda m: f"{m.group(1)}{m.group(2)}{rules}{m.group(3)}", html, count=1
+        )
+    return f"<style>{rules}</style>{html}"
+
+
+def _skeleton(row: str) -> str:
+    """Get the markup of a table row without its text."""
+    return _TEXT_RE.sub("><", _SPACE_RE.sub(" ", row))
+
+
+def _trim_repeated_rows(html: str, max_repeats: int) -> str:
+    """Keep at most ``max_repeats`` consecutive table rows with the same markup."""
+    pieces = []
+    position = 0
+    run_skeleton, run_length = None, 0
+    for match in _ROW_RE.finditer(html):
+        gap = html[position : match.start()]
+        skeleton = _skeleton(match.group(0))
+        contiguous = _ROW_GAP_RE.fullmatch(gap) is not None
+        if contiguous and skeleton == run_skeleton:
+            run_length += 1
+        else:
+            run_skeleton, run_length = skeleton, 1
+        if run_length <= max_repeats:
+            pieces.append(gap)
+            pieces.append(match.group(0))
+        position = match.end()
+    pieces.append(html[position:])
+    return "".join(pieces)
+
+
+def compact_html(html: str, max_repeated_rows: int = 2, min_style_uses: int = 2) -> str:
+    """Shrink an example template for use in a prompt.
+
+    Removes comments, minifies the stylesheets, turns inline styles that are
+    repeated into shared CSS classes, keeps only the first
+    ``max_repeated_rows`` of a run of table rows with identical markup (the
+    model only needs to see the pattern) and collapses whitespace, dropping it
+    next to block-level tags. The result renders the same, apart from the
+    trimmed rows.
+
+    Args:
+        html (str): The template.
+        max_repeated_rows (int): Rows kept of a run of look-alike rows.
+        min_style_uses (int): Uses after which an inline style becomes a class.
+
+    Returns:
+        str: The compacted template.
+
+    """
+    html = _COMMENT_RE.sub("", html)
+    html = _STYLE_BLOCK_RE.sub(
+        lambda m: f"{m.group(1)}{_minify_css(m.group(2))}{m.group(3)}", html
+    )
+    html = _share_inline_styles(html, min_style_uses)
+    html = _trim_repeated_rows(html, max_repeated_rows)
+    if _PRE_RE.search(html):
+        # Whitespace is significant in preformatted text
+        return html.strip()
+    html = _BEFORE_BLOCK_RE.sub(r"\1", _AFTER_BLOCK_RE.sub(r"\1", html))
+    return _SPACE_RE.sub(" ", html).strip()
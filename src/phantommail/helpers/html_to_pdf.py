@@ -1,20 +1,18 @@
-import base64
+import asyncio
 
-from playwright.async_api import async_playwright
+from playwright.async_api import Browser, Page, Playwright, async_playwright
+from playwright.async_api import Error as PlaywrightError
 
+from phantommail.logger import setup_logger
+from phantommail.telemetry import ATTACHMENT_BYTES, get_telemetry
 
-async def create_pdf(html_content: str) -> str:
-    """Convert HTML content to PDF bytes and encode as base64 string using Playwright.
+logger = setup_logger(__name__)
 
-    Args:
-        html_content (str): The HTML content to convert
-
-    Returns:
-        str: Base64 encoded PDF string
 
-    """
+def _wrap_a4(html_content: str) -> str:
+    """Wrap HTML content in a document styled for A4 pages."""
     # Add CSS for A4 page format and table scaling
-    a4_styled_html = f"""
+    return f"""
         <html>
         <head>
             <style>
@@ -51,29 +49,234 @@ async def create_pdf(html_content: str) -> str:
         </html>
     """
 
-    # Use async Playwright API
-    async with async_playwright() as p:
-        # Launch headless Chromium browser
-        browser = await p.chromium.launch(headless=True)
 
+class PdfRenderer:
+    """Render HTML to PDF with a warm, long-lived headless Chromium browser.
+
+    The browser is launched on first use and kept alive between renders. Pages
+    (each in its own browser context) are handed out from a bounded pool, so at
+    most ``pool_size`` renders run concurrently. A crashed or disconnected
+    browser is relaunched transparently, and pages are recycled after
+    ``max_renders_per_page`` renders to keep Chromium's memory in check.
+    """
+
+    def __init__(self, pool_size: int = 4, max_renders_per_page: int = 100):
+        """Initialize the renderer.
+
+        Args:
+            pool_size (int): The maximum number of pages rendering at once.
+            max_renders_per_page (int): Renders after which a page is recycled.
+
+        """
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1.")
+        self.pool_size = pool_size
+        self.max_renders_per_page = max_renders_per_page
+
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock: asyncio.Lock | None = None
+        self._idle: asyncio.Queue | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._generation = 0
+        self._render_counts: dict[Page, int] = {}
+
+    def is_healthy(self) -> bool:
+        """Check whether the browser is running and bound to the current loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        return (
+            self._browser is not None
+            and self._browser.is_connected()
+            and self._loop is loop
+        )
+
+    async def start(self) -> None:
+        """Launch the browser if it is not running (or has crashed)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Playwright objects are bound to the loop that created them, so a
+            # renderer reused from a new event loop starts from scratch.
+            await self._drop_stale_browser()
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._slots = asyncio.Semaphore(self.pool_size)
+            self._reset_pool()
+
+        async with self._lock:
+            if self._browser is not None and self._browser.is_connected():
+                return
+            if self._browser is not None:
+                logger.warning("Chromium browser disconnected, relaunching.")
+            await self._shutdown()
+            self._playwright = await async_playwright().start()
+            try:
+                self._browser = await self._playwright.chromium.launch(headless=True)
+            except BaseException:
+                # Don't leave the driver process behind
+                await self._shutdown()
+                raise
+            self._reset_pool()
+            logger.info("Launched headless Chromium for PDF rendering.")
+
+    async def close(self) -> None:
+        """Close all pages and shut the browser down."""
+        if self._lock is None:
+            return
+        async with self._lock:
+            await self._shutdown()
+            self._reset_pool()
+
+    async def render(self, html_content: str) -> bytes:
+        """Convert HTML content to PDF bytes.
+
+        Args:
+            html_content (str): The HTML content to convert
+
+        Returns:
+            bytes: The rendered PDF document
+
+        """
+        try:
+            return await self._render_once(html_content)
+        except PlaywrightError as e:
+            if self.is_healthy():
+                raise
+            # The browser went away mid-render; relaunch and try once more.
+            logger.warning(f"PDF render failed on a dead browser, retrying: {e}")
+            return await self._render_once(html_content)
+
+    async def _render_once(self, html_content: str) -> bytes:
+        """Render a single document on a pooled page."""
+        if not self.is_healthy():
+            await self.start()
+
+        async with self._slots:
+            generation = self._generation
+            page = await self._acquire_page()
+            healthy = False
+            try:
+                # Set the HTML content
+                await page.set_content(_wrap_a4(html_content))
+
+                # Generate PDF with A4 format and no margins (handled by CSS)
+                pdf_bytes = await page.pdf(
+                    format="A4",
+                    margin={"top": "0", "right": "0", "bottom": "0", "left": "0"},
+                    print_background=True,  # Include CSS backgrounds
+                    scale=1.0,
+                )
+                healthy = True
+                return pdf_bytes
+            finally:
+                await self._release_page(page, generation, healthy)
+
+    async def _acquire_page(self) -> Page:
+        """Take an idle page from the pool, or open a new one."""
+        while not self._idle.empty():
+            page = self._idle.get_nowait()
+            if not page.is_closed():
+                return page
+            self._render_counts.pop(page, None)
+
+        context = await self._browser.new_context()
+        page = await context.new_page()
+        self._render_counts[page] = 0
+        return page
+
+    async def _release_page(self, page: Page, generation: int, healthy: bool) -> None:
+        """Return a page to the pool, or dispose of it if it is worn out."""
+        count = self._render_counts.get(page, 0) + 1
+        self._render_counts[page] = count
+
+        reusable = (
+            healthy
+            and generation == self._generation
+            and not page.is_closed()
+            and count < self.max_renders_per_page
+        )
+        if reusable:
+            self._idle.put_nowait(page)
+            return
+
+        self._render_counts.pop(page, None)
         try:
-            # Create a new page
-            page = await browser.new_page()
-
-            # Set the HTML content
-            await page.set_content(a4_styled_html)
-
-            # Generate PDF with A4 format and no margins (handled by CSS)
-            pdf_bytes = await page.pdf(
-                format="A4",
-                margin={"top": "0", "right": "0", "bottom": "0", "left": "0"},
-                print_background=True,  # Include CSS backgrounds
-                scale=1.0,
+            await page.context.close()
+        except PlaywrightError:
+            pass
+
+    def _reset_pool(self) -> None:
+        """Forget all pooled pages and start a new pool generation.
+
+        The render slots are kept: pages still checked out hold theirs until
+        they are released, so a relaunch can't exceed ``pool_size``.
+        """
+        self._generation += 1
+        self._idle = asyncio.Queue()
+        self._render_counts = {}
+
+    async def _drop_stale_browser(self) -> None:
+        """Shut down a browser launched from a previous event loop.
+
+        Its Playwright objects may only work on that loop, so when stopping
+        them fails the instances are dropped with a warning instead.
+        """
+        if self._browser is None and self._playwright is None:
+            return
+        try:
+            await self._shutdown()
+        except Exception as e:
+            logger.warning(
+                "Could not stop the Chromium browser of a previous event loop, "
+                f"dropping it: {e}"
             )
+            self._playwright = None
+            self._browser = None
+
+    async def _shutdown(self) -> None:
+        """Stop the browser and Playwright driver, ignoring crashed instances."""
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except PlaywrightError:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except PlaywrightError:
+                pass
+            self._playwright = None
 
-            # Encode PDF bytes to base64
-            return base64.b64encode(pdf_bytes).decode("utf-8")
 
-        finally:
-            # Ensure browser is closed
-            await browser.close()
+_renderer: PdfRenderer | None = None
+
+
+def get_renderer() -> PdfRenderer:
+    """Get the process-wide PDF renderer."""
+    global _renderer
+    if _renderer is None:
+        _renderer = PdfRenderer()
+    return _renderer
+
+
+async def create_pdf(html_content: str, renderer: PdfRenderer | None = None) -> bytes:
+    """Convert HTML content to PDF bytes using Playwright.
+
+    Args:
+        html_content (str): The HTML content to convert
+        renderer (PdfRenderer | None): The renderer to use, defaults to the shared one
+
+    Returns:
+        bytes: The PDF document
+
+    """
+    renderer = renderer or get_renderer()
+    telemetry = get_telemetry()
+    with telemetry.span("create_pdf", warm=renderer.is_healthy()) as span:
+        pdf = await renderer.render(html_content)
+        telemetry.record_size(span, ATTACHMENT_BYTES, len(pdf))
+    return pdf
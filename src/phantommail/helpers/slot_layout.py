@@ -0,0 +1,80 @@
+import html
+import re
+from string import Template
+from typing import List, Mapping
+
+_STYLE_RE = re.compile(r"<style[^>]*>.*?</style>", re.DOTALL | re.IGNORECASE)
+_WRAPPER_RE = re.compile(r"^\s*(<div[^>]*>)", re.IGNORECASE)
+_DEFAULT_WRAPPER = (
+    '<div style="font-family: Arial, sans-serif; font-size: 14px; '
+    'line-height: 1.6; color: #333;">'
+)
+
+# The body of a layout derived from an example email
+SLOT_BODY = "$greeting\n$paragraphs\n$references\n$closing"
+
+
+def text_to_html(text: str) -> str:
+    """Turn plain text into HTML paragraphs, keeping line breaks."""
+    paragraphs = [p.strip() for p in text.strip().split("\n\n") if p.strip()]
+    return "\n".join(
+        f"<p>{'<br>'.join(html.escape(line) for line in p.splitlines())}</p>"
+        for p in paragraphs
+    )
+
+
+def style_block(template: str | None) -> str:
+    """Get the ``<style>`` block of a template, or an empty string."""
+    style = _STYLE_RE.search(template or "")
+    return style.group(0) if style else ""
+
+
+def wrap_like(template: str | None, body: str) -> str:
+    """Style a body like an example template.
+
+    The body gets the ``<style>`` block of the template or, for templates
+    styled inline, its outer ``<div>``.
+    """
+    style = style_block(template)
+    if style:
+        return f"{style}\n<div>\n{body}\n</div>"
+    wrapper = _WRAPPER_RE.search(template or "")
+    return f"{wrapper.group(1) if wrapper else _DEFAULT_WRAPPER}\n{body}\n</div>"
+
+
+def slot_layout(email_html: str | None) -> str:
+    """Derive the slot layout of an example email.
+
+    Args:
+        email_html (str | None): The example email, the default styling is
+            used without one.
+
+    Returns:
+        str: The styling of the example around the ``SLOT_BODY`` slots.
+
+    """
+    # A literal "$" in the styling must not be taken for a slot
+    return wrap_like((email_html or "").replace("$", "$$"), SLOT_BODY)
+
+
+def layout_slots(layout: str) -> List[str]:
+    """Get the names of the slots a layout declares, in order."""
+    return Template(layout).get_identifiers()
+
+
+def render_slots(layout: str, fragments: Mapping[str, str]) -> str:
+    """Fill the slots of a layout with HTML fragments.
+
+    Args:
+        layout (str): HTML with ``$name`` (or ``${name}``) slots, ``$$`` for a
+            literal dollar sign.
+        fragments (Mapping[str, str]): The HTML per slot, missing slots are
+            left empty.
+
+    Returns:
+        str: The rendered HTML.
+
+    """
+    return Template(layout).substitute(
+        {name: fragments.get(name, "") for name in layout_slots(layout)}
+    )
@@ -0,0 +1,46 @@
+"""The mix of email types a campaign or export generates."""
+
+import argparse
+import random
+from typing import Dict, List
+
+from phantommail.graphs.nodes import EMAIL_TYPES
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse a mix such as ``order=3,question=1`` into weights."""
+    mix = {}
+    for part in value.split(","):
+        email_type, _, weight = part.partition("=")
+        try:
+            mix[email_type.strip()] = float(weight) if weight else 1.0
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Invalid weight in mix: {part!r}")
+    return mix
+
+
+def plan_email_types(
+    count: int, mix: Dict[str, float] | None = None, rng: random.Random | None = None
+) -> List[str]:
+    """Draw the email type for every run of a campaign.
+
+    Args:
+        count (int): The number of emails to generate.
+        mix (dict[str, float] | None): Relative weight per email type. Types
+            left out are never generated; ``None`` means a uniform mix.
+        rng (random.Random | None): The random generator to draw from.
+
+    Returns:
+        list[str]: One email type per run.
+
+    """
+    mix = mix or {email_type: 1.0 for email_type in EMAIL_TYPES}
+    unknown = set(mix) - set(EMAIL_TYPES)
+    if unknown:
+        raise ValueError(
+            f"Unknown email types {sorted(unknown)}, choose from {EMAIL_TYPES}."
+        )
+    if not any(weight > 0 for weight in mix.values()):
+        raise ValueError("The email type mix needs at least one positive weight.")
+
+    return (rng or random).choices(list(mix), weights=list(mix.values()), k=count)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Literal
 
 from pydantic import BaseModel, Field
 
@@ -14,6 +14,49 @@ class Email(BaseModel):
     )
 
 
+class StreamedEmail(BaseModel):
+    """An email with the attachment first, so it is complete before the body."""
+
+    attachment_html: str | None = Field(
+        None,
+        description="Optional HTML content for email attachments, do not include if no data is provided",
+    )
+    subject: str = Field(..., description="The subject line of the email")
+    body_html: str = Field(..., description="The HTML content of the email body")
+
+
+class SlotReference(BaseModel):
+    """A labelled reference, e.g. an order number, listed in the email."""
+
+    label: str = Field(..., description="The label, e.g. 'Order number'")
+    value: str = Field(..., description="The reference itself")
+
+
+class EmailSlots(BaseModel):
+    """The text of an email, to be rendered into the slots of a template."""
+
+    subject: str = Field(..., description="The subject line of the email")
+    greeting: str = Field("", description="The opening line, e.g. 'Dear team,'")
+    paragraphs: List[str] = Field(
+        default_factory=list, description="The paragraphs of the body, plain text"
+    )
+    references: List[SlotReference] = Field(
+        default_factory=list,
+        description="Order, booking or declaration references to list",
+    )
+    closing: str = Field(
+        "", description="The sign-off and signature, lines separated by newlines"
+    )
+
+
+class Attachment(BaseModel):
+    """A file attached to an email, kept as raw bytes until it is sent."""
+
+    filename: str = Field(..., description="The file name shown to the recipient")
+    content: bytes = Field(..., description="The raw file content")
+    content_type: str = Field("application/pdf", description="The MIME type")
+
+
 class FullEmail(Email):
     """A full email."""
 
@@ -25,6 +68,18 @@ class FullEmail(Email):
     bcc: List[str] | None = Field(
         None, description="List of BCC (blind carbon copy) recipient email addresses"
     )
-    attachments: List[str] | None = Field(
-        None, description="List of file paths or names for email attachments"
+    attachments: List[Attachment] | None = Field(
+        None, description="List of files attached to the email"
     )
+
+
+class DeliveryResult(BaseModel):
+    """The outcome of delivering an email."""
+
+    status: Literal["sent", "failed"] = Field(..., description="The delivery status")
+    to: List[str] = Field(default_factory=list, description="The recipients")
+    subject: str | None = Field(None, description="The subject of the email")
+    message_id: str | None = Field(None, description="The provider's message id")
+    attempts: int = Field(1, description="The number of send attempts made")
+    error: str | None = Field(None, description="The last error, if delivery failed")
+    run_id: str | None = Field(None, description="The graph run the email came from")
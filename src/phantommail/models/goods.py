@@ -1,5 +1,7 @@
 import random
+from typing import List
 
+import numpy as np
 from pydantic import BaseModel
 
 goods_list = [
@@ -133,13 +135,55 @@ class Goods(BaseModel):
     description: str
 
     @classmethod
-    def random(cls) -> "Goods":
-        """Generate a random good with reasonable default values."""
-        name = random.choice(goods_list)
+    def random(cls, rng: random.Random | None = None) -> "Goods":
+        """Generate a random good with reasonable default values.
+
+        Args:
+            rng (random.Random | None): The random generator to draw from,
+                defaults to the global one.
+
+        """
+        rng = rng or random
+        name = rng.choice(goods_list)
         return cls(
             name=name,
-            quantity=random.randint(1, 100),
-            weight=random.randint(350, 1000),
-            volume=random.randint(10, 1000),
+            quantity=rng.randint(1, 100),
+            weight=rng.randint(350, 1000),
+            volume=rng.randint(10, 1000),
             description=f"A shipment of {name.lower()}",
         )
+
+    @classmethod
+    def random_many(
+        cls, n: int, rng: np.random.Generator, validate: bool = True
+    ) -> List["Goods"]:
+        """Generate ``n`` random goods, drawing all numbers in one go.
+
+        Args:
+            n (int): The number of goods.
+            rng (np.random.Generator): The NumPy generator to draw from.
+            validate (bool): Validate the goods, or build unvalidated
+                ``GoodsRecord`` instances (the drawn values are well-typed).
+
+        """
+        names = rng.integers(0, len(goods_list), n).tolist()
+        quantities = rng.integers(1, 101, n).tolist()
+        weights = rng.integers(350, 1001, n).astype(float).tolist()
+        volumes = rng.integers(10, 1001, n).astype(float).tolist()
+        if validate:
+            make = cls
+        else:
+            # Imported here, the records module builds on this one
+            from phantommail.models.records import GoodsRecord as make
+        return [
+            make(
+                name=goods_list[name],
+                quantity=quantity,
+                weight=weight,
+                volume=volume,
+                description=f"A shipment of {goods_list[name].lower()}",
+            )
+            for name, quantity, weight, volume in zip(
+                names, quantities, weights, volumes
+            )
+        ]
@@ -0,0 +1,89 @@
+"""Lightweight, unvalidated stand-ins for the faker models.
+
+Bulk generation produces millions of trusted records that are usually
+serialized right away. Building them as pydantic models pays for validation
+(and ``model_construct`` is slower still), so bulk paths can build these
+slotted dataclasses instead. Each record type mirrors the fields of its
+model, dumps to the same dict with ``model_dump()`` and converts to the
+validated model on demand with ``to_model()``.
+"""
+
+import dataclasses
+from typing import Any, Dict
+
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+from phantommail.models.customs_document import (
+    CustomsDeclaration,
+    ItemDetail,
+    Party,
+    TaxLine,
+    TransportInfo,
+)
+from phantommail.models.goods import Goods
+from phantommail.models.transport import Address, Client, TransportOrder
+
+
+def _dump(value: Any) -> Any:
+    """Dump a field value, recursing into records and lists."""
+    if isinstance(value, list):
+        return [_dump(item) for item in value]
+    dump = getattr(value, "model_dump", None)
+    return dump() if dump is not None else value
+
+
+def _model_dump(self) -> Dict[str, Any]:
+    """Dump the record to a dict, like ``BaseModel.model_dump``."""
+    return {name: _dump(getattr(self, name)) for name in self.__slots__}
+
+
+def _to_model(self) -> BaseModel:
+    """Convert the record to its validated pydantic model."""
+    return self.model.model_validate(self.model_dump())
+
+
+_record_types: Dict[type[BaseModel], type] = {}
+
+
+def record_type(model: type[BaseModel]) -> type:
+    """Get the slotted dataclass that mirrors a pydantic model."""
+    if model in _record_types:
+        return _record_types[model]
+
+    fields = []
+    for name, info in model.model_fields.items():
+        if info.default_factory is not None:
+            default = dataclasses.field(default_factory=info.default_factory)
+        elif info.default is not PydanticUndefined:
+            default = dataclasses.field(default=info.default)
+        else:
+            default = dataclasses.field()
+        fields.append((name, info.annotation, default))
+
+    record = dataclasses.make_dataclass(
+        f"{model.__name__}Record",
+        fields,
+        namespace={
+            "model": model,
+            "model_dump": _model_dump,
+            "to_model": _to_model,
+        },
+        slots=True,
+        kw_only=True,
+        module=__name__,
+    )
+    _record_types[model] = record
+    return record
+
+
+# Created up front so records can be pickled between processes
+GoodsRecord = record_type(Goods)
+ClientRecord = record_type(Client)
+AddressRecord = record_type(Address)
+TransportOrderRecord = record_type(TransportOrder)
+PartyRecord = record_type(Party)
+TransportInfoRecord = record_type(TransportInfo)
+ItemDetailRecord = record_type(ItemDetail)
+TaxLineRecord = record_type(TaxLine)
+CustomsDeclarationRecord = record_type(CustomsDeclaration)
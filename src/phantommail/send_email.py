@@ -1,50 +1,398 @@
-"""Email sending functionality using the Resend API."""
+"""Email delivery with limits, retries and batching over pluggable transports."""
 
-import base64
-import os
-
-import resend
+import asyncio
+import random
+from typing import Any, Callable, List, Tuple
 
 from phantommail.logger import setup_logger
-from phantommail.models.email import FullEmail
+from phantommail.models.email import DeliveryResult, FullEmail
+from phantommail.telemetry import get_telemetry
+from phantommail.transports import PartialBatchError, Transport, transport_from_env
 
 logger = setup_logger(__name__)
 
 
-def send(email: FullEmail) -> str:
+class DeliveryError(Exception):
+    """Raised when a provider call keeps failing."""
+
+    def __init__(self, message: str, attempts: int):
+        """Initialize the error with the number of attempts made."""
+        super().__init__(message)
+        self.attempts = attempts
+
+
+class DeliveryTimeout(DeliveryError):
+    """Raised when a send attempt timed out and may or may not have gone out.
+
+    The worker thread can't be stopped, so the call may still complete;
+    timed out sends are never retried, as that could deliver them twice.
+    """
+
+
+def _describe(error: BaseException) -> str:
+    """Get an error message, falling back to the error type for empty ones."""
+    return str(error) or type(error).__name__
+
+
+def send(email: FullEmail, transport: Transport | None = None) -> DeliveryResult:
     """Send an email to the recipient with the given subject and body.
 
     Args:
-        subject (str): The subject of the email.
-        body (str): The body of the email.
-        recipient_email (str): The email address of the recipient.
+        email (FullEmail): The email to send.
+        transport (Transport | None): Delivers the email, defaults to the one
+            configured with ``PHANTOMMAIL_TRANSPORT`` (Resend).
 
     Returns:
-        str: A message indicating that the email was sent successfully.
+        DeliveryResult: Whether the email was sent, and the provider's message id.
 
     """
     logger.info(f"Sending email to {email.to} with subject: {email.subject}")
-    resend.api_key = os.environ["RESEND_API_KEY"]
-    params: resend.Emails.SendParams = {
-        "from": email.sender,
-        "to": email.to,
-        "subject": email.subject,
-        "html": email.body_html,
-        "cc": email.cc,
-        "bcc": email.bcc,
-    }
-    if len(email.attachments) > 0:
-        params["attachments"] = [
-            {
-                "content": list(base64.b64decode(attachment.encode("utf-8"))),
-                "filename": f"attachment_{i}.pdf",
-            }
-            for i, attachment in enumerate(email.attachments)
-        ]
+    transport = transport or transport_from_env()
     try:
-        email = resend.Emails.send(params)
+        with get_telemetry().span("send", attachments=len(email.attachments or [])):
+            message_id = transport.send(email)
         logger.info("Email sent successfully! ")
-        return "Email sent successfully!"
+        return DeliveryResult(
+            status="sent", to=email.to, subject=email.subject, message_id=message_id
+        )
     except Exception as e:
-        logger.error(f"Error sending email: {e}")
-        return f"Error sending email: {e}"
+        logger.error(f"Error sending email: {_describe(e)}")
+        return DeliveryResult(
+            status="failed", to=email.to, subject=email.subject, error=_describe(e)
+        )
+
+
+class Mailer:
+    """Deliver emails from async code without blocking the event loop.
+
+    The blocking transport call runs in a worker thread, at most
+    ``concurrency`` at a time. Each attempt is awaited for at most ``timeout``
+    seconds; a thread can't be interrupted, so a timed out call keeps its
+    slot until it returns and is reported as failed without a retry (it may
+    still deliver). Errors the transport considers transient (rate limits,
+    server errors, dropped connections) are retried with exponential backoff
+    and jitter, honouring the provider's ``Retry-After`` header when present.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 8,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        transport: Transport | None = None,
+    ):
+        """Initialize the mailer.
+
+        Args:
+            concurrency (int): The maximum number of deliveries in flight.
+            timeout (float): Seconds to wait for a single send attempt.
+            max_retries (int): Retries after the first failed attempt.
+            backoff (float): The base delay in seconds between retries.
+            transport (Transport | None): Delivers the emails, defaults to the
+                one configured with ``PHANTOMMAIL_TRANSPORT`` (Resend).
+
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._transport = transport
+        self._slots: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def transport(self) -> Transport:
+        """Get the transport, creating the configured one on first use."""
+        if self._transport is None:
+            self._transport = transport_from_env()
+        return self._transport
+
+    @transport.setter
+    def transport(self, transport: Transport) -> None:
+        """Replace the transport."""
+        self._transport = transport
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        """Get the concurrency limiter for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._slots
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        """Get the delay before the next attempt."""
+        headers = getattr(error, "headers", None) or {}
+        retry_after = headers.get("retry-after") or headers.get("Retry-After")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.backoff * 2 ** (attempt - 1) * (1 + random.random())
+
+    async def call(self, func: Callable[[Any], Any], params: Any) -> Tuple[Any, int]:
+        """Run a blocking transport call with the mailer's limits and retries.
+
+        Args:
+            func (Callable): The blocking transport method, e.g. ``transport.send``.
+            params (Any): The parameters to pass to it.
+
+        Returns:
+            tuple: The provider response and the number of attempts made.
+
+        Raises:
+            DeliveryError: When the call keeps failing or fails permanently.
+
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = await self._attempt(func, params)
+                return response, attempt
+            except DeliveryTimeout as e:
+                e.attempts = attempt
+                raise
+            except Exception as e:
+                if attempt > self.max_retries or not self.transport.is_retryable(e):
+                    raise DeliveryError(_describe(e), attempts=attempt) from e
+                delay = self._retry_delay(attempt, e)
+                logger.warning(
+                    f"Send attempt {attempt} failed ({_describe(e)}), retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
+    async def _attempt(self, func: Callable[[Any], Any], params: Any) -> Any:
+        """Run one transport call in a worker thread, holding a slot until it returns."""
+        slots = self._get_slots()
+        await slots.acquire()
+        try:
+            call = asyncio.ensure_future(asyncio.to_thread(func, params))
+        except BaseException:
+            slots.release()
+            raise
+
+        def finished(call: asyncio.Future) -> None:
+            slots.release()
+            if not call.cancelled():
+                # Retrieve the error of a call nobody waits for anymore
+                call.exception()
+
+        call.add_done_callback(finished)
+        try:
+            return await asyncio.wait_for(asyncio.shield(call), timeout=self.timeout)
+        except TimeoutError as e:
+            if call.done():
+                # The transport's own timeout, not ours
+                raise
+            raise DeliveryTimeout(
+                f"Timed out after {self.timeout}s, the delivery may still go out",
+                attempts=1,
+            ) from e
+
+    async def send(self, email: FullEmail, run_id: str | None = None) -> DeliveryResult:
+        """Send an email, retrying transient failures.
+
+        Args:
+            email (FullEmail): The email to send.
+            run_id (str | None): The graph run the email belongs to.
+
+        Returns:
+            DeliveryResult: The outcome of the last attempt.
+
+        """
+        logger.info(f"Sending email to {email.to} with subject: {email.subject}")
+        try:
+            with get_telemetry().span(
+                "send",
+                transport=type(self.transport).__name__,
+                attachments=len(email.attachments or []),
+            ) as span:
+                message_id, attempts = await self.call(self.transport.send, email)
+                span.set_attribute("attempts", attempts)
+        except DeliveryError as e:
+            logger.error(f"Error sending email after {e.attempts} attempts: {e}")
+            return DeliveryResult(
+                status="failed",
+                to=email.to,
+                subject=email.subject,
+                attempts=e.attempts,
+                error=_describe(e),
+                run_id=run_id,
+            )
+        logger.info("Email sent successfully! ")
+        return DeliveryResult(
+            status="sent",
+            to=email.to,
+            subject=email.subject,
+            message_id=message_id,
+            attempts=attempts,
+            run_id=run_id,
+        )
+
+    def close(self) -> None:
+        """Close the transport's connections."""
+        if self._transport is not None:
+            self._transport.close()
+
+
+class DeliveryQueue:
+    """Collect emails and deliver them in batches (e.g. Resend's batch endpoint).
+
+    Emails are flushed when ``batch_size`` emails are waiting or when the
+    oldest one has waited ``flush_interval`` seconds, whichever comes first.
+    Emails with attachments are sent on their own right away if the
+    transport's batches don't accept attachments. Every ``submit`` call
+    resolves to the result of its own email; if the transport rejects a
+    whole batch, its emails are retried one by one so a single bad message
+    cannot fail the others, and emails a failed batch already delivered are
+    not sent again.
+    """
+
+    # Resend accepts at most 100 emails per batch request
+    MAX_BATCH_SIZE = 100
+
+    def __init__(
+        self,
+        mailer: Mailer | None = None,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+    ):
+        """Initialize the delivery queue.
+
+        Args:
+            mailer (Mailer | None): Sends the batches with limits and retries.
+            batch_size (int): Flush once this many emails are waiting.
+            flush_interval (float): Flush after this many seconds at the latest.
+
+        """
+        if not 1 <= batch_size <= self.MAX_BATCH_SIZE:
+            raise ValueError(f"batch_size must be between 1 and {self.MAX_BATCH_SIZE}.")
+        self.mailer = mailer or Mailer()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: List[Tuple[FullEmail, str | None, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(
+        self, email: FullEmail, run_id: str | None = None
+    ) -> DeliveryResult:
+        """Queue an email and wait for its delivery result.
+
+        Args:
+            email (FullEmail): The email to send.
+            run_id (str | None): The graph run the email belongs to.
+
+        Returns:
+            DeliveryResult: The outcome for this email.
+
+        """
+        if email.attachments and not self.mailer.transport.batch_attachments:
+            return await self.mailer.send(email, run_id=run_id)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((email, run_id, future))
+
+        if len(self._pending) >= self.batch_size:
+            self._schedule_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.flush_interval, self._schedule_flush)
+
+        return await future
+
+    async def flush(self) -> None:
+        """Send all waiting emails now and wait for in-flight batches."""
+        self._schedule_flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+
+    def _schedule_flush(self) -> None:
+        """Hand the waiting emails to a background batch send."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._send_batch_safely(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send_batch(
+        self, batch: List[Tuple[FullEmail, str | None, asyncio.Future]]
+    ) -> None:
+        """Send one batch and resolve the futures of its emails."""
+        logger.info(f"Sending a batch of {len(batch)} emails")
+        transport = self.mailer.transport
+        message_ids: List[str] = []
+        attempts = 1
+        try:
+            with get_telemetry().span(
+                "send_batch", transport=type(transport).__name__, size=len(batch)
+            ):
+                message_ids, attempts = await self.mailer.call(
+                    transport.send_batch, [email for email, _, _ in batch]
+                )
+        except DeliveryTimeout as e:
+            # Some or all of the batch may have gone out, resending risks duplicates
+            logger.error(f"Batch send of {len(batch)} emails timed out: {e}")
+            for email, run_id, future in batch:
+                if not future.done():
+                    future.set_result(
+                        DeliveryResult(
+                            status="failed",
+                            to=email.to,
+                            subject=email.subject,
+                            attempts=e.attempts,
+                            error=str(e),
+                            run_id=run_id,
+                        )
+                    )
+            return
+        except Exception as e:
+            if isinstance(e.__cause__, PartialBatchError):
+                message_ids = e.__cause__.message_ids
+            logger.warning(
+                f"Batch send failed ({_describe(e)}), sending the emails one by one"
+            )
+
+        results = [
+            DeliveryResult(
+                status="sent",
+                to=email.to,
+                subject=email.subject,
+                message_id=message_id,
+                attempts=attempts,
+                run_id=run_id,
+            )
+            for (email, run_id, _), message_id in zip(batch, message_ids)
+        ]
+        results += await asyncio.gather(
+            *(
+                self.mailer.send(email, run_id=run_id)
+                for email, run_id, _ in batch[len(message_ids) :]
+            )
+        )
+
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _send_batch_safely(
+        self, batch: List[Tuple[FullEmail, str | None, asyncio.Future]]
+    ) -> None:
+        """Send a batch, making sure no submitter is left waiting on an error."""
+        try:
+            await self._send_batch(batch)
+        except BaseException as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
@@ -0,0 +1,367 @@
+"""Latency, token and size instrumentation for the email pipeline.
+
+Every instrumented step (graph nodes, LLM calls, PDF rendering, delivery)
+runs inside ``Telemetry.span``, which records its wall time in Prometheus
+style metrics and hands a span to the configured exporter. Metrics are kept
+in memory and rendered with ``Metrics.render()``; spans go nowhere by
+default, to an ``InMemorySpanExporter`` in tests, or to OpenTelemetry with
+``OpenTelemetrySpanExporter`` when ``opentelemetry-api`` is installed.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from phantommail.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Histogram buckets for durations in seconds and sizes in bytes
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+BYTES_BUCKETS = tuple(2**power for power in range(10, 25, 2))
+
+OPERATION_SECONDS = "phantommail_operation_seconds"
+OPERATION_ERRORS = "phantommail_operation_errors_total"
+LLM_TOKENS = "phantommail_llm_tokens_total"
+PROMPT_BYTES = "phantommail_prompt_bytes"
+ATTACHMENT_BYTES = "phantommail_attachment_bytes"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    """Turn labels into a hashable, ordered key."""
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: Dict[str, str] | None = None) -> str:
+    """Format labels in the Prometheus text format."""
+    pairs = list(key) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+@dataclass
+class _Histogram:
+    """The buckets, count and sum of one histogram series."""
+
+    buckets: Tuple[float, ...]
+    counts: List[int] = field(default_factory=list)
+    count: int = 0
+    total: float = 0.0
+
+    def __post_init__(self):
+        """Start with empty buckets."""
+        self.counts = [0] * len(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Add an observation."""
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.count += 1
+        self.total += value
+
+
+class Metrics:
+    """In-memory Prometheus-style counters, gauges and histograms."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        """Increase a counter."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        """Set a gauge, e.g. the number of connections in use."""
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        buckets: Tuple[float, ...] = SECONDS_BUCKETS,
+        **labels,
+    ) -> None:
+        """Add an observation to a histogram."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(buckets)
+            histogram.observe(value)
+
+    def counter(self, name: str, **labels) -> float:
+        """Get the value of a counter."""
+        return self._counters.get(name, {}).get(_label_key(labels), 0.0)
+
+    def gauge(self, name: str, **labels) -> float:
+        """Get the value of a gauge."""
+        return self._gauges.get(name, {}).get(_label_key(labels), 0.0)
+
+    def histogram(self, name: str, **labels) -> Dict[str, float]:
+        """Get the count and sum of a histogram."""
+        histogram = self._histograms.get(name, {}).get(_label_key(labels))
+        if histogram is None:
+            return {"count": 0, "sum": 0.0}
+        return {"count": histogram.count, "sum": histogram.total}
+
+    def reset(self) -> None:
+        """Drop all recorded values."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for name, series in sorted(self._gauges.items()):
+                lines.append(f"# TYPE {name} gauge")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        labels = _format_labels(key, {"le": f"{bound:g}"})
+                        lines.append(f"{name}_bucket{labels} {cumulative}")
+                    labels = _format_labels(key, {"le": "+Inf"})
+                    lines.append(f"{name}_bucket{labels} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.total:g}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+@dataclass
+class SpanRecord:
+    """A finished span."""
+
+    name: str
+    attributes: Dict[str, Any]
+    start: float
+    end: float
+    error: str | None = None
+
+    @property
+    def duration(self) -> float:
+        """Get the duration of the span in seconds."""
+        return self.end - self.start
+
+
+class SpanExporter:
+    """Receives the spans of instrumented steps; the default drops them."""
+
+    def start(self, name: str, attributes: Dict[str, Any]) -> Any:
+        """Start a span and return a handle that is passed to ``end``."""
+        return None
+
+    def end(self, handle: Any, record: SpanRecord) -> None:
+        """Finish a span."""
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keep finished spans in a list, for tests and local inspection."""
+
+    def __init__(self):
+        """Initialize an empty exporter."""
+        self.spans: List[SpanRecord] = []
+        self._lock = threading.Lock()
+
+    def end(self, handle: Any, record: SpanRecord) -> None:
+        """Store a finished span."""
+        with self._lock:
+            self.spans.append(record)
+
+    def names(self) -> List[str]:
+        """Get the names of the finished spans, in order."""
+        return [span.name for span in self.spans]
+
+    def clear(self) -> None:
+        """Drop all stored spans."""
+        with self._lock:
+            self.spans.clear()
+
+
+class OpenTelemetrySpanExporter(SpanExporter):
+    """Create OpenTelemetry spans, nested under the current span."""
+
+    def __init__(self, tracer=None):
+        """Initialize the exporter.
+
+        Args:
+            tracer: An OpenTelemetry tracer, defaults to the global provider's.
+
+        """
+        try:
+            from opentelemetry import context, trace
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetry export needs opentelemetry-api, install it with "
+                "`pip install opentelemetry-api`."
+            ) from e
+        self._context = context
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer("phantommail")
+
+    def start(self, name: str, attributes: Dict[str, Any]) -> Any:
+        """Start a span and make it the current one."""
+        span = self.tracer.start_span(name, attributes=attributes)
+        token = self._context.attach(self._trace.set_span_in_context(span))
+        return span, token
+
+    def end(self, handle: Any, record: SpanRecord) -> None:
+        """Set the final attributes and status, and end the span."""
+        span, token = handle
+        self._context.detach(token)
+        span.set_attributes(record.attributes)
+        if record.error is not None:
+            span.set_status(
+                self._trace.Status(self._trace.StatusCode.ERROR, record.error)
+            )
+        span.end()
+
+
+class Span:
+    """An open span, to which a step can add attributes as it learns them."""
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        """Initialize the span."""
+        self.name = name
+        self.attributes = attributes
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute, e.g. a token count."""
+        self.attributes[key] = value
+
+
+class Telemetry:
+    """Record timings and sizes of the pipeline steps."""
+
+    def __init__(
+        self, metrics: Metrics | None = None, exporter: SpanExporter | None = None
+    ):
+        """Initialize the telemetry.
+
+        Args:
+            metrics (Metrics | None): The metrics registry, a new one by default.
+            exporter (SpanExporter | None): Where spans go, dropped by default.
+
+        """
+        self.metrics = metrics or Metrics()
+        self.exporter = exporter or SpanExporter()
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        """Time a step and export it as a span.
+
+        Args:
+            name (str): The operation, e.g. ``"generate_order"``.
+            **attributes: Span attributes known up front.
+
+        Yields:
+            Span: The open span, to add attributes to.
+
+        """
+        span = Span(name, dict(attributes))
+        started = time.time()
+        clock = time.perf_counter()
+        handle = self.exporter.start(name, span.attributes)
+        error = None
+        try:
+            yield span
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            self.metrics.inc(OPERATION_ERRORS, operation=name)
+            raise
+        finally:
+            duration = time.perf_counter() - clock
+            self.metrics.observe(OPERATION_SECONDS, duration, operation=name)
+            record = SpanRecord(
+                name=name,
+                attributes=span.attributes,
+                start=started,
+                end=started + duration,
+                error=error,
+            )
+            try:
+                self.exporter.end(handle, record)
+            except Exception as e:
+                logger.warning(f"Could not export span {name}: {e}")
+
+    def record_tokens(
+        self, span: Span, input_tokens: int, output_tokens: int, **labels
+    ) -> None:
+        """Record the token usage of an LLM call."""
+        span.set_attribute("llm.input_tokens", input_tokens)
+        span.set_attribute("llm.output_tokens", output_tokens)
+        self.metrics.inc(LLM_TOKENS, input_tokens, direction="input", **labels)
+        self.metrics.inc(LLM_TOKENS, output_tokens, direction="output", **labels)
+
+    def record_size(self, span: Span, metric: str, size: int, **labels) -> None:
+        """Record a size in bytes, e.g. of a prompt or an attachment."""
+        span.set_attribute(metric, size)
+        self.metrics.observe(metric, size, buckets=BYTES_BUCKETS, **labels)
+
+
+_telemetry = Telemetry()
+
+
+def get_telemetry() -> Telemetry:
+    """Get the process-wide telemetry."""
+    return _telemetry
+
+
+def set_telemetry(telemetry: Telemetry) -> Telemetry:
+    """Replace the process-wide telemetry, returning the previous one."""
+    global _telemetry
+    previous, _telemetry = _telemetry, telemetry
+    return previous
+
+
+def instrumented(func: Callable) -> Callable:
+    """Run a (sync or async) graph node inside a span named after it."""
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with get_telemetry().span(func.__name__):
+                return await func(*args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with get_telemetry().span(func.__name__):
+            return func(*args, **kwargs)
+
+    return wrapper
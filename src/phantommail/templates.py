@@ -0,0 +1,203 @@
+"""Registry of the example HTML templates the emails are modelled on."""
+
+import os
+import random
+import re
+import threading
+from importlib import resources
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from pydantic import BaseModel, Field
+
+from phantommail.helpers.compact_html import compact_html
+from phantommail.helpers.slot_layout import layout_slots, slot_layout
+from phantommail.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+TEMPLATE_DIRS_ENV = "PHANTOMMAIL_TEMPLATE_DIRS"
+
+# The kind may contain underscores, e.g. price_request_1_email.html
+_EMAIL_FILE_RE = re.compile(r"^(?P<kind>[a-z][a-z_]*?)_(?P<number>\d+)_email\.html$")
+_COMPANION_FILE_RE = re.compile(r"^[a-z][a-z_]*?_\d+_(pdf|slots)\.html$")
+_LANG_RE = re.compile(r"<html[^>]*\blang=[\"']?([A-Za-z-]+)", re.IGNORECASE)
+
+
+class EmailTemplate(BaseModel):
+    """An example email, with its optional attachment, and its metadata."""
+
+    kind: str = Field(..., description="The template family, e.g. 'order' or 'customs'")
+    number: int = Field(..., description="The number of the template in its family")
+    email_html: str = Field(..., description="The example email body")
+    attachment_html: str | None = Field(
+        None, description="The example attachment, if the template has one"
+    )
+    compact_email_html: str = Field(
+        ..., description="The email body compacted for prompts (see compact_html)"
+    )
+    compact_attachment_html: str | None = Field(
+        None, description="The attachment compacted for prompts"
+    )
+    slot_html: str = Field(
+        ..., description="The layout with $slots the body is rendered into in slot mode"
+    )
+    language: str | None = Field(None, description="The language declared in the HTML")
+    size: int = Field(..., description="The size of the email and attachment in bytes")
+    weight: float = Field(1.0, description="The relative chance of being selected")
+    source: str = Field(..., description="Where the template was loaded from")
+
+    @property
+    def name(self) -> str:
+        """Get the template name, e.g. ``order_2``."""
+        return f"{self.kind}_{self.number}"
+
+    def prompt_html(self, compact: bool = True) -> tuple[str, str | None]:
+        """Get the email and attachment HTML to show the model in a prompt."""
+        if compact:
+            return self.compact_email_html, self.compact_attachment_html
+        return self.email_html, self.attachment_html
+
+    @property
+    def slots(self) -> list[str]:
+        """Get the names of the slots the template declares."""
+        return layout_slots(self.slot_html)
+
+    @property
+    def has_attachment(self) -> bool:
+        """Check whether the template comes with an attachment."""
+        return self.attachment_html is not None
+
+
+class TemplateRegistry:
+    """Discover, cache and sample the example templates.
+
+    Templates are read (and compacted for prompts) once when the registry is
+    created: the bundled ``phantommail.examples`` package first, then every
+    directory in ``PHANTOMMAIL_TEMPLATE_DIRS`` (separated by ``os.pathsep``)
+    and the ``directories`` argument. A template is a ``{kind}_{n}_email.html`` file
+    with an optional ``{kind}_{n}_pdf.html`` attachment next to it; later
+    directories override templates with the same name. A
+    ``{kind}_{n}_slots.html`` file declares the ``$slots`` layout used by the
+    slot backend, by default it is derived from the styling of the email.
+    """
+
+    def __init__(
+        self,
+        directories: Iterable[str | Path] = (),
+        weights: Dict[str, float] | None = None,
+    ):
+        """Initialize the registry and load all templates.
+
+        Args:
+            directories (Iterable[str | Path]): Extra template directories.
+            weights (dict[str, float] | None): Selection weight per template
+                name (e.g. ``{"order_2": 3}``), other templates weigh 1.
+
+        """
+        self.weights = weights or {}
+        self._templates: Dict[str, EmailTemplate] = {}
+        self._lock = threading.Lock()
+
+        self._load(resources.files("phantommail.examples"), "phantommail.examples")
+        env_dirs = os.environ.get(TEMPLATE_DIRS_ENV, "")
+        for directory in [*filter(None, env_dirs.split(os.pathsep)), *directories]:
+            self.add_directory(directory)
+
+    def add_directory(self, directory: str | Path) -> None:
+        """Load all templates from a directory."""
+        path = Path(directory)
+        if not path.is_dir():
+            raise ValueError(f"Template directory {path} does not exist.")
+        self._load(path, str(path))
+
+    def _load(self, directory, source: str) -> None:
+        """Load the templates of a directory (or package resource)."""
+        loaded = {}
+        for entry in directory.iterdir():
+            match = _EMAIL_FILE_RE.match(entry.name)
+            if not match:
+                if entry.name.endswith(".html") and not _COMPANION_FILE_RE.match(
+                    entry.name
+                ):
+                    logger.warning(
+                        f"Ignoring {entry.name} in {source}, template files are "
+                        "named {kind}_{n}_email.html."
+                    )
+                continue
+            kind, number = match["kind"], int(match["number"])
+            email_html = entry.read_text(encoding="utf-8")
+            attachment = directory.joinpath(f"{kind}_{number}_pdf.html")
+            attachment_html = (
+                attachment.read_text(encoding="utf-8") if attachment.is_file() else None
+            )
+            slots = directory.joinpath(f"{kind}_{number}_slots.html")
+            slot_html = (
+                slots.read_text(encoding="utf-8")
+                if slots.is_file()
+                else slot_layout(email_html)
+            )
+            language = _LANG_RE.search(email_html) or _LANG_RE.search(
+                attachment_html or ""
+            )
+            template = EmailTemplate(
+                kind=kind,
+                number=number,
+                email_html=email_html,
+                attachment_html=attachment_html,
+                compact_email_html=compact_html(email_html),
+                compact_attachment_html=(
+                    compact_html(attachment_html) if attachment_html else None
+                ),
+                slot_html=slot_html,
+                language=language.group(1).lower() if language else None,
+                size=len(email_html.encode()) + len((attachment_html or "").encode()),
+                weight=self.weights.get(f"{kind}_{number}", 1.0),
+                source=source,
+            )
+            loaded[template.name] = template
+
+        with self._lock:
+            self._templates.update(loaded)
+        logger.info(f"Loaded {len(loaded)} templates from {source}")
+
+    def get(self, name: str) -> EmailTemplate:
+        """Get a template by name, e.g. ``order_2``."""
+        try:
+            return self._templates[name]
+        except KeyError:
+            raise KeyError(f"Unknown template '{name}'.") from None
+
+    def templates(self, kind: str | None = None) -> List[EmailTemplate]:
+        """List the templates, optionally of a single kind."""
+        return sorted(
+            (t for t in self._templates.values() if kind is None or t.kind == kind),
+            key=lambda t: (t.kind, t.number),
+        )
+
+    def choose(self, kind: str, rng: random.Random | None = None) -> EmailTemplate:
+        """Select a template of a kind by weighted sampling."""
+        candidates = [t for t in self.templates(kind) if t.weight > 0]
+        if not candidates:
+            raise ValueError(f"No templates of kind '{kind}' available.")
+        return (rng or random).choices(
+            candidates, weights=[t.weight for t in candidates]
+        )[0]
+
+    def __len__(self) -> int:
+        """Get the number of templates."""
+        return len(self._templates)
+
+
+_registry: TemplateRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_template_registry() -> TemplateRegistry:
+    """Get the process-wide template registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = TemplateRegistry()
+    return _registry
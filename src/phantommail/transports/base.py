@@ -0,0 +1,92 @@
+from abc import ABC, abstractmethod
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+from typing import List, Sequence
+
+from phantommail.models.email import FullEmail
+
+
+class PartialBatchError(Exception):
+    """Raised when a batch failed after some of its emails were delivered."""
+
+    def __init__(self, message_ids: List[str], error: Exception):
+        """Initialize the error with the ids of the delivered emails.
+
+        Args:
+            message_ids (list[str]): The ids of the emails delivered, in order.
+            error (Exception): The error that stopped the batch.
+
+        """
+        super().__init__(f"Batch failed after {len(message_ids)} emails: {error}")
+        self.message_ids = message_ids
+        self.error = error
+
+
+def build_message(email: FullEmail) -> EmailMessage:
+    """Build the MIME message of an email, for SMTP and on-disk transports."""
+    message = EmailMessage()
+    message["From"] = email.sender
+    message["To"] = ", ".join(email.to)
+    if email.cc:
+        message["Cc"] = ", ".join(email.cc)
+    message["Subject"] = email.subject
+    message["Date"] = formatdate(localtime=True)
+    message["Message-ID"] = make_msgid(domain=email.sender.rpartition("@")[2] or None)
+    message.set_content(email.body_html, subtype="html")
+    for attachment in email.attachments or []:
+        maintype, _, subtype = attachment.content_type.partition("/")
+        message.add_attachment(
+            attachment.content,
+            maintype=maintype,
+            subtype=subtype or "octet-stream",
+            filename=attachment.filename,
+        )
+    return message
+
+
+def envelope_recipients(email: FullEmail) -> List[str]:
+    """Get every address an email goes to, including Bcc."""
+    return [*email.to, *(email.cc or []), *(email.bcc or [])]
+
+
+class Transport(ABC):
+    """Base class for email delivery transports.
+
+    Transports are blocking and thread-safe: the ``Mailer`` runs them in
+    worker threads and adds timeouts, concurrency limits and retries.
+    """
+
+    # Whether ``send_batch`` accepts emails with attachments
+    batch_attachments: bool = True
+
+    @abstractmethod
+    def send(self, email: FullEmail) -> str:
+        """Deliver an email and return its message id."""
+
+    def send_batch(self, emails: Sequence[FullEmail]) -> List[str]:
+        """Deliver several emails and return their message ids, in order.
+
+        Raises:
+            PartialBatchError: When the batch failed after some emails were
+                delivered, so those are not sent twice.
+
+        """
+        message_ids: List[str] = []
+        for email in emails:
+            try:
+                message_ids.append(self.send(email))
+            except Exception as e:
+                if not message_ids:
+                    raise
+                raise PartialBatchError(message_ids, e) from e
+        return message_ids
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Check whether a failed delivery may succeed when retried.
+
+        Timeouts are not retried: the message may have gone out regardless.
+        """
+        return isinstance(error, ConnectionError)
+
+    def close(self) -> None:
+        """Release the transport's connections, if it has any."""
@@ -0,0 +1,36 @@
+import os
+import socket
+import time
+import uuid
+from pathlib import Path
+
+from phantommail.models.email import FullEmail
+from phantommail.transports.base import Transport, build_message
+
+
+class MaildirTransport(Transport):
+    """Write every email as an ``.eml`` file into a maildir.
+
+    Messages are written to ``tmp/`` and atomically moved to ``new/``, so
+    mail clients and tools watching the directory never see partial files.
+    """
+
+    def __init__(self, path: str | Path):
+        """Initialize the transport, creating the maildir if needed.
+
+        Args:
+            path (str | Path): The maildir, with ``cur``, ``new`` and ``tmp``.
+
+        """
+        self.path = Path(path)
+        for folder in ("cur", "new", "tmp"):
+            (self.path / folder).mkdir(parents=True, exist_ok=True)
+        self._hostname = socket.gethostname().replace("/", "_").replace(":", "_")
+
+    def send(self, email: FullEmail) -> str:
+        """Write an email to the maildir and return its file name."""
+        name = f"{time.time_ns()}.{uuid.uuid4().hex}.{self._hostname}.eml"
+        temporary = self.path / "tmp" / name
+        temporary.write_bytes(build_message(email).as_bytes())
+        os.replace(temporary, self.path / "new" / name)
+        return name
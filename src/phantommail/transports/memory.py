@@ -0,0 +1,25 @@
+import threading
+from typing import List
+
+from phantommail.models.email import FullEmail
+from phantommail.transports.base import Transport
+
+
+class MemoryTransport(Transport):
+    """Record emails in memory instead of delivering them, for tests and load runs."""
+
+    def __init__(self):
+        """Initialize an empty transport."""
+        self.messages: List[FullEmail] = []
+        self._lock = threading.Lock()
+
+    def send(self, email: FullEmail) -> str:
+        """Record an email."""
+        with self._lock:
+            self.messages.append(email)
+            return f"memory-{len(self.messages)}"
+
+    def clear(self) -> None:
+        """Forget the recorded emails."""
+        with self._lock:
+            self.messages.clear()
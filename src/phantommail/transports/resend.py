@@ -0,0 +1,76 @@
+import base64
+import os
+from typing import List, Sequence
+
+import resend
+from resend.exceptions import ResendError
+
+from phantommail.models.email import FullEmail
+from phantommail.transports.base import Transport
+
+# Provider status codes that are worth retrying; 409 (conflict, e.g. an
+# idempotency clash) is not transient and retrying it could send twice
+RETRYABLE_CODES = {408, 429, 500, 502, 503, 504}
+
+
+def build_params(email: FullEmail) -> resend.Emails.SendParams:
+    """Convert an email into Resend send parameters."""
+    params: resend.Emails.SendParams = {
+        "from": email.sender,
+        "to": email.to,
+        "subject": email.subject,
+        "html": email.body_html,
+        "cc": email.cc,
+        "bcc": email.bcc,
+    }
+    if email.attachments:
+        # The only encoding step: raw bytes to base64 at the transport boundary
+        params["attachments"] = [
+            {
+                "content": base64.b64encode(attachment.content).decode("ascii"),
+                "filename": attachment.filename,
+                "content_type": attachment.content_type,
+            }
+            for attachment in email.attachments
+        ]
+    return params
+
+
+class ResendTransport(Transport):
+    """Deliver emails through the Resend API."""
+
+    # Resend's batch endpoint does not accept attachments
+    batch_attachments = False
+
+    def __init__(self, api_key: str | None = None):
+        """Initialize the transport.
+
+        Args:
+            api_key (str | None): The API key, defaults to ``RESEND_API_KEY``.
+
+        """
+        self.api_key = api_key
+
+    def _authenticate(self) -> None:
+        """Set the API key on the (module level) Resend client."""
+        resend.api_key = self.api_key or os.environ["RESEND_API_KEY"]
+
+    def send(self, email: FullEmail) -> str:
+        """Send an email with the single-email endpoint."""
+        self._authenticate()
+        return resend.Emails.send(build_params(email))["id"]
+
+    def send_batch(self, emails: Sequence[FullEmail]) -> List[str]:
+        """Send up to 100 emails with a single batch request."""
+        self._authenticate()
+        response = resend.Batch.send([build_params(email) for email in emails])
+        return [item["id"] for item in response["data"]]
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Retry rate limits, server errors and connection problems."""
+        if isinstance(error, ResendError):
+            try:
+                return int(error.code) in RETRYABLE_CODES
+            except (TypeError, ValueError):
+                return False
+        return super().is_retryable(error)
@@ -0,0 +1,342 @@
+import smtplib
+import ssl as ssl_module
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Iterator, List, Sequence
+
+from phantommail.logger import setup_logger
+from phantommail.models.email import FullEmail
+from phantommail.telemetry import get_telemetry
+from phantommail.transports.base import (
+    PartialBatchError,
+    Transport,
+    build_message,
+    envelope_recipients,
+)
+
+logger = setup_logger(__name__)
+
+SMTP_SESSIONS = "phantommail_smtp_sessions"
+SMTP_SESSION_EVENTS = "phantommail_smtp_session_events_total"
+SMTP_MESSAGES = "phantommail_smtp_messages_total"
+SMTP_POOL_WAIT = "phantommail_smtp_pool_wait_seconds"
+
+
+@dataclass
+class SMTPSession:
+    """An open SMTP connection and its usage."""
+
+    connection: smtplib.SMTP
+    created: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    messages: int = 0
+
+
+class SMTPConnectionPool:
+    """A pool of authenticated SMTP sessions shared by the sending threads.
+
+    Up to ``size`` sessions are open at once and each carries many messages.
+    Idle sessions are handed out oldest first, so the load spreads over all
+    of them. A session that sat idle longer than ``check_after`` seconds is
+    probed with ``NOOP`` before reuse, and sessions are recycled after
+    ``max_messages`` messages or ``max_age`` seconds (MTAs often cap both);
+    broken sessions are dropped and replaced on demand.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], smtplib.SMTP],
+        size: int = 4,
+        max_messages: int = 100,
+        max_age: float | None = 300.0,
+        check_after: float = 5.0,
+        name: str = "smtp",
+    ):
+        """Initialize the pool.
+
+        Args:
+            connect (Callable[[], smtplib.SMTP]): Opens an authenticated session.
+            size (int): The maximum number of open sessions.
+            max_messages (int): Messages after which a session is recycled.
+            max_age (float | None): Seconds after which a session is recycled.
+            check_after (float): Idle seconds after which a session is probed.
+            name (str): The server, used as metrics label.
+
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1.")
+        self.connect = connect
+        self.size = size
+        self.max_messages = max_messages
+        self.max_age = max_age
+        self.check_after = check_after
+        self.name = name
+
+        self._idle: Deque[SMTPSession] = deque()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._waiting = 0
+        self._counts = {"opened": 0, "recycled": 0, "broken": 0, "messages": 0}
+
+    @property
+    def stats(self) -> dict:
+        """Get the session counts, utilization and lifetime counters."""
+        with self._lock:
+            return {
+                "size": self.size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "utilization": self._in_use / self.size,
+                **self._counts,
+            }
+
+    def _event(self, event: str) -> None:
+        """Count a session event, e.g. a session being opened."""
+        with self._lock:
+            self._counts[event] += 1
+        get_telemetry().metrics.inc(SMTP_SESSION_EVENTS, event=event, server=self.name)
+
+    def _publish(self) -> None:
+        """Update the session gauges, with the lock held."""
+        metrics = get_telemetry().metrics
+        for state, value in (
+            ("in_use", self._in_use),
+            ("idle", len(self._idle)),
+            ("waiting", self._waiting),
+        ):
+            metrics.set(SMTP_SESSIONS, value, state=state, server=self.name)
+
+    @staticmethod
+    def _close(session: SMTPSession) -> None:
+        """Close a session, ignoring errors on already broken connections."""
+        try:
+            session.connection.quit()
+        except (smtplib.SMTPException, OSError):
+            session.connection.close()
+
+    def _usable(self, session: SMTPSession) -> bool:
+        """Check an idle session, closing it when it should not be reused."""
+        now = time.monotonic()
+        if session.messages >= self.max_messages or (
+            self.max_age is not None and now - session.created >= self.max_age
+        ):
+            self._close(session)
+            self._event("recycled")
+            return False
+        if now - session.last_used >= self.check_after:
+            try:
+                healthy = session.connection.noop()[0] == 250
+            except (smtplib.SMTPException, OSError):
+                healthy = False
+            if not healthy:
+                logger.info(f"Dropping a broken SMTP session to {self.name}")
+                session.connection.close()
+                self._event("broken")
+                return False
+        return True
+
+    def _acquire(self) -> SMTPSession:
+        """Borrow a session, waiting for a free slot if all are in use."""
+        started = time.perf_counter()
+        with self._lock:
+            self._waiting += 1
+            self._publish()
+        self._slots.acquire()
+        with self._lock:
+            self._waiting -= 1
+            self._in_use += 1
+            self._publish()
+        get_telemetry().metrics.observe(
+            SMTP_POOL_WAIT, time.perf_counter() - started, server=self.name
+        )
+        try:
+            while True:
+                with self._lock:
+                    session = self._idle.popleft() if self._idle else None
+                if session is None:
+                    session = SMTPSession(self.connect())
+                    self._event("opened")
+                    return session
+                if self._usable(session):
+                    return session
+        except BaseException:
+            self._release(None)
+            raise
+
+    def _release(self, session: SMTPSession | None) -> None:
+        """Give back a slot, and the session if it can be reused."""
+        with self._lock:
+            if session is not None:
+                session.last_used = time.monotonic()
+                self._idle.append(session)
+            self._in_use -= 1
+            self._publish()
+        self._slots.release()
+
+    def _discard(self, session: SMTPSession) -> None:
+        """Drop a broken session and give back its slot."""
+        session.connection.close()
+        self._event("broken")
+        self._release(None)
+
+    @contextmanager
+    def session(self) -> Iterator[SMTPSession]:
+        """Borrow an open session for one or more messages."""
+        session = self._acquire()
+        try:
+            yield session
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException) as e:
+            # A refused sender, recipient or message leaves the session
+            # usable, unless the server is shutting it down (421)
+            if getattr(e, "smtp_code", None) == 421:
+                self._discard(session)
+            else:
+                self._release(session)
+            raise
+        except BaseException:
+            self._discard(session)
+            raise
+        else:
+            self._release(session)
+
+    def sent(self, session: SMTPSession, count: int = 1) -> None:
+        """Count messages sent over a borrowed session."""
+        session.messages += count
+        with self._lock:
+            self._counts["messages"] += count
+        get_telemetry().metrics.inc(SMTP_MESSAGES, count, server=self.name)
+
+    def close(self) -> None:
+        """Close all idle sessions; borrowed ones stay open until returned."""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+            self._publish()
+        for session in idle:
+            self._close(session)
+
+
+class SMTPTransport(Transport):
+    """Deliver emails over SMTP through a pool of persistent sessions.
+
+    Sessions are opened (and authenticated) on demand and kept open after
+    use, so consecutive emails skip the TCP/TLS handshake and login, and up
+    to ``max_connections`` sessions send in parallel. A batch sends all its
+    messages over a single session. ``pool.stats`` reports utilization.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int | None = None,
+        username: str | None = None,
+        password: str | None = None,
+        use_ssl: bool = False,
+        starttls: bool = False,
+        timeout: float = 30.0,
+        max_connections: int = 4,
+        max_messages_per_connection: int = 100,
+    ):
+        """Initialize the transport.
+
+        Args:
+            host (str): The SMTP server.
+            port (int | None): The port, defaults to 465 with SSL and 25 otherwise.
+            username (str | None): The login, if the server requires one.
+            password (str | None): The password for ``username``.
+            use_ssl (bool): Connect with implicit TLS (SMTPS).
+            starttls (bool): Upgrade plain connections with STARTTLS.
+            timeout (float): Socket timeout in seconds.
+            max_connections (int): The maximum number of open sessions.
+            max_messages_per_connection (int): Messages after which a session
+                is closed and replaced.
+
+        """
+        self.host = host
+        self.port = port or (465 if use_ssl else 25)
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+        self.starttls = starttls
+        self.timeout = timeout
+        self.pool = SMTPConnectionPool(
+            self._connect,
+            size=max_connections,
+            max_messages=max_messages_per_connection,
+            name=f"{self.host}:{self.port}",
+        )
+
+    @property
+    def max_connections(self) -> int:
+        """Get the maximum number of open sessions."""
+        return self.pool.size
+
+    def _connect(self) -> smtplib.SMTP:
+        """Open and authenticate a new session."""
+        if self.use_ssl:
+            connection = smtplib.SMTP_SSL(
+                self.host,
+                self.port,
+                timeout=self.timeout,
+                context=ssl_module.create_default_context(),
+            )
+        else:
+            connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                connection.starttls(context=ssl_module.create_default_context())
+        if self.username:
+            connection.login(self.username, self.password or "")
+        return connection
+
+    def _send_on(self, session: SMTPSession, email: FullEmail) -> str:
+        """Send one email over a borrowed session and return its Message-ID."""
+        message = build_message(email)
+        session.connection.send_message(
+            message, from_addr=email.sender, to_addrs=envelope_recipients(email)
+        )
+        self.pool.sent(session)
+        return message["Message-ID"]
+
+    def send(self, email: FullEmail) -> str:
+        """Send an email over a pooled session."""
+        with self.pool.session() as session:
+            return self._send_on(session, email)
+
+    def send_batch(self, emails: Sequence[FullEmail]) -> List[str]:
+        """Send several emails back to back over a single session."""
+        message_ids: List[str] = []
+        try:
+            with self.pool.session() as session:
+                for email in emails:
+                    message_ids.append(self._send_on(session, email))
+        except Exception as e:
+            if not message_ids:
+                raise
+            raise PartialBatchError(message_ids, e) from e
+        return message_ids
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Retry dropped connections and temporary (4xx) server replies.
+
+        Socket timeouts are not retried, the server may have accepted the
+        message before the reply timed out.
+        """
+        if isinstance(
+            error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)
+        ):
+            return True
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            return all(400 <= code < 500 for code, _ in error.recipients.values())
+        if isinstance(error, smtplib.SMTPResponseException):
+            return 400 <= error.smtp_code < 500
+        if isinstance(error, (smtplib.SMTPException, TimeoutError)):
+            return False
+        return isinstance(error, OSError)
+
+    def close(self) -> None:
+        """Close all idle sessions."""
+        self.pool.close()
@@ -0,0 +1,76 @@
+import socketserver
+import threading
+
+import pytest
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """A minimal threaded SMTP server that keeps the messages it receives."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), SMTPHandler)
+        self.messages = []
+        self.connections = 0
+        self.lock = threading.Lock()
+        # Reply 421 and hang up on the next command matching this prefix
+        self.drop_on = None
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+        self.reply("220 sink ready")
+        envelope = {"to": []}
+        while line := self.rfile.readline():
+            command = line.decode().strip()
+            upper = command.upper()
+            if self.server.drop_on and upper.startswith(self.server.drop_on):
+                self.server.drop_on = None
+                self.reply("421 closing")
+                return
+            if upper.startswith(("EHLO", "HELO")):
+                self.reply("250 sink")
+            elif upper.startswith("MAIL FROM"):
+                envelope = {"from": command[10:], "to": []}
+                self.reply("250 ok")
+            elif upper.startswith("RCPT TO"):
+                envelope["to"].append(command[8:])
+                self.reply("250 ok")
+            elif upper == "DATA":
+                self.reply("354 go ahead")
+                data = []
+                while (chunk := self.rfile.readline()) not in (b".\r\n", b""):
+                    data.append(chunk)
+                with self.server.lock:
+                    self.server.messages.append({**envelope, "data": b"".join(data)})
+                self.reply("250 queued")
+            elif upper in ("RSET", "NOOP"):
+                self.reply("250 ok")
+            elif upper == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("502 not implemented")
+
+
+@pytest.fixture
+def smtp_sink():
+    sink = SMTPSink()
+    yield sink
+    sink.close()
@@ -0,0 +1,93 @@
+import argparse
+import asyncio
+import random
+
+import pytest
+
+from phantommail.campaign import _percentile, main, run_campaign
+from phantommail.graphs.graph import graph_nodes
+from phantommail.mix import parse_mix, plan_email_types
+from phantommail.transports import MemoryTransport
+
+OFFLINE_MIX = {"question": 1, "complaint": 1, "update_order": 1, "random": 1}
+
+
+def test_parse_mix():
+    assert parse_mix("order=3, question=1,random") == {
+        "order": 3.0,
+        "question": 1.0,
+        "random": 1.0,
+    }
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_mix("order=lots")
+
+
+def test_plan_email_types():
+    planned = plan_email_types(100, {"order": 3, "question": 0, "random": 1})
+    assert set(planned) == {"order", "random"}
+    assert plan_email_types(10, rng=random.Random(1)) == plan_email_types(
+        10, rng=random.Random(1)
+    )
+    with pytest.raises(ValueError):
+        plan_email_types(1, {"fax": 1})
+    with pytest.raises(ValueError):
+        plan_email_types(1, {"order": 0})
+
+
+def test_percentile():
+    assert _percentile([2.0], 95) == 2.0
+    assert _percentile([float(i) for i in range(1, 101)], 50) == pytest.approx(50.5)
+    assert _percentile([1.0, 2.0, 3.0], 95) == pytest.approx(2.9)
+
+
+def test_rejects_an_invalid_progress_interval():
+    transport = MemoryTransport()
+    with pytest.raises(ValueError):
+        asyncio.run(
+            run_campaign(
+                ["a@example.com"],
+                2,
+                mix=OFFLINE_MIX,
+                sender="from@example.com",
+                progress_every=0,
+                transport=transport,
+                backend="template",
+            )
+        )
+    assert transport.messages == []
+
+
+def test_offline_campaign_keeps_the_shared_mailer():
+    transport = MemoryTransport()
+    shared_transport = graph_nodes.mailer._transport
+
+    summary = asyncio.run(
+        run_campaign(
+            ["a@example.com", "b@example.com"],
+            6,
+            mix=OFFLINE_MIX,
+            sender="from@example.com",
+            seed=7,
+            transport=transport,
+            backend="template",
+        )
+    )
+
+    assert summary.succeeded == 6 and summary.failed == 0
+    assert sum(summary.per_type.values()) == 6
+    assert len(transport.messages) == 6
+    assert {m.to[0] for m in transport.messages} == {"a@example.com", "b@example.com"}
+    assert graph_nodes.mailer._transport is shared_transport
+
+
+def test_main_exits_cleanly(tmp_path):
+    argv = [
+        "--to=a@example.com",
+        "--sender=from@example.com",
+        "--count=2",
+        "--mix=question=1",
+        "--backend=template",
+        f"--transport=maildir://{tmp_path}",
+    ]
+    assert main(argv) is None
+    assert len(list((tmp_path / "new").iterdir())) == 2
@@ -0,0 +1,65 @@
+import asyncio
+
+from phantommail.backends import EmailBackend
+from phantommail.graphs.nodes import GraphNodes
+from phantommail.helpers.compact_html import compact_html
+from phantommail.models.email import Email
+from phantommail.templates import get_template_registry
+
+ROW = '<tr>\n  <td style="padding: 4px;">{}</td>\n  <td class="num" style="padding: 4px;">{}</td>\n</tr>\n'
+
+
+def test_compacts_markup_and_styles():
+    html = (
+        "<html><head><style>\n  /* layout */\n  td {\n    color: red;\n  }\n</style></head>\n"
+        "<body>\n  <!-- rows -->\n  <table>\n"
+        + "".join(ROW.format(f"item {i}", i) for i in range(5))
+        + "  </table>\n  <p style='x'>Total</p>\n</body></html>"
+    )
+    compact = compact_html(html)
+
+    assert "<!--" not in compact and "/*" not in compact
+    assert "td{color:red}" in compact
+    assert ".c0{padding:4px!important}" in compact
+    assert '<td class="num c0">' in compact
+    # Only the first two look-alike rows are kept
+    assert "item 1" in compact and "item 2" not in compact
+    assert "><" in compact and "\n" not in compact
+
+
+def test_keeps_spaces_between_inline_elements():
+    html = '<div>\n  <p>\n    Call <strong>Ann</strong>\n    <a href="#">now</a>\n  </p>\n</div>'
+    assert compact_html(html) == '<div><p>Call <strong>Ann</strong> <a href="#">now</a></p></div>'
+
+
+def test_keeps_preformatted_whitespace():
+    html = "<div>\n  <pre>a\n   b</pre>\n</div>"
+    assert "a\n   b" in compact_html(html)
+
+
+def test_registry_caches_compacted_templates():
+    for template in get_template_registry().templates():
+        assert len(template.compact_email_html) <= len(template.email_html)
+        if template.has_attachment:
+            assert len(template.compact_attachment_html) < len(template.attachment_html)
+
+
+def test_prompts_use_compacted_templates():
+    class Capture(EmailBackend):
+        prompts = []
+
+        async def generate(self, request):
+            self.prompts.append(request.messages[0].content)
+            return Email(subject="", body_html="")
+
+    nodes = GraphNodes(backend=Capture())
+
+    for compact in (False, True):
+        configurable = {
+            "seed": 1,
+            "render_attachments": False,
+            "compact_prompts": compact,
+        }
+        asyncio.run(nodes.generate_order({}, {"configurable": configurable}))
+    full, compact = Capture.prompts
+    assert len(compact) < len(full)
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from phantommail.fakers.customers import (
+    CustomerRegistry,
+    get_customer_registry,
+    set_customers_path,
+)
+from phantommail.fakers.price_request import PriceRequestGenerator
+from phantommail.fakers.transport import TransportOrderGenerator
+
+HEADER = "company_name,vat_number,address,city,postal_code,country,email,phone\n"
+
+
+@pytest.fixture
+def customers_csv(tmp_path):
+    path = tmp_path / "customers.csv"
+    path.write_text(
+        HEADER + '"Acme NV",BE0123456789,"Main 1",Gent,9000,Belgium,a@acme.be,+32 9 1\n',
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_registry_is_shared_between_generators():
+    assert TransportOrderGenerator().customer_registry is get_customer_registry()
+    assert PriceRequestGenerator().customer_registry is get_customer_registry()
+    assert len(get_customer_registry()) > 0
+
+
+def test_customers_are_read_only():
+    customer = get_customer_registry().choice()
+    with pytest.raises(TypeError):
+        customer["company_name"] = "Changed"
+
+
+def test_external_customer_file(customers_csv):
+    registry = CustomerRegistry(customers_csv)
+    assert len(registry) == 1
+    assert registry.choice()["company_name"] == "Acme NV"
+
+
+def test_mtime_invalidation(customers_csv):
+    registry = CustomerRegistry(customers_csv, check_mtime=True)
+    assert len(registry) == 1
+
+    with open(customers_csv, "a", encoding="utf-8") as f:
+        f.write('"Beta BV",NL1,"Dam 2",Amsterdam,1012,Netherlands,b@beta.nl,+31 20 1\n')
+    stat = customers_csv.stat()
+    os.utime(customers_csv, (stat.st_atime, stat.st_mtime + 10))
+
+    assert len(registry) == 2
+
+
+def test_existing_generators_follow_set_customers_path(customers_csv):
+    generator = TransportOrderGenerator(seed=1)
+    generator.generate()
+    try:
+        set_customers_path(customers_csv)
+        assert generator.customer_registry is get_customer_registry()
+        assert generator.generate().client.company == "Acme NV"
+    finally:
+        set_customers_path(None)
@@ -0,0 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from phantommail.fakers.complaint import FakeComplaint
+from phantommail.fakers.faker_pool import FakerPool, get_faker
+from phantommail.fakers.question import TransportQuestionGenerator
+
+
+def test_instances_are_shared_per_locale():
+    assert get_faker("nl_BE") is get_faker("nl_BE")
+    assert get_faker("nl_BE") is not get_faker("fr_FR")
+    assert FakeComplaint().faker is TransportQuestionGenerator().faker
+
+
+def test_concurrent_access_creates_one_instance():
+    pool = FakerPool()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        fakers = list(executor.map(lambda _: pool.get("de_DE"), range(32)))
+    assert len(pool) == 1
+    assert all(faker is fakers[0] for faker in fakers)
+
+
+def test_seeded_instances_are_private_and_reproducible():
+    first = get_faker("en_GB", seed=42)
+    second = get_faker("en_GB", seed=42)
+    assert first is not second
+    assert first is not get_faker("en_GB")
+    assert [first.name() for _ in range(5)] == [second.name() for _ in range(5)]
@@ -0,0 +1,57 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from phantommail.fakers.declaration import DeclarationGenerator
+from phantommail.fakers.transport import TransportOrderGenerator
+from phantommail.fakers.waiting_costs import WaitingCostsGenerator
+from phantommail.models.goods import Goods
+
+
+def test_goods_random_many():
+    goods = Goods.random_many(200, np.random.default_rng(0))
+    assert len(goods) == 200
+    assert all(1 <= g.quantity <= 100 for g in goods)
+    assert all(350 <= g.weight <= 1000 for g in goods)
+    assert all(10 <= g.volume <= 1000 for g in goods)
+
+
+def test_declarations_derive_values_vectorized():
+    declarations = DeclarationGenerator(seed=1).generate_many(50)
+    assert len(declarations) == 50
+    for declaration in declarations:
+        item = declaration.items[0]
+        assert item.net_mass_kg == pytest.approx(item.gross_mass_kg * 0.95)
+        assert 1 <= len(declaration.tax_lines) <= 3
+        for line in declaration.tax_lines:
+            assert line.total_tax_assessed == pytest.approx(
+                line.tax_base * line.tax_rate / 100, abs=0.01
+            )
+        assert 1 <= declaration.transport_info.transport_mode <= 9
+
+
+def test_transport_orders_respect_date_ranges():
+    today = date.today()
+    for order in TransportOrderGenerator(seed=1).generate_many(50):
+        assert today + timedelta(days=1) <= order.loading_date
+        assert order.loading_date <= today + timedelta(days=10)
+        assert 1 <= (order.unloading_date - order.loading_date).days <= 5
+        assert 3 <= order.loading_metres <= 12
+        assert 1 <= order.pallet_count <= 5
+
+
+def test_waiting_costs_totals():
+    for scenario in WaitingCostsGenerator(seed=1).generate_many(50):
+        hours = scenario["scenario"]["waiting_hours"]
+        assert 3 <= hours <= 8
+        assert 50 * hours <= scenario["scenario"]["total_cost"] <= 75 * hours
+
+
+@pytest.mark.parametrize(
+    "generator_type", [DeclarationGenerator, TransportOrderGenerator]
+)
+def test_generate_many_is_reproducible(generator_type):
+    first = generator_type(seed=4).generate_many(10)
+    second = generator_type(seed=4).generate_many(10)
+    assert [r.model_dump() for r in first] == [r.model_dump() for r in second]
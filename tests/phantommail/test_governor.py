@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+from phantommail.backends import EmailRequest, LLMBackend, LLMGovernor
+from phantommail.backends.governor import LLM_QUEUE_DEPTH, TokenBucket
+from phantommail.models.email import Email
+from phantommail.telemetry import Telemetry, set_telemetry
+
+
+class SlowLLM:
+    model_name = "slow"
+    temperature = 0.5
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+
+    def with_structured_output(self, schema):
+        async def respond(messages):
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            await asyncio.sleep(0.01)
+            self.running -= 1
+            return Email(subject="Hi", body_html="<p/>")
+
+        return RunnableLambda(lambda messages: None, afunc=respond)
+
+
+def request(i=0):
+    return EmailRequest(email_type="question", messages=[HumanMessage(content=f"Q{i}")])
+
+
+@pytest.fixture
+def telemetry():
+    telemetry = Telemetry()
+    previous = set_telemetry(telemetry)
+    yield telemetry
+    set_telemetry(previous)
+
+
+def test_caps_calls_in_flight(telemetry):
+    llm = SlowLLM()
+    governor = LLMGovernor(max_in_flight=2)
+    backend = LLMBackend(llm, governor=governor)
+
+    async def run():
+        await asyncio.gather(*(backend.generate(request(i)) for i in range(10)))
+
+    asyncio.run(run())
+
+    assert llm.peak == 2
+    assert governor.stats["admitted"] == 10
+    assert governor.stats["in_flight"] == 0
+    assert telemetry.metrics.gauge(LLM_QUEUE_DEPTH) == 0
+
+
+def test_rate_limits_requests(telemetry):
+    governor = LLMGovernor(requests_per_minute=1200)
+    # Start with an empty bucket: 20 requests per second
+    governor.requests.tokens = 0
+    backend = LLMBackend(SlowLLM(), governor=governor)
+
+    async def run():
+        await asyncio.gather(*(backend.generate(request(i)) for i in range(3)))
+
+    started = time.perf_counter()
+    asyncio.run(run())
+
+    assert time.perf_counter() - started >= 0.12
+    assert governor.stats["throttled_seconds"] > 0
+
+
+def test_token_bucket_settles_actual_usage():
+    bucket = TokenBucket(6000)
+    assert bucket.delay(5000) == 0
+    # The call used far less than reserved, the difference flows back
+    bucket.adjust(1000 - 5000)
+    assert bucket.tokens == pytest.approx(5000, abs=5)
+    bucket.tokens = 0
+    assert bucket.delay(100) == pytest.approx(1.0, rel=0.05)
+
+
+def test_failed_calls_settle_their_reservation(telemetry):
+    class FailingLLM(SlowLLM):
+        def with_structured_output(self, schema):
+            def fail(messages):
+                raise RuntimeError("quota")
+
+            return RunnableLambda(fail)
+
+    governor = LLMGovernor(tokens_per_minute=6000, expected_output_tokens=1000)
+    backend = LLMBackend(FailingLLM(), governor=governor)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(backend.generate(request()))
+
+    # Only the prompt estimate stays spent, the output reservation is back
+    assert governor.tokens.tokens == pytest.approx(6000, abs=5)
+    assert governor.stats["in_flight"] == 0
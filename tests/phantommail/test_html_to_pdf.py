@@ -0,0 +1,176 @@
+import asyncio
+
+import pytest
+
+from phantommail.helpers import html_to_pdf
+from phantommail.helpers.html_to_pdf import PdfRenderer
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed or self.context.closed
+
+    async def set_content(self, html):
+        driver = self.context.browser.driver
+        driver.rendering += 1
+        driver.peak = max(driver.peak, driver.rendering)
+        await driver.gate.wait()
+        await asyncio.sleep(0.001)
+        driver.rendering -= 1
+
+    async def pdf(self, **options):
+        return b"%PDF-"
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+    async def new_page(self):
+        return FakePage(self)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, driver):
+        self.driver = driver
+        self.connected = True
+        self.close_error = None
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self):
+        self.driver.contexts += 1
+        return FakeContext(self)
+
+    async def close(self):
+        if self.close_error is not None:
+            raise self.close_error
+        self.connected = False
+
+
+class FakeDriver:
+    """Stands in for ``async_playwright()`` and the objects it hands out."""
+
+    def __init__(self, fail_launch=False):
+        self.fail_launch = fail_launch
+        self.launches = 0
+        self.stops = 0
+        self.contexts = 0
+        self.rendering = 0
+        self.peak = 0
+        self.browsers = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.chromium = self
+
+    async def start(self):
+        return self
+
+    async def stop(self):
+        self.stops += 1
+
+    async def launch(self, headless=True):
+        self.launches += 1
+        if self.fail_launch:
+            raise RuntimeError("no Chromium")
+        self.browsers.append(FakeBrowser(self))
+        return self.browsers[-1]
+
+
+@pytest.fixture
+def driver(monkeypatch):
+    driver = FakeDriver()
+    monkeypatch.setattr(html_to_pdf, "async_playwright", lambda: driver)
+    return driver
+
+
+def test_reuses_a_warm_browser_and_its_pages(driver):
+    renderer = PdfRenderer(pool_size=2, max_renders_per_page=3)
+
+    async def run():
+        for _ in range(5):
+            assert await renderer.render("<p>Hi</p>") == b"%PDF-"
+        await renderer.close()
+
+    asyncio.run(run())
+
+    assert driver.launches == 1
+    # A page is recycled after three renders
+    assert driver.contexts == 2
+    assert driver.stops == 1
+
+
+def test_bounds_concurrent_renders(driver):
+    renderer = PdfRenderer(pool_size=2)
+
+    async def run():
+        await asyncio.gather(*(renderer.render("<p/>") for _ in range(6)))
+
+    asyncio.run(run())
+
+    assert driver.peak == 2
+    assert driver.contexts == 2
+
+
+def test_relaunches_a_crashed_browser_within_the_limit(driver):
+    renderer = PdfRenderer(pool_size=1)
+
+    async def run():
+        await renderer.render("<p/>")
+        driver.gate.clear()
+        first = asyncio.create_task(renderer.render("<p/>"))
+        await asyncio.sleep(0.01)
+        # The browser dies while the only page is still rendering
+        driver.browsers[-1].connected = False
+        second = asyncio.create_task(renderer.render("<p/>"))
+        await asyncio.sleep(0.01)
+        driver.gate.set()
+        return await asyncio.gather(first, second, return_exceptions=True)
+
+    asyncio.run(run())
+
+    assert driver.launches == 2
+    assert driver.peak == 1
+
+
+def test_stops_the_driver_when_the_launch_fails(monkeypatch):
+    driver = FakeDriver(fail_launch=True)
+    monkeypatch.setattr(html_to_pdf, "async_playwright", lambda: driver)
+    renderer = PdfRenderer()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(renderer.render("<p/>"))
+
+    assert driver.stops == 1
+    assert not renderer.is_healthy()
+
+
+def test_shuts_down_the_browser_of_a_previous_loop(driver):
+    renderer = PdfRenderer()
+
+    asyncio.run(renderer.render("<p/>"))
+    asyncio.run(renderer.render("<p/>"))
+
+    assert driver.launches == 2
+    assert not driver.browsers[0].is_connected()
+    assert driver.stops == 1
+
+
+def test_drops_a_browser_that_cannot_be_stopped_from_a_new_loop(driver):
+    renderer = PdfRenderer()
+
+    asyncio.run(renderer.render("<p/>"))
+    driver.browsers[0].close_error = RuntimeError("Event loop is closed")
+
+    assert asyncio.run(renderer.render("<p/>")) == b"%PDF-"
+    assert driver.launches == 2
+    assert renderer._browser is driver.browsers[1]
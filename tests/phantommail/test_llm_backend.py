@@ -0,0 +1,53 @@
+import asyncio
+
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+from phantommail.backends import EmailRequest
+from phantommail.graphs.nodes import GraphNodes
+from phantommail.models.email import Email
+
+
+class CountingLLM:
+    model_name = "counting"
+    temperature = 0.5
+
+    def __init__(self):
+        self.bindings = 0
+
+    def with_structured_output(self, schema):
+        self.bindings += 1
+        return RunnableLambda(lambda messages: Email(subject="Hi", body_html="<p/>"))
+
+
+def test_structured_runnable_is_built_once_per_model():
+    llm = CountingLLM()
+    nodes = GraphNodes(backend="llm")
+    config = {"configurable": {"llm": llm}}
+    request = EmailRequest(email_type="question", messages=[HumanMessage(content="Hi")])
+
+    async def run():
+        for _ in range(3):
+            await nodes.get_backend(config).generate(request)
+        await nodes.generate_question({}, config)
+
+    asyncio.run(run())
+
+    assert llm.bindings == 1
+    assert nodes.get_backend(config) is nodes.get_backend(config)
+    assert nodes.get_backend({"configurable": {"llm": CountingLLM()}}).llm is not llm
+
+
+def test_backends_for_per_run_models_are_bounded():
+    nodes = GraphNodes(backend="llm")
+    for temperature in range(GraphNodes.MAX_LLM_BACKENDS + 10):
+        llm = CountingLLM()
+        llm.temperature = temperature
+        assert nodes.get_backend({"configurable": {"llm": llm}}).llm is llm
+
+    assert len(nodes._llm_backends) == GraphNodes.MAX_LLM_BACKENDS
+    # Another instance with the same name and temperature isn't served a
+    # backend bound to the old one
+    twin = CountingLLM()
+    twin.temperature = llm.temperature
+    assert nodes.get_backend({"configurable": {"llm": twin}}).llm is twin
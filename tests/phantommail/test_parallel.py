@@ -0,0 +1,54 @@
+from concurrent.futures import Executor, Future
+
+import pytest
+
+from phantommail.fakers.parallel import generate_parallel, iter_records
+from phantommail.models.customs_document import CustomsDeclaration
+
+
+def test_chunks_cover_the_requested_count():
+    chunks = list(generate_parallel("question", 25, chunk_size=10, workers=1))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+
+
+def test_output_does_not_depend_on_the_number_of_workers():
+    inline = list(iter_records("declaration", 12, chunk_size=4, workers=1, seed=8))
+    pooled = list(iter_records("declaration", 12, chunk_size=4, workers=2, seed=8))
+    assert all(isinstance(record, CustomsDeclaration) for record in pooled)
+    assert [r.model_dump() for r in inline] == [r.model_dump() for r in pooled]
+
+
+def test_unseeded_workers_are_independent():
+    records = list(iter_records("order", 8, chunk_size=2, workers=2))
+    assert len({record.model_dump_json() for record in records}) == 8
+
+
+def test_unknown_kind():
+    with pytest.raises(ValueError):
+        list(generate_parallel("invoice", 1))
+
+
+class FirstChunkExecutor(Executor):
+    """Runs the first chunk right away and leaves the others pending."""
+
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        if not self.futures:
+            future.set_result(fn(*args, **kwargs))
+        self.futures.append(future)
+        return future
+
+
+def test_stopping_early_cancels_chunks_on_a_shared_executor():
+    executor = FirstChunkExecutor()
+    chunks = generate_parallel(
+        "question", 5, chunk_size=1, workers=1, executor=executor
+    )
+    assert len(next(chunks)) == 1
+    chunks.close()
+
+    assert len(executor.futures) == 2
+    assert executor.futures[1].cancelled()
@@ -0,0 +1,37 @@
+import pickle
+
+from phantommail.fakers.declaration import DeclarationGenerator
+from phantommail.fakers.parallel import iter_records
+from phantommail.fakers.transport import TransportOrderGenerator
+from phantommail.models.customs_document import CustomsDeclaration
+from phantommail.models.records import TransportOrderRecord
+from phantommail.models.transport import TransportOrder
+
+
+def unvalidated(generator, n):
+    generator.validate = False
+    return generator.generate_many(n)
+
+
+def test_records_dump_like_the_validated_models():
+    for generator_type in (DeclarationGenerator, TransportOrderGenerator):
+        validated = generator_type(seed=5).generate_many(20)
+        records = unvalidated(generator_type(seed=5), 20)
+        assert [r.model_dump() for r in records] == [m.model_dump() for m in validated]
+
+
+def test_records_convert_to_models():
+    record = unvalidated(TransportOrderGenerator(seed=1), 1)[0]
+    assert isinstance(record, TransportOrderRecord)
+    assert not hasattr(record, "__dict__")
+    model = record.to_model()
+    assert isinstance(model, TransportOrder)
+    assert model.model_dump() == record.model_dump()
+
+
+def test_records_cross_process_boundaries():
+    record = unvalidated(DeclarationGenerator(seed=1), 1)[0]
+    assert pickle.loads(pickle.dumps(record)).model_dump() == record.model_dump()
+
+    records = list(iter_records("declaration", 4, chunk_size=2, workers=2, validate=False))
+    assert all(isinstance(r.to_model(), CustomsDeclaration) for r in records)
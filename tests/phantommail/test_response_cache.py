@@ -0,0 +1,72 @@
+import asyncio
+
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+from phantommail.backends import EmailRequest, LLMBackend, ResponseCache
+from phantommail.models.email import Email
+
+
+class StubLLM:
+    model_name = "stub"
+    temperature = 0.5
+
+    def __init__(self):
+        self.calls = 0
+
+    def with_structured_output(self, schema):
+        def respond(messages):
+            self.calls += 1
+            return Email(subject="Hello", body_html=f"<p>{messages[-1].content}</p>")
+
+        return RunnableLambda(respond)
+
+
+def request(text):
+    return EmailRequest(email_type="question", messages=[HumanMessage(content=text)])
+
+
+def test_cached_responses_skip_the_llm(tmp_path):
+    llm = StubLLM()
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    backend = LLMBackend(llm, cache=cache)
+
+    first = asyncio.run(backend.generate(request("Where is my truck?")))
+    second = asyncio.run(backend.generate(request("Where is my truck?")))
+    asyncio.run(backend.generate(request("Another question")))
+
+    assert first == second
+    assert llm.calls == 2
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 2
+
+
+def test_cache_persists_on_disk(tmp_path):
+    key = ResponseCache.make_key(StubLLM(), Email, request("x").messages)
+    ResponseCache(tmp_path / "cache.sqlite").set(key, Email(subject="s", body_html="b"))
+    assert ResponseCache(tmp_path / "cache.sqlite").get(key, Email).subject == "s"
+
+
+def test_size_and_ttl_eviction():
+    cache = ResponseCache(":memory:", max_entries=2)
+    for i in range(3):
+        cache.set(f"key-{i}", Email(subject=str(i), body_html=""))
+    assert len(cache) == 2
+    assert cache.get("key-0", Email) is None
+
+    expiring = ResponseCache(":memory:", ttl=-1)
+    expiring.set("key", Email(subject="s", body_html=""))
+    assert expiring.get("key", Email) is None
+
+
+def test_hits_do_not_write_until_the_next_set(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite", max_entries=2)
+    cache.set("key-0", Email(subject="0", body_html=""))
+    cache.set("key-1", Email(subject="1", body_html=""))
+
+    assert cache.get("key-0", Email) is not None
+    assert not cache._connection.in_transaction
+    # The hit made key-0 the most recently used, so key-1 is evicted
+    cache.set("key-2", Email(subject="2", body_html=""))
+    assert cache.get("key-0", Email) is not None
+    assert cache.get("key-1", Email) is None
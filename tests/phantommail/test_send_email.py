@@ -0,0 +1,159 @@
+import asyncio
+import time
+
+import pytest
+import resend
+from resend.exceptions import RateLimitError, ResendError, ValidationError
+
+from phantommail.models.email import Attachment, FullEmail
+from phantommail.send_email import DeliveryQueue, Mailer
+from phantommail.transports import MemoryTransport
+
+
+@pytest.fixture
+def email(monkeypatch):
+    monkeypatch.setenv("RESEND_API_KEY", "re_test")
+    return FullEmail(
+        sender="from@example.com", to=["to@example.com"], subject="Hi", body_html="<p>Hi</p>"
+    )
+
+
+def test_retries_rate_limits(monkeypatch, email):
+    calls = []
+
+    def fake_send(params):
+        calls.append(params)
+        if len(calls) < 3:
+            raise RateLimitError(message="slow down", error_type="rate_limit_exceeded", code=429)
+        return {"id": "msg-1"}
+
+    monkeypatch.setattr(resend.Emails, "send", fake_send)
+    result = asyncio.run(Mailer(backoff=0).send(email))
+
+    assert result.status == "sent"
+    assert result.message_id == "msg-1"
+    assert result.attempts == 3
+
+
+def test_does_not_retry_client_errors(monkeypatch, email):
+    def fake_send(params):
+        raise ValidationError(message="bad address", error_type="validation_error", code=422)
+
+    monkeypatch.setattr(resend.Emails, "send", fake_send)
+    result = asyncio.run(Mailer(backoff=0).send(email))
+
+    assert result.status == "failed"
+    assert result.attempts == 1
+    assert "bad address" in result.error
+
+
+def make_email(i, attachments=None):
+    return FullEmail(
+        sender="from@example.com",
+        to=[f"to{i}@example.com"],
+        subject=f"Email {i}",
+        body_html="<p>Hi</p>",
+        attachments=attachments,
+    )
+
+
+def test_queue_batches_and_maps_results(monkeypatch, email):
+    batches = []
+
+    def fake_batch_send(params):
+        batches.append(params)
+        return {"data": [{"id": f"id-{p['to'][0]}"} for p in params]}
+
+    monkeypatch.setattr(resend.Batch, "send", fake_batch_send)
+
+    async def run():
+        queue = DeliveryQueue(Mailer(backoff=0), batch_size=3, flush_interval=0.05)
+        return await asyncio.gather(
+            *(queue.submit(make_email(i), run_id=f"run-{i}") for i in range(5))
+        )
+
+    results = asyncio.run(run())
+
+    assert [len(batch) for batch in batches] == [3, 2]
+    for i, result in enumerate(results):
+        assert result.status == "sent"
+        assert result.run_id == f"run-{i}"
+        assert result.message_id == f"id-to{i}@example.com"
+
+
+def test_queue_sends_attachments_individually(monkeypatch, email):
+    monkeypatch.setattr(resend.Emails, "send", lambda params: {"id": "single"})
+    monkeypatch.setattr(resend.Batch, "send", pytest.fail)
+
+    result = asyncio.run(
+        DeliveryQueue(Mailer()).submit(make_email(0, attachments=[Attachment(filename="order.pdf", content=b"%PDF-")]))
+    )
+    assert result.message_id == "single"
+
+
+class SlowTransport(MemoryTransport):
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+
+    def send(self, email):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        time.sleep(self.delay)
+        self.running -= 1
+        return super().send(email)
+
+
+def test_timed_out_sends_are_not_retried_or_resent():
+    transport = SlowTransport(delay=0.2)
+    mailer = Mailer(transport=transport, concurrency=1, timeout=0.05, backoff=0)
+
+    async def run():
+        results = await asyncio.gather(
+            mailer.send(make_email(0)),
+            DeliveryQueue(mailer, flush_interval=0.01).submit(make_email(1)),
+            DeliveryQueue(mailer, batch_size=1).submit(make_email(2)),
+        )
+        # Let the abandoned calls finish, they keep their slot until then
+        await asyncio.sleep(0.7)
+        return results
+
+    results = asyncio.run(run())
+
+    assert all(r.status == "failed" and r.attempts == 1 for r in results)
+    assert all("Timed out" in r.error for r in results)
+    assert transport.peak == 1
+    # Every email went out exactly once, late
+    assert sorted(m.subject for m in transport.messages) == [
+        "Email 0",
+        "Email 1",
+        "Email 2",
+    ]
+
+
+def test_empty_errors_report_their_type():
+    class BrokenTransport(MemoryTransport):
+        def send(self, email):
+            raise ValueError()
+
+    result = asyncio.run(Mailer(transport=BrokenTransport()).send(make_email(0)))
+
+    assert result.error == "ValueError"
+
+
+def test_conflicts_are_not_retried(monkeypatch, email):
+    calls = []
+
+    def fake_send(params):
+        calls.append(params)
+        raise ResendError(
+            code=409, error_type="conflict", message="duplicate", suggested_action=""
+        )
+
+    monkeypatch.setattr(resend.Emails, "send", fake_send)
+    result = asyncio.run(Mailer(backoff=0).send(email))
+
+    assert result.status == "failed"
+    assert len(calls) == 1
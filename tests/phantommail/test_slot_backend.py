@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from phantommail.backends import EmailRequest, LLMBackend, SlotBackend
+from phantommail.graphs.nodes import GraphNodes
+from phantommail.models.email import EmailSlots, SlotReference
+from phantommail.templates import TemplateRegistry
+
+SLOTS = EmailSlots(
+    subject="Transport order",
+    greeting="Dear team,",
+    paragraphs=["Please plan the transport below.", "Loading <tomorrow> & unloading"],
+    references=[SlotReference(label="Order", value="PO-1234")],
+    closing="Kind regards,\nJane Doe\nACME NV",
+)
+
+
+class SlotLLM:
+    model_name = "slots"
+    temperature = 0.5
+
+    def __init__(self):
+        self.schemas = []
+        self.prompts = []
+
+    def with_structured_output(self, schema):
+        self.schemas.append(schema)
+
+        def respond(messages):
+            self.prompts.append("\n".join(str(m.content) for m in messages))
+            return SLOTS
+
+        return RunnableLambda(respond)
+
+
+@pytest.mark.parametrize("node", ["generate_order", "generate_declaration"])
+def test_slot_mode_renders_html_locally(node):
+    llm = SlotLLM()
+    nodes = GraphNodes()
+    config = {
+        "configurable": {
+            "backend": "slots",
+            "llm": llm,
+            "seed": 3,
+            "render_attachments": False,
+        }
+    }
+    result = asyncio.run(getattr(nodes, node)({}, config))
+
+    assert llm.schemas == [EmailSlots]
+    (prompt,) = llm.prompts
+    assert "<style" not in prompt and "Do not write any HTML" in prompt
+    assert result["subject"] == "Transport order"
+    assert "<p>Dear team,</p>" in result["email"]
+    assert "Loading &lt;tomorrow&gt; &amp; unloading" in result["email"]
+    assert "<li><strong>Order:</strong> PO-1234</li>" in result["email"]
+    assert "Jane Doe<br>ACME NV" in result["email"]
+    if node == "generate_declaration":
+        assert result["payload"]["mrn"] in result["attachment_html"]
+
+
+def test_templates_declare_their_slots(tmp_path):
+    (tmp_path / "note_1_email.html").write_text("<p>Old</p>")
+    (tmp_path / "note_1_slots.html").write_text(
+        "<div class='note'>${greeting}<hr>$paragraphs costs $$5</div>"
+    )
+    registry = TemplateRegistry(directories=[tmp_path])
+    note = registry.get("note_1")
+    email = SlotBackend(LLMBackend(SlotLLM())).render(
+        EmailRequest(email_type="question", slot_template=note.slot_html), SLOTS
+    )
+
+    assert note.slots == ["greeting", "paragraphs"]
+    assert email.body_html.startswith("<div class='note'><p>Dear team,</p><hr>")
+    assert email.body_html.endswith("costs $5</div>")
+    for template in registry.templates("order"):
+        assert template.slots == ["greeting", "paragraphs", "references", "closing"]
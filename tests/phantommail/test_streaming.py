@@ -0,0 +1,114 @@
+import asyncio
+import html
+
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableGenerator
+
+from phantommail.backends import EmailRequest, LLMBackend, SlotBackend
+from phantommail.fakers.transport import TransportOrderGenerator
+from phantommail.graphs import nodes as nodes_module
+from phantommail.graphs.nodes import GraphNodes
+from phantommail.models.email import EmailSlots
+
+PARTIALS = [
+    {"attachment_html": "<h1>Ord"},
+    {"attachment_html": "<h1>Order</h1>"},
+    {"attachment_html": "<h1>Order</h1>", "subject": "Trans"},
+    {"attachment_html": "<h1>Order</h1>", "subject": "Transport", "body_html": "<p"},
+    {
+        "attachment_html": "<h1>Order</h1>",
+        "subject": "Transport",
+        "body_html": "<p>Hi</p>",
+    },
+]
+
+
+class StreamingLLM:
+    model_name = "streaming"
+    temperature = 0.5
+
+    def __init__(self, events):
+        self.events = events
+
+    def with_structured_output(self, schema):
+        if isinstance(schema, dict):
+
+            async def stream(inputs):
+                async for _ in inputs:
+                    pass
+                for partial in PARTIALS:
+                    await asyncio.sleep(0.01)
+                    self.events.append(("chunk", len(partial)))
+                    yield partial
+
+            return RunnableGenerator(stream)
+
+        async def fill(inputs):
+            async for _ in inputs:
+                pass
+            self.events.append(("llm", None))
+            yield EmailSlots(subject="Order", paragraphs=["Hi"])
+
+        return RunnableGenerator(fill)
+
+
+def request():
+    return EmailRequest(
+        email_type="order",
+        messages=[HumanMessage(content="Write an order")],
+        data={},
+        attachment_template="<style>h1{}</style>",
+    )
+
+
+def test_attachment_is_handed_over_before_the_body_is_done():
+    events = []
+    backend = LLMBackend(StreamingLLM(events))
+
+    email = asyncio.run(
+        backend.generate_streaming(
+            request(), lambda html: events.append(("attachment", html))
+        )
+    )
+
+    assert email.subject == "Transport" and email.body_html == "<p>Hi</p>"
+    # Complete once the subject started, while the body was still streaming
+    assert events.index(("attachment", "<h1>Order</h1>")) == 3
+    assert events.count(("attachment", "<h1>Order</h1>")) == 1
+
+
+def test_slot_backend_hands_over_the_attachment_before_calling_the_model():
+    events = []
+    backend = SlotBackend(LLMBackend(StreamingLLM(events)))
+    order = TransportOrderGenerator().generate().model_dump()
+    slot_request = request().model_copy(update={"data": order})
+
+    email = asyncio.run(
+        backend.generate_streaming(slot_request, lambda html: events.append(html))
+    )
+
+    assert email.subject == "Order"
+    assert events == [email.attachment_html, ("llm", None)]
+    assert html.escape(order["client"]["company"]) in email.attachment_html
+
+
+def test_nodes_render_the_pdf_while_the_body_streams(monkeypatch):
+    events = []
+
+    async def fake_create_pdf(html, renderer=None):
+        events.append(("pdf", html))
+        return b"%PDF-" + html.encode()
+
+    monkeypatch.setattr(nodes_module, "create_pdf", fake_create_pdf)
+    nodes = GraphNodes(backend="llm")
+    configurable = {
+        "llm": StreamingLLM(events),
+        "seed": 1,
+        "stream_attachments": True,
+    }
+
+    result = asyncio.run(nodes.generate_declaration({}, {"configurable": configurable}))
+
+    (attachment,) = result["attachments"]
+    assert attachment.content == b"%PDF-<h1>Order</h1>"
+    assert events.index(("pdf", "<h1>Order</h1>")) < events.index(("chunk", 3))
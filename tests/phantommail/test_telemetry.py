@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+from phantommail.backends import EmailRequest, LLMBackend
+from phantommail.graphs.nodes import GraphNodes
+from phantommail.models.email import Email
+from phantommail.telemetry import (
+    LLM_TOKENS,
+    OPERATION_ERRORS,
+    OPERATION_SECONDS,
+    PROMPT_BYTES,
+    InMemorySpanExporter,
+    Telemetry,
+    set_telemetry,
+)
+
+TEMPLATE_CONFIG = {"configurable": {"backend": "template"}}
+
+
+class StubLLM:
+    model_name = "stub"
+    temperature = 0.5
+
+    def with_structured_output(self, schema):
+        return RunnableLambda(lambda messages: Email(subject="Hi", body_html="<p/>"))
+
+
+@pytest.fixture
+def telemetry():
+    telemetry = Telemetry(exporter=InMemorySpanExporter())
+    previous = set_telemetry(telemetry)
+    yield telemetry
+    set_telemetry(previous)
+
+
+def test_nodes_record_spans_and_prompt_size(telemetry):
+    nodes = GraphNodes(backend="template")
+    asyncio.run(nodes.generate_question({}, TEMPLATE_CONFIG))
+
+    assert telemetry.exporter.names() == ["generate_email", "generate_question"]
+    email_span = telemetry.exporter.spans[0]
+    assert email_span.attributes["backend"] == "TemplateBackend"
+    assert email_span.attributes[PROMPT_BYTES] > 0
+    assert telemetry.metrics.histogram(OPERATION_SECONDS, operation="generate_question")[
+        "count"
+    ] == 1
+
+
+def test_llm_span_counts_tokens(telemetry):
+    backend = LLMBackend(StubLLM())
+    request = EmailRequest(
+        email_type="question", messages=[HumanMessage(content="Where is my truck?")]
+    )
+    asyncio.run(backend.generate(request))
+
+    (span,) = telemetry.exporter.spans
+    assert span.name == "llm"
+    assert span.attributes["llm.input_tokens"] == 0
+    with telemetry.span("llm") as open_span:
+        telemetry.record_tokens(open_span, 120, 40, email_type="question")
+    assert telemetry.metrics.counter(
+        LLM_TOKENS, direction="input", email_type="question"
+    ) == 120
+
+
+def test_errors_are_counted(telemetry):
+    with pytest.raises(ValueError):
+        with telemetry.span("send"):
+            raise ValueError("no route")
+
+    assert telemetry.metrics.counter(OPERATION_ERRORS, operation="send") == 1
+    assert telemetry.exporter.spans[0].error == "ValueError: no route"
+
+
+def test_render_prometheus_text(telemetry):
+    telemetry.metrics.inc(OPERATION_ERRORS, operation='say "hi"')
+    telemetry.metrics.observe(OPERATION_SECONDS, 0.02, operation="llm")
+    text = telemetry.metrics.render()
+
+    assert f"# TYPE {OPERATION_ERRORS} counter" in text
+    assert f'{OPERATION_ERRORS}{{operation="say \\"hi\\""}} 1' in text
+    assert f'{OPERATION_SECONDS}_bucket{{operation="llm",le="0.01"}} 0' in text
+    assert f'{OPERATION_SECONDS}_bucket{{operation="llm",le="0.025"}} 1' in text
+    assert f'{OPERATION_SECONDS}_count{{operation="llm"}} 1' in text
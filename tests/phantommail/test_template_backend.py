@@ -0,0 +1,69 @@
+import asyncio
+from importlib import resources
+
+import pytest
+
+from phantommail.backends import EmailRequest, TemplateBackend
+from phantommail.fakers.declaration import DeclarationGenerator
+from phantommail.fakers.transport import TransportOrderGenerator
+from phantommail.graphs.nodes import GraphNodes
+
+TEMPLATE_CONFIG = {"configurable": {"backend": "template"}}
+
+
+def read_example(name):
+    return resources.files("phantommail.examples").joinpath(name).read_text()
+
+
+@pytest.fixture(scope="module")
+def nodes():
+    return GraphNodes(backend="template")
+
+
+@pytest.mark.parametrize(
+    "node",
+    [
+        "generate_question",
+        "generate_complaint",
+        "generate_price_request",
+        "generate_waiting_costs",
+        "generate_update_order",
+        "generate_random",
+    ],
+)
+def test_nodes_run_offline(nodes, node):
+    result = asyncio.run(getattr(nodes, node)({}, TEMPLATE_CONFIG))
+    assert result["subject"]
+    assert result["email"].startswith("<div")
+
+
+def test_order_with_attachment():
+    order = TransportOrderGenerator().generate().model_dump()
+    email = TemplateBackend().render(
+        EmailRequest(
+            email_type="order",
+            data=order,
+            email_template=read_example("order_2_email.html"),
+            attachment_template=read_example("order_2_pdf.html"),
+        )
+    )
+    assert order["client"]["company"] in email.attachment_html
+    assert "<style>" in email.body_html
+
+
+def test_declaration_is_deterministic():
+    declaration = DeclarationGenerator().generate_declaration().model_dump()
+    request = EmailRequest(
+        email_type="declaration",
+        data=declaration,
+        email_template=read_example("customs_1_email.html"),
+        attachment_template=read_example("customs_1_pdf.html"),
+    )
+    first = TemplateBackend().render(request)
+    assert first == TemplateBackend().render(request)
+    assert declaration["mrn"] in first.attachment_html
+
+
+def test_unknown_backend(nodes):
+    with pytest.raises(ValueError):
+        nodes.get_backend({"configurable": {"backend": "carrier-pigeon"}})
@@ -0,0 +1,49 @@
+import random
+
+from phantommail.templates import TemplateRegistry
+
+
+def test_bundled_templates_are_indexed():
+    registry = TemplateRegistry()
+    orders = {t.name: t for t in registry.templates("order")}
+
+    assert set(orders) == {f"order_{n}" for n in range(1, 7)}
+    assert not orders["order_1"].has_attachment
+    assert not orders["order_6"].has_attachment
+    assert all(orders[f"order_{n}"].has_attachment for n in range(2, 6))
+    assert orders["order_5"].language == "nl"
+    assert all(t.has_attachment for t in registry.templates("customs"))
+    assert registry.get("customs_1").size > 17_000
+
+
+def test_extra_directory(tmp_path):
+    (tmp_path / "order_7_email.html").write_text('<html lang="de"><p>Hallo</p></html>')
+    (tmp_path / "order_7_pdf.html").write_text("<p>Auftrag</p>")
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    registry = TemplateRegistry(directories=[tmp_path])
+    template = registry.get("order_7")
+
+    assert template.has_attachment
+    assert template.language == "de"
+    assert template.source == str(tmp_path)
+
+
+def test_kind_with_underscores(tmp_path):
+    (tmp_path / "price_request_1_email.html").write_text("<p>Price?</p>")
+    (tmp_path / "price_request_1_pdf.html").write_text("<p>Route</p>")
+
+    registry = TemplateRegistry(directories=[tmp_path])
+    template = registry.get("price_request_1")
+
+    assert template.kind == "price_request"
+    assert template.number == 1
+    assert template.has_attachment
+    assert [t.name for t in registry.templates("price_request")] == ["price_request_1"]
+
+
+def test_weighted_sampling():
+    weights = {f"order_{n}": 0 for n in range(1, 7)} | {"order_3": 1}
+    registry = TemplateRegistry(weights=weights)
+    rng = random.Random(0)
+    assert {registry.choose("order", rng).name for _ in range(20)} == {"order_3"}